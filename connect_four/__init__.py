@@ -5,6 +5,11 @@ register(
     entry_point='connect_four.envs:ConnectFourEnv',
 )
 
+register(
+    id='connect_four_bitboard-v0',
+    entry_point='connect_four.envs:BitboardConnectFourEnv',
+)
+
 register(
     id='tic_tac_toe-v0',
     entry_point='connect_four.envs:TicTacToeEnv',
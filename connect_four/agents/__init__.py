@@ -6,4 +6,11 @@ from connect_four.agents.minimax import Minimax
 from connect_four.agents.random_agent import RandomAgent
 from connect_four.agents.uct import UCT
 from connect_four.agents.pns import PNS
+from connect_four.agents.pns import PN2
+from connect_four.agents.compact_pns import CompactPNS
 from connect_four.agents.dfpn import DFPN
+from connect_four.agents.parallel_dfpn import ParallelDFPN
+from connect_four.agents.opening_book_agent import OpeningBookAgent
+from connect_four.agents.search_budget import SearchBudget
+from connect_four.agents.search_progress import SearchProgress
+from connect_four.agents.search_checkpoint import SearchCheckpoint
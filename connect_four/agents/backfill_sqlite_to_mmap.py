@@ -0,0 +1,46 @@
+import sqlite3
+
+from connect_four.agents.migrate_sqlite_to_hash_key import stored_transposition
+from connect_four.envs import ConnectFourEnv
+from connect_four.transposition.mmap_transposition_table import MmapTranspositionTable
+
+
+def backfill_sqlite_to_mmap(database_file: str, mmap_file: str, num_rows: int,
+                            num_cols: int) -> MmapTranspositionTable:
+    """Copies every entry of an SQLiteTranspositionTable database into a new MmapTranspositionTable.
+
+    Entries keyed by Hasher.hash() are saved under the hash_key() DFPN looks them up by.
+
+    Args:
+        database_file (str): the path of the SQLite database.
+        mmap_file (str): the path of the hash file to create.
+        num_rows (int): the number of rows of the board the database was built for.
+        num_cols (int): the number of columns of the board the database was built for.
+
+    Returns:
+        mmap_tt (MmapTranspositionTable): the writable MmapTranspositionTable. The caller must close it.
+    """
+    con = sqlite3.connect(database=database_file)
+    cursor = con.cursor()
+
+    cursor.execute("SELECT COUNT(*) FROM PhiDelta")
+    num_entries = cursor.fetchone()[0]
+    # Keep the hash file at most half full so that probe sequences stay short.
+    size_bits = max(1, (2 * num_entries).bit_length())
+    mmap_tt = MmapTranspositionTable(file=mmap_file, read_only=False, size_bits=size_bits)
+
+    cursor.execute("SELECT Transposition, Phi, Delta FROM PhiDelta")
+    for transposition, phi, delta in cursor:
+        mmap_tt.save(transposition=stored_transposition(text=transposition, num_rows=num_rows, num_cols=num_cols),
+                     phi=phi, delta=delta)
+
+    cursor.close()
+    con.close()
+    return mmap_tt
+
+
+if __name__ == '__main__':
+    tt = backfill_sqlite_to_mmap(database_file="connect_four.db", mmap_file="connect_four.tt",
+                                 num_rows=ConnectFourEnv.M, num_cols=ConnectFourEnv.N)
+    print("saved", len(tt), "transpositions")
+    tt.close()
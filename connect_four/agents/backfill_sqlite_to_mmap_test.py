@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+import gym
+
+from connect_four.agents.backfill_sqlite_to_mmap import backfill_sqlite_to_mmap
+from connect_four.envs import ConnectFourEnv
+from connect_four.hashing import ConnectFourHasher
+from connect_four.transposition.mmap_transposition_table import MmapTranspositionTable
+from connect_four.transposition.sqlite_transposition_table import SQLiteTranspositionTable
+
+
+class TestBackfillSQLiteToMmap(unittest.TestCase):
+    def setUp(self) -> None:
+        ConnectFourEnv.M = 6
+        ConnectFourEnv.N = 7
+        self.env = gym.make('connect_four-v0')
+        self.env.reset()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.database_file = os.path.join(self.temp_dir.name, "connect_four.db")
+        self.mmap_file = os.path.join(self.temp_dir.name, "connect_four.tt")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_backfill_hash_and_hash_key(self):
+        hasher = ConnectFourHasher(env=self.env, canonical=True)
+        hasher.move(action=3)
+        legacy_transposition = hasher.hash()
+        legacy_key = hasher.hash_key()
+        hasher.move(action=2)
+        transposition = hasher.hash_key()
+
+        sqlite_tt = SQLiteTranspositionTable(database_file=self.database_file)
+        sqlite_tt.save(transposition=legacy_transposition, phi=2, delta=3)
+        sqlite_tt.save(transposition=transposition, phi=4, delta=5)
+        sqlite_tt.close()
+
+        backfill_sqlite_to_mmap(database_file=self.database_file, mmap_file=self.mmap_file, num_rows=6,
+                                num_cols=7).close()
+
+        mmap_tt = MmapTranspositionTable(file=self.mmap_file)
+        self.assertEqual(2, len(mmap_tt))
+        # The hash() entry is found by the hash_key() DFPN looks it up by.
+        self.assertIn(legacy_key, mmap_tt)
+        self.assertEqual((2, 3), mmap_tt.retrieve(transposition=legacy_key))
+        self.assertIn(transposition, mmap_tt)
+        self.assertEqual((4, 5), mmap_tt.retrieve(transposition=transposition))
+        mmap_tt.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,22 @@
+import gym
+
+from connect_four.agents.opening_book import OpeningBook, extract_proof_tree
+from connect_four.evaluation.victor.victor_evaluator import Victor
+from connect_four.hashing import ConnectFourHasher
+from connect_four.transposition.sqlite_transposition_table import SQLiteTranspositionTable
+
+# Extracts the proof tree of the initial state from a connect_four.db built by dfpn_build_db.py or migrated by
+# migrate_sqlite_to_hash_key.py, and saves it as the opening book connect_four.book.
+env = gym.make('connect_four-v0')
+
+env.reset()
+
+# The evaluator and hasher must match the ones used by dfpn_build_db.py.
+evaluator = Victor(model=env)
+hasher = ConnectFourHasher(env=env, canonical=True)
+tt = SQLiteTranspositionTable(database_file="connect_four.db")
+
+book = OpeningBook(entries=extract_proof_tree(evaluator=evaluator, hasher=hasher, tt=tt))
+book.save(file="connect_four.book")
+print("saved", len(book), "states")
+tt.close()
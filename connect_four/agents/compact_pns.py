@@ -0,0 +1,359 @@
+from array import array
+from typing import Iterator
+
+from connect_four.agents.agent import Agent
+from connect_four.agents.search_budget import SearchBudget
+from connect_four.evaluation import Evaluator
+from connect_four.evaluation.evaluator import ProofStatus, NodeType
+
+
+class PNSNodeStore:
+    """Stores the nodes of a PNS tree as parallel arrays, indexed by node.
+
+    Children are linked through first_child and next_sibling, in the order they were created. Proof and disproof
+    numbers are integers, with INF standing for infinity, so a node takes 27 bytes instead of the hundreds of bytes
+    of a PNSNode with its dict of children.
+    """
+
+    INF = 100000000000000
+    # Marks a missing first child or next sibling.
+    NONE = -1
+
+    def __init__(self):
+        self.proof = array('q')
+        self.disproof = array('q')
+        self.status = array('B')
+        self.node_type = array('B')
+        # The action that leads from the parent of a node to the node.
+        self.action = array('b')
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+
+    def __len__(self):
+        return len(self.proof)
+
+    def nbytes(self) -> int:
+        """
+        Returns:
+            nbytes (int): the number of bytes used by the nodes in this PNSNodeStore.
+        """
+        buffers = [self.proof, self.disproof, self.status, self.node_type, self.action, self.first_child,
+                   self.next_sibling]
+        return sum(buffer.itemsize * len(buffer) for buffer in buffers)
+
+    def add(self, node_type: NodeType, action: int = -1, status: ProofStatus = ProofStatus.Unknown) -> int:
+        """Adds a node without children. Use add_child() to add it below a parent.
+
+        Args:
+            node_type (NodeType): the NodeType of the node.
+            action (int): the action that leads to the node. -1 for a root.
+            status (ProofStatus): the ProofStatus of the node.
+
+        Returns:
+            index (int): the index of the new node.
+        """
+        self.proof.append(1)
+        self.disproof.append(1)
+        self.status.append(status.value)
+        self.node_type.append(node_type.value)
+        self.action.append(action)
+        self.first_child.append(PNSNodeStore.NONE)
+        self.next_sibling.append(PNSNodeStore.NONE)
+        index = len(self.proof) - 1
+        self.set_proof_and_disproof_numbers(index=index)
+        return index
+
+    def add_child(self, parent: int, last_child: int, action: int, status: ProofStatus) -> int:
+        """Adds a child after the last child of parent.
+
+        Args:
+            parent (int): the index of the parent.
+            last_child (int): the index of the last child of parent. NONE if it has no children yet.
+            action (int): the action that leads from parent to the child.
+            status (ProofStatus): the ProofStatus of the child.
+
+        Returns:
+            index (int): the index of the new child.
+        """
+        if self.node_type[parent] == NodeType.OR.value:
+            child_type = NodeType.AND
+        else:
+            child_type = NodeType.OR
+        child = self.add(node_type=child_type, action=action, status=status)
+        if last_child == PNSNodeStore.NONE:
+            self.first_child[parent] = child
+        else:
+            self.next_sibling[last_child] = child
+        return child
+
+    def children(self, index: int) -> Iterator[int]:
+        """
+        Args:
+            index (int): the index of a node.
+
+        Returns:
+            children (Iterator[int]): the indices of the children of the node, in the order they were added.
+        """
+        child = self.first_child[index]
+        while child != PNSNodeStore.NONE:
+            yield child
+            child = self.next_sibling[child]
+
+    def set_proof_and_disproof_numbers(self, index: int):
+        """Sets the proof and disproof numbers of a node from its children, or from its status if it is a leaf.
+
+        Args:
+            index (int): the index of a node.
+        """
+        child = self.first_child[index]
+        if child == PNSNodeStore.NONE:
+            status = self.status[index]
+            if status == ProofStatus.Proven.value:
+                self.proof[index] = 0
+                self.disproof[index] = PNSNodeStore.INF
+            elif status == ProofStatus.Disproven.value:
+                self.proof[index] = PNSNodeStore.INF
+                self.disproof[index] = 0
+            # Otherwise the leaf keeps its numbers.
+            return
+
+        proof, disproof, next_sibling = self.proof, self.disproof, self.next_sibling
+        if self.node_type[index] == NodeType.AND.value:
+            # Proof number is the sum proof number of all children.
+            # Disproof number is the smallest disproof number of any child.
+            total, smallest = 0, PNSNodeStore.INF
+            while child != PNSNodeStore.NONE:
+                total += proof[child]
+                if disproof[child] < smallest:
+                    smallest = disproof[child]
+                child = next_sibling[child]
+            proof[index] = min(total, PNSNodeStore.INF)
+            disproof[index] = smallest
+        else:  # NodeType.OR
+            # Proof number is the smallest proof number of any child.
+            # Disproof number is the sum disproof number of all children.
+            total, smallest = 0, PNSNodeStore.INF
+            while child != PNSNodeStore.NONE:
+                total += disproof[child]
+                if proof[child] < smallest:
+                    smallest = proof[child]
+                child = next_sibling[child]
+            proof[index] = smallest
+            disproof[index] = min(total, PNSNodeStore.INF)
+
+    def select_most_proving_child(self, index: int) -> int:
+        """
+        Requires:
+            1. The node has children.
+
+        Args:
+            index (int): the index of a node.
+
+        Returns:
+            child (int): the index of the first child with the smallest proof number below an OR node,
+                or with the smallest disproof number below an AND node.
+        """
+        if self.node_type[index] == NodeType.OR.value:
+            numbers = self.proof
+        else:
+            numbers = self.disproof
+        child = self.first_child[index]
+        best_child, value = child, numbers[child]
+        child = self.next_sibling[child]
+        while child != PNSNodeStore.NONE:
+            if numbers[child] < value:
+                best_child, value = child, numbers[child]
+            child = self.next_sibling[child]
+        return best_child
+
+    def find_child(self, index: int, action: int) -> int:
+        """
+        Args:
+            index (int): the index of a node.
+            action (int): an action.
+
+        Returns:
+            child (int): the index of the child reached by action, or NONE if it has not been added.
+        """
+        for child in self.children(index=index):
+            if self.action[child] == action:
+                return child
+        return PNSNodeStore.NONE
+
+    def compact(self, root: int):
+        """Drops every node that is not in the tree of root. root becomes node 0.
+
+        Args:
+            root (int): the index of the new root.
+        """
+        store = PNSNodeStore()
+        store._copy_node(source=self, index=root)
+        # Pairs of (index in self, index in store) of nodes whose children have not been copied yet.
+        stack = [(root, 0)]
+        while stack:
+            index, new_index = stack.pop()
+            last_child = PNSNodeStore.NONE
+            for child in self.children(index=index):
+                new_child = store._copy_node(source=self, index=child)
+                if last_child == PNSNodeStore.NONE:
+                    store.first_child[new_index] = new_child
+                else:
+                    store.next_sibling[last_child] = new_child
+                last_child = new_child
+                stack.append((child, new_child))
+
+        self.proof, self.disproof, self.status = store.proof, store.disproof, store.status
+        self.node_type, self.action = store.node_type, store.action
+        self.first_child, self.next_sibling = store.first_child, store.next_sibling
+
+    def _copy_node(self, source, index: int) -> int:
+        self.proof.append(source.proof[index])
+        self.disproof.append(source.disproof[index])
+        self.status.append(source.status[index])
+        self.node_type.append(source.node_type[index])
+        self.action.append(source.action[index])
+        self.first_child.append(PNSNodeStore.NONE)
+        self.next_sibling.append(PNSNodeStore.NONE)
+        return len(self.proof) - 1
+
+
+class CompactPNS(Agent):
+    """Proof-Number Search over a PNSNodeStore.
+
+    Searches the same tree as PNS, but iteratively: each iteration walks down to the most-proving node, expands it
+    and backs the new numbers up the path it walked, stopping at the first node whose numbers do not change.
+    """
+
+    ROOT = 0
+
+    def __init__(self, evaluator: Evaluator, budget: SearchBudget = None):
+        """
+
+        Args:
+            evaluator (Evaluator): an Evaluator at the same state as the env that will be searched.
+            budget (SearchBudget): if given, every search stops once the budget is exhausted.
+                The partially searched tree is kept and extended by later searches. budget.max_tt_size is ignored.
+        """
+        self.evaluator = evaluator
+        self.budget = budget
+        self.store = PNSNodeStore()
+        self.store.add(node_type=self.evaluator.get_node_type())
+        # The nodes from the root to the node where the next update_tree() starts.
+        self.path = [CompactPNS.ROOT]
+        self.update_tree()
+        self.unwind()
+
+    @property
+    def root_proof(self) -> int:
+        return self.store.proof[CompactPNS.ROOT]
+
+    @property
+    def root_disproof(self) -> int:
+        return self.store.disproof[CompactPNS.ROOT]
+
+    def update_tree(self):
+        """Expands the most-proving node and updates the proof and disproof numbers of its ancestors.
+
+        The walk down starts at the deepest node of the last walk whose numbers did not change, since the walk from
+        the root would reach it again. self.evaluator is left at the state of that node; unwind() returns it to the
+        root.
+        """
+        store = self.store
+        path = self.path
+        node = path[-1]
+        while store.first_child[node] != PNSNodeStore.NONE:
+            node = store.select_most_proving_child(index=node)
+            self.evaluator.move(action=store.action[node])
+            path.append(node)
+
+        if self.budget is not None:
+            self.budget.expand()
+        self.expand(index=node)
+        store.set_proof_and_disproof_numbers(index=node)
+
+        while len(path) > 1:
+            self.evaluator.undo_move()
+            path.pop()
+            node = path[-1]
+            old_proof, old_disproof = store.proof[node], store.disproof[node]
+            store.set_proof_and_disproof_numbers(index=node)
+            if store.proof[node] == old_proof and store.disproof[node] == old_disproof:
+                # The numbers of every ancestor depend only on numbers that have not changed.
+                break
+
+    def unwind(self):
+        """Returns self.evaluator and the search path to the root."""
+        while len(self.path) > 1:
+            self.evaluator.undo_move()
+            self.path.pop()
+
+    def expand(self, index: int):
+        """Adds and evaluates the children of a leaf.
+
+        Args:
+            index (int): the index of a leaf at the current state of self.evaluator.
+        """
+        store = self.store
+        node_type = store.node_type[index]
+        last_child = PNSNodeStore.NONE
+        for action in self.evaluator.actions():
+            self.evaluator.move(action=action)
+            status = self.evaluator.evaluate()
+            self.evaluator.undo_move()
+            last_child = store.add_child(parent=index, last_child=last_child, action=action, status=status)
+
+            # Break early based on the NodeType (OR/AND).
+            if ((node_type == NodeType.OR.value and store.proof[last_child] == 0) or
+                    (node_type == NodeType.AND.value and store.disproof[last_child] == 0)):
+                return
+
+    def _move_root(self, action: int):
+        """Moves the root to its child reached by action, and drops the rest of the tree.
+
+        Requires:
+            1. self.evaluator has already played action.
+        """
+        child = self.store.find_child(index=CompactPNS.ROOT, action=action)
+        if child != PNSNodeStore.NONE:
+            self.store.compact(root=child)
+        else:
+            # A search stopped by its budget may not have expanded this child.
+            self.store = PNSNodeStore()
+            self.store.add(node_type=self.evaluator.get_node_type())
+
+    def proof_number_search(self):
+        if self.budget is not None:
+            self.budget.start()
+        while self.root_proof != 0 and self.root_disproof != 0:
+            if self.budget is not None and self.budget.exhausted():
+                break
+            self.update_tree()
+        self.unwind()
+
+    def action(self, env, last_action=None):
+        """
+        Requires:
+            1. env is not currently at a terminal state.
+
+        Args:
+            env (TwoPlayerGameEnv): a TwoPlayerGameEnv instance. It will not be modified.
+            last_action (int): The last action that occurred in env. None if env is in the initial state.
+
+        Returns:
+            best_action (int): an action.
+        """
+        if last_action is not None:
+            self.evaluator.move(action=last_action)
+            self._move_root(action=last_action)
+
+        if self.store.first_child[CompactPNS.ROOT] == PNSNodeStore.NONE:
+            self.update_tree()
+            self.unwind()
+        self.proof_number_search()
+
+        best_child = self.store.select_most_proving_child(index=CompactPNS.ROOT)
+        best_action = self.store.action[best_child]
+        self.evaluator.move(action=best_action)
+        self._move_root(action=best_action)
+
+        return best_action
@@ -0,0 +1,71 @@
+import unittest
+
+from connect_four.agents.compact_pns import PNSNodeStore
+from connect_four.evaluation.evaluator import ProofStatus, NodeType
+
+
+class TestPNSNodeStore(unittest.TestCase):
+    def setUp(self):
+        self.store = PNSNodeStore()
+        self.root = self.store.add(node_type=NodeType.OR)
+
+    def test_add_leaf_numbers(self):
+        self.assertEqual((1, 1), (self.store.proof[self.root], self.store.disproof[self.root]))
+        proven = self.store.add(node_type=NodeType.OR, status=ProofStatus.Proven)
+        self.assertEqual((0, PNSNodeStore.INF), (self.store.proof[proven], self.store.disproof[proven]))
+        disproven = self.store.add(node_type=NodeType.OR, status=ProofStatus.Disproven)
+        self.assertEqual((PNSNodeStore.INF, 0), (self.store.proof[disproven], self.store.disproof[disproven]))
+
+    def test_add_child(self):
+        first = self.store.add_child(parent=self.root, last_child=PNSNodeStore.NONE, action=3,
+                                     status=ProofStatus.Unknown)
+        second = self.store.add_child(parent=self.root, last_child=first, action=5, status=ProofStatus.Unknown)
+        self.assertEqual([first, second], list(self.store.children(index=self.root)))
+        self.assertEqual(NodeType.AND.value, self.store.node_type[first])
+        self.assertEqual(second, self.store.find_child(index=self.root, action=5))
+        self.assertEqual(PNSNodeStore.NONE, self.store.find_child(index=self.root, action=4))
+
+    def test_set_proof_and_disproof_numbers_OR(self):
+        first = self.store.add_child(parent=self.root, last_child=PNSNodeStore.NONE, action=0,
+                                     status=ProofStatus.Unknown)
+        second = self.store.add_child(parent=self.root, last_child=first, action=1, status=ProofStatus.Disproven)
+        third = self.store.add_child(parent=self.root, last_child=second, action=2, status=ProofStatus.Unknown)
+        self.store.proof[third] = 3
+        self.store.disproof[third] = 4
+
+        self.store.set_proof_and_disproof_numbers(index=self.root)
+        # OR: the smallest proof number, and the sum of the disproof numbers.
+        self.assertEqual(1, self.store.proof[self.root])
+        self.assertEqual(5, self.store.disproof[self.root])
+        self.assertEqual(first, self.store.select_most_proving_child(index=self.root))
+
+    def test_set_proof_and_disproof_numbers_AND_saturates(self):
+        root = self.store.add(node_type=NodeType.AND)
+        first = self.store.add_child(parent=root, last_child=PNSNodeStore.NONE, action=0,
+                                     status=ProofStatus.Disproven)
+        second = self.store.add_child(parent=root, last_child=first, action=1, status=ProofStatus.Disproven)
+        self.store.set_proof_and_disproof_numbers(index=root)
+        # AND: the sum of the proof numbers never exceeds INF, and the smallest disproof number.
+        self.assertEqual(PNSNodeStore.INF, self.store.proof[root])
+        self.assertEqual(0, self.store.disproof[root])
+        self.assertEqual(first, self.store.select_most_proving_child(index=root))
+
+    def test_compact(self):
+        first = self.store.add_child(parent=self.root, last_child=PNSNodeStore.NONE, action=0,
+                                     status=ProofStatus.Unknown)
+        self.store.add_child(parent=self.root, last_child=first, action=1, status=ProofStatus.Unknown)
+        grandchild = self.store.add_child(parent=first, last_child=PNSNodeStore.NONE, action=2,
+                                          status=ProofStatus.Unknown)
+        self.store.add_child(parent=first, last_child=grandchild, action=3, status=ProofStatus.Proven)
+        self.store.set_proof_and_disproof_numbers(index=first)
+
+        self.store.compact(root=first)
+        self.assertEqual(3, len(self.store))
+        self.assertEqual(NodeType.AND.value, self.store.node_type[0])
+        self.assertEqual([2, 3], [self.store.action[child] for child in self.store.children(index=0)])
+        self.assertEqual((1, 1), (self.store.proof[0], self.store.disproof[0]))
+        self.assertEqual(3 * 27, self.store.nbytes())
+
+
+if __name__ == '__main__':
+    unittest.main()
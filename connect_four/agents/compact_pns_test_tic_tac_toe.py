@@ -0,0 +1,99 @@
+import gym
+import random
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from connect_four.agents.compact_pns import CompactPNS
+from connect_four.agents.pns import PNS
+from connect_four.agents.pns import subtree_size
+from connect_four.agents.search_budget import SearchBudget
+from connect_four.envs import TwoPlayerGameEnv
+from connect_four.evaluation.simple_evaluator import SimpleEvaluator
+
+
+class TestCompactPNSTicTacToe(unittest.TestCase):
+    """
+    TestCompactPNSTicTacToe tests the array-backed Proof-Number Search for the TicTacToe environment.
+    """
+    def setUp(self):
+        self.env = gym.make('tic_tac_toe-v0')
+        self.env.reset()
+
+    def test_proof_number_search_matches_PNS(self):
+        tracemalloc.start()
+        try:
+            pns = PNS(evaluator=SimpleEvaluator(model=self.env))
+            pns.proof_number_search()
+            pns_memory, _ = tracemalloc.get_traced_memory()
+            compact_pns = CompactPNS(evaluator=SimpleEvaluator(model=self.env))
+            compact_pns.proof_number_search()
+            compact_pns_memory, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # The same tree is searched, in a fraction of the memory.
+        self.assertEqual(0, compact_pns.root_disproof)
+        self.assertEqual(subtree_size(node=pns.root), len(compact_pns.store))
+        self.assertLess((compact_pns_memory - pns_memory) * 5, pns_memory)
+        # The evaluator is back at the root.
+        np.testing.assert_array_equal(self.env.state, compact_pns.evaluator.model.state)
+
+    def test_proof_number_search_budget(self):
+        pns = CompactPNS(evaluator=SimpleEvaluator(model=self.env), budget=SearchBudget(max_nodes=10))
+        pns.proof_number_search()
+        self.assertEqual(10, pns.budget.num_nodes)
+        self.assertNotEqual(0, pns.root_proof)
+        self.assertNotEqual(0, pns.root_disproof)
+
+        # Later searches continue from the partially searched tree.
+        pns.budget = None
+        pns.proof_number_search()
+        self.assertEqual(0, pns.root_disproof)
+
+    def test_CompactPNS_Proven_action_last_action_is_not_None(self):
+        self.env.state = np.array([
+            [
+                [0, 0, 1, ],
+                [0, 0, 0, ],
+                [1, 0, 0, ],
+            ],
+            [
+                [0, 0, 0, ],
+                [0, 1, 0, ],
+                [0, 0, 0, ],
+            ],
+        ])
+        self.env.player_turn = 1
+        evaluator = SimpleEvaluator(model=self.env)
+        pns = CompactPNS(evaluator=evaluator)
+
+        # O plays in the bottom-right corner.
+        self.env.step(action=8)
+
+        # X can win by playing 0.
+        action = pns.action(env=self.env, last_action=8)
+        self.assertEqual(0, action)
+
+    def test_CompactPNS_action_never_loses(self):
+        # O can always draw, whatever X plays.
+        rng = random.Random(0)
+        for _ in range(3):
+            self.env.reset()
+            pns = None
+            done, reward, last_action = False, None, None
+            while not done:
+                if self.env.player_turn == 0:
+                    last_action = rng.choice(self.env.actions())
+                elif pns is None:
+                    pns = CompactPNS(evaluator=SimpleEvaluator(model=self.env), budget=SearchBudget(max_nodes=3000))
+                    last_action = pns.action(env=self.env)
+                else:
+                    last_action = pns.action(env=self.env, last_action=last_action)
+                _, reward, done, _ = self.env.step(action=last_action)
+            self.assertFalse(reward == TwoPlayerGameEnv.CONNECTED and self.env.player_turn == 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,34 @@
+import math
+
+from typing import List
+
 from connect_four.agents.agent import Agent
+from connect_four.agents.search_budget import SearchBudget
+from connect_four.agents.search_checkpoint import SearchCheckpoint
+from connect_four.agents.search_progress import SearchProgress
 from connect_four.envs import TwoPlayerGameEnv
 from connect_four.evaluation import ProofStatus, NodeType, Evaluator
 from connect_four.hashing import Hasher
 from connect_four.transposition import TranspositionTable
+from connect_four.transposition.transposition_table import stable_key
+
+
+class DFPNFrame:
+    """One ply of the explicit search stack of DFPN."""
+
+    def __init__(self):
+        # The actions leading to each child, and the phi/delta numbers of each child.
+        self.actions: List[int] = []
+        self.child_phis: List[int] = []
+        self.child_deltas: List[int] = []
+        # The thresholds of the termination condition of this state.
+        self.phi_threshold = 0
+        self.delta_threshold = 0
+        # The current phi/delta numbers of this state.
+        self.phi = 0
+        self.delta = 0
+        # The index of the child currently being searched, or -1 if none has been searched yet.
+        self.best_index = -1
 
 
 class DFPN(Agent):
@@ -11,10 +37,36 @@ class DFPN(Agent):
     # a (dis)proof number this high.
     INF = 100000000000000
 
-    def __init__(self, evaluator: Evaluator, hasher: Hasher, tt: TranspositionTable):
+    def __init__(self, evaluator: Evaluator, hasher: Hasher, tt: TranspositionTable, budget: SearchBudget = None,
+                 progress: SearchProgress = None, epsilon: float = 0.0, checkpoint: SearchCheckpoint = None):
+        """
+
+        Args:
+            evaluator (Evaluator): an Evaluator at the same state as the env that will be searched.
+            hasher (Hasher): a Hasher at the same state as the env that will be searched.
+            tt (TranspositionTable): the TranspositionTable the phi/delta numbers are saved to.
+            budget (SearchBudget): if given, every search stops once the budget is exhausted.
+                The phi/delta numbers found so far are saved to tt.
+            progress (SearchProgress): if given, the progress of every search is reported to it.
+            epsilon (float): the delta threshold of a child is ceil(delta_2 * (1 + epsilon)) instead of delta_2 + 1
+                (the 1+epsilon trick of Pawlewicz & Lew). A larger epsilon lets the search stay in a child longer
+                before switching to a sibling with a similar delta number. 0 disables the trick.
+            checkpoint (SearchCheckpoint): if given, tt is flushed and the search stack is saved to it periodically.
+                depth_first_proof_number_search() resumes from the saved search stack if there is one.
+        """
         self.evaluator = evaluator
         self.hasher = hasher
         self.tt = tt
+        self.budget = budget
+        self.progress = progress
+        self.epsilon = epsilon
+        self.checkpoint = checkpoint
+
+        # The search stack. self.stack[d] is the frame of the state d plies below the root of the current search.
+        # Frames are kept between searches so that their lists are reused.
+        self.stack: List[DFPNFrame] = []
+        # The key of the root of the current search. Only set if checkpoint is given.
+        self.root_key = None
 
     def depth_first_proof_number_search(self, env: TwoPlayerGameEnv) -> ProofStatus:
         """Performs depth-first proof-number search on the state env is currently in to (dis)prove the state.
@@ -24,8 +76,24 @@ class DFPN(Agent):
 
         Returns:
             status (ProofStatus): the ProofStatus (Proven or Disproven) of the state env is currently in.
+                Unknown if the search stopped because its budget was exhausted.
         """
-        phi, delta = self.multiple_iterative_deepening(env=env, phi_threshold=DFPN.INF, delta_threshold=DFPN.INF)
+        if self.budget is not None:
+            self.budget.start()
+        if self.progress is not None:
+            self.progress.start()
+        if self.checkpoint is not None:
+            phi, delta = self._resume(env=env)
+            # Every number is in tt once the search has unwound to the root, so the search stack is not needed.
+            self.tt.flush()
+            self.checkpoint.remove()
+        else:
+            phi, delta = self.multiple_iterative_deepening(env=env, phi_threshold=DFPN.INF, delta_threshold=DFPN.INF)
+        if self.progress is not None:
+            self.progress.root_phi, self.progress.root_delta = phi, delta
+            self.progress.report()
+        if phi != 0 and delta != 0:
+            return ProofStatus.Unknown
         node_type = self.evaluator.get_node_type()
         if node_type == NodeType.OR:
             if phi == 0:
@@ -42,7 +110,8 @@ class DFPN(Agent):
                                      phi_threshold: int, delta_threshold: int) -> (int, int):
         """Performs iterative deepening continuously to update the phi/delta numbers of the state env is currently in
         until either of the numbers exceed their respective thresholds. This is known as the "termination condition".
-        Saves and returns the phi/delta numbers when the termination condition is satisfied.
+        Saves and returns the phi/delta numbers when the termination condition is satisfied,
+        or when the search budget is exhausted.
 
         Args:
             env (TwoPlayerGameEnv): a TwoPlayerGameEnv instance. It will be left in its given state.
@@ -53,37 +122,167 @@ class DFPN(Agent):
             phi (int): the most recent phi number of the state at env.
             delta (int): the most recent delta number of the state at env.
         """
-        env_variables = env.env_variables
+        if self.checkpoint is not None:
+            self.checkpoint.start()
+            self.root_key = stable_key(transposition=self.hasher.hash_key())
+        self._push(depth=0, phi_threshold=phi_threshold, delta_threshold=delta_threshold)
+        return self._search(env=env, depth=0)
 
-        self.generate_children()
-        phi, delta = self.calculate_phi_delta()
+    def _resume(self, env: TwoPlayerGameEnv) -> (int, int):
+        """Rebuilds the search stack saved by self.checkpoint and searches until the root satisfies its
+        termination condition. Searches from the root if there is no saved search stack.
 
-        while phi_threshold > phi and delta_threshold > delta:
-            best_action, phi_c, delta_2 = self.select_child(env=env)
+        Raises:
+            ValueError: if the saved search stack belongs to a different root.
 
-            env.step(action=best_action)
-            self.evaluator.move(action=best_action)
-            self.hasher.move(action=best_action)
+        Args:
+            env (TwoPlayerGameEnv): a TwoPlayerGameEnv instance currently at root. It will be left in its given state.
+
+        Returns:
+            phi (int): the most recent phi number of the root.
+            delta (int): the most recent delta number of the root.
+        """
+        self.checkpoint.start()
+        self.root_key = stable_key(transposition=self.hasher.hash_key())
+        path, thresholds = self.checkpoint.load(root_key=self.root_key)
+        if path is None:
+            return self.multiple_iterative_deepening(env=env, phi_threshold=DFPN.INF, delta_threshold=DFPN.INF)
+
+        # The phi/delta numbers of every frame are read back from tt, which was flushed before the checkpoint.
+        for depth, action in enumerate(path):
+            phi_threshold, delta_threshold = thresholds[depth]
+            self._push(depth=depth, phi_threshold=phi_threshold, delta_threshold=delta_threshold)
+            frame = self.stack[depth]
+            frame.best_index = frame.actions.index(action)
+
+            env.step(action=action)
+            self.evaluator.move(action=action)
+            self.hasher.move(action=action)
+        phi_threshold, delta_threshold = thresholds[len(path)]
+        self._push(depth=len(path), phi_threshold=phi_threshold, delta_threshold=delta_threshold)
+        return self._search(env=env, depth=len(path), base_depth=0)
 
-            child_phi_threshold = delta_threshold - delta + phi_c
-            child_delta_threshold = min(phi_threshold, delta_2 + 1)
-            self.multiple_iterative_deepening(
-                env=env,
-                phi_threshold=child_phi_threshold,
-                delta_threshold=child_delta_threshold,
-            )
+    def _save_checkpoint(self, depth: int):
+        """Flushes tt and saves the search stack down to depth to self.checkpoint.
 
-            env.reset(env_variables=env_variables)
+        Args:
+            depth (int): the depth of the state env is currently in.
+        """
+        # Flush first, so that a checkpoint never refers to numbers that were lost in a crash.
+        self.tt.flush()
+        stack = self.stack
+        self.checkpoint.save(
+            root_key=self.root_key,
+            path=[stack[d].actions[stack[d].best_index] for d in range(depth)],
+            thresholds=[(stack[d].phi_threshold, stack[d].delta_threshold) for d in range(depth + 1)],
+        )
+
+    def _push(self, depth: int, phi_threshold: int, delta_threshold: int):
+        """Expands the current state into the frame at depth of the search stack.
+
+        Args:
+            depth (int): the depth of the current state below the root of the search.
+            phi_threshold (int): Maximum phi number of the current state before we start searching a sibling node.
+            delta_threshold (int): Maximum delta number of the current state before we start searching a sibling node.
+        """
+        if self.budget is not None:
+            self.budget.expand()
+        if self.progress is not None:
+            self.progress.expand()
+            self.progress.depth = depth
+
+        if depth == len(self.stack):
+            self.stack.append(DFPNFrame())
+        frame = self.stack[depth]
+        # Look up each child once per frame. Afterwards, only the numbers of the child that was just searched change.
+        # Numbers of the other children may become stale if they are updated through a transposition, but they are
+        # refreshed the next time those children are searched.
+        self._generate_children(actions=frame.actions, child_phis=frame.child_phis, child_deltas=frame.child_deltas)
+        frame.phi_threshold = phi_threshold
+        frame.delta_threshold = delta_threshold
+        frame.phi = min(frame.child_deltas, default=DFPN.INF)
+        frame.delta = sum(frame.child_phis)
+        frame.best_index = -1
+
+        if self.checkpoint is not None and self.checkpoint.due():
+            self._save_checkpoint(depth=depth)
+
+    def _search(self, env: TwoPlayerGameEnv, depth: int, base_depth: int = None) -> (int, int):
+        """Runs the search loop on the search stack until the frame at base_depth satisfies its termination condition.
+
+        Requires:
+            1. self.stack[depth] is the frame of the state env is currently in.
+            2. The frames from base_depth to depth - 1 are the frames of its ancestors.
+
+        Args:
+            env (TwoPlayerGameEnv): a TwoPlayerGameEnv instance. It is left at the state of the frame at base_depth.
+            depth (int): the depth of the state env is currently in.
+            base_depth (int): the depth of the frame to search. Defaults to depth.
+
+        Returns:
+            phi (int): the most recent phi number of the state at base_depth.
+            delta (int): the most recent delta number of the state at base_depth.
+        """
+        stack = self.stack
+        if base_depth is None:
+            base_depth = depth
+        frame = stack[depth]
+        while True:
+            if (frame.phi_threshold > frame.phi and frame.delta_threshold > frame.delta and
+                    (self.budget is None or not self.budget.exhausted(tt=self.tt))):
+                # Search the best child.
+                best_index, phi_c, delta_2 = self._select_child_index(
+                    child_phis=frame.child_phis, child_deltas=frame.child_deltas)
+                frame.best_index = best_index
+                best_action = frame.actions[best_index]
+
+                env.step(action=best_action)
+                self.evaluator.move(action=best_action)
+                self.hasher.move(action=best_action)
+
+                depth += 1
+                self._push(
+                    depth=depth,
+                    phi_threshold=frame.delta_threshold - frame.delta + phi_c,
+                    delta_threshold=min(frame.phi_threshold, self._child_delta_threshold(delta_2=delta_2)),
+                )
+                frame = stack[depth]
+                continue
+
+            # The termination condition is satisfied.
+            phi, delta = frame.phi, frame.delta
+            self.tt.save(transposition=self.hasher.hash_key(), phi=phi, delta=delta)
+            if depth == base_depth:
+                return phi, delta
+
+            env.undo()
             self.evaluator.undo_move()
             self.hasher.undo_move()
 
-            phi, delta = self.calculate_phi_delta()
-            print("phi =", phi)
-            print("delta =", delta)
+            depth -= 1
+            frame = stack[depth]
+            # The child saved these numbers to the TT too, but a fixed-size TT may replace them later.
+            frame.child_phis[frame.best_index] = phi
+            frame.child_deltas[frame.best_index] = delta
+            frame.phi = min(frame.child_deltas, default=DFPN.INF)
+            frame.delta = sum(frame.child_phis)
+            if self.progress is not None:
+                self.progress.depth = depth
+                if depth == 0:
+                    self.progress.root_phi, self.progress.root_delta = frame.phi, frame.delta
+
+    def _child_delta_threshold(self, delta_2: int) -> int:
+        """
+        Args:
+            delta_2 (int): the second smallest delta number that belongs to a child of the current state.
 
-        transposition = self.hasher.hash()
-        self.tt.save(transposition=transposition, phi=phi, delta=delta)
-        return phi, delta
+        Returns:
+            threshold (int): the delta threshold of the best child, before it is capped by the phi threshold.
+        """
+        if self.epsilon == 0 or delta_2 >= DFPN.INF:
+            return delta_2 + 1
+        # Always at least delta_2 + 1, so that the best child is searched until it is worse than its sibling.
+        return max(delta_2 + 1, math.ceil(delta_2 * (1 + self.epsilon)))
 
     @staticmethod
     def determine_phi_delta(node_type: NodeType, status: ProofStatus) -> (int, int):
@@ -105,23 +304,90 @@ class DFPN(Agent):
         # If an OR node has been disproven or an AND node has been proven, it will never reach its goal.
         return DFPN.INF, 0
 
-    def generate_children(self):
+    def generate_children(self) -> (List[int], List[int], List[int]):
+        """Saves the initial phi/delta numbers of every child of the current state that is not already in the TT.
+
+        Returns:
+            actions (List[int]): the actions leading to each child.
+            child_phis (List[int]): the phi number of each child.
+            child_deltas (List[int]): the delta number of each child.
+        """
+        actions, child_phis, child_deltas = [], [], []
+        self._generate_children(actions=actions, child_phis=child_phis, child_deltas=child_deltas)
+        return actions, child_phis, child_deltas
+
+    def _generate_children(self, actions: List[int], child_phis: List[int], child_deltas: List[int]):
+        """Like generate_children(), but reuses the given lists.
+
+        Modifies:
+            -   actions, child_phis and child_deltas are replaced by the actions and phi/delta numbers of the children
+                of the current state.
+        """
+        actions.clear()
+        child_phis.clear()
+        child_deltas.clear()
         for action in self.evaluator.actions():
             self.hasher.move(action=action)
-            transposition = self.hasher.hash()
+            child_phi, child_delta = self._retrieve_child(action=action, transposition=self.hasher.hash_key())
+            self.hasher.undo_move()
 
-            if transposition not in self.tt:
-                self.evaluator.move(action=action)
-                status = self.evaluator.evaluate()
+            actions.append(action)
+            child_phis.append(child_phi)
+            child_deltas.append(child_delta)
 
-                if status != ProofStatus.Unknown:
-                    phi, delta = self.determine_phi_delta(node_type=self.evaluator.get_node_type(), status=status)
-                    self.tt.save(transposition=transposition, phi=phi, delta=delta)
-                else:  # ProofStatus is unknown and the state isn't already in the TT.
-                    self.tt.save(transposition=transposition, phi=1, delta=1)
+    def _generate_child(self, action: int, transposition: int) -> (int, int):
+        """Evaluates the child reached by action and saves its initial phi/delta numbers.
 
-                self.evaluator.undo_move()
-            self.hasher.undo_move()
+        Requires:
+            1. self.hasher has already played action.
+
+        Args:
+            action (int): the action leading to the child.
+            transposition (int): the hash key of the child.
+
+        Returns:
+            phi (int): the phi number of the child.
+            delta (int): the delta number of the child.
+        """
+        self.evaluator.move(action=action)
+        status = self.evaluator.evaluate()
+
+        if status != ProofStatus.Unknown:
+            phi, delta = self.determine_phi_delta(node_type=self.evaluator.get_node_type(), status=status)
+        else:  # ProofStatus is unknown and the state isn't already in the TT.
+            phi, delta = 1, 1
+        self.tt.save(transposition=transposition, phi=phi, delta=delta)
+
+        self.evaluator.undo_move()
+        return phi, delta
+
+    def _retrieve_child(self, action: int, transposition: int) -> (int, int):
+        """Retrieves the phi/delta numbers of the child reached by action.
+
+        If the child is not in the TT, e.g. because it was never generated or because a fixed-size
+        TranspositionTable replaced it, it is generated.
+
+        Requires:
+            1. self.hasher has already played action.
+
+        Args:
+            action (int): the action leading to the child.
+            transposition (int): the hash key of the child.
+
+        Returns:
+            phi (int): the phi number of the child.
+            delta (int): the delta number of the child.
+        """
+        # A single retrieve() instead of a check with "in" first, so that the TT is only searched once.
+        try:
+            phi_delta = self.tt.retrieve(transposition=transposition)
+        except KeyError:
+            if self.progress is not None:
+                self.progress.lookup(hit=False)
+            return self._generate_child(action=action, transposition=transposition)
+        if self.progress is not None:
+            self.progress.lookup(hit=True)
+        return phi_delta
 
     def calculate_phi_delta(self) -> (int, int):
         """Calculates the phi/delta numbers of the state env is currently in base on the phi/delta numbers of
@@ -141,8 +407,8 @@ class DFPN(Agent):
             # env.step(action=action)
             self.hasher.move(action=action)
 
-            transposition = self.hasher.hash()
-            child_phi, child_delta = self.tt.retrieve(transposition=transposition)
+            transposition = self.hasher.hash_key()
+            child_phi, child_delta = self._retrieve_child(action=action, transposition=transposition)
             sum_phi_of_children += child_phi
             min_delta_of_children = min(min_delta_of_children, child_delta)
 
@@ -169,9 +435,10 @@ class DFPN(Agent):
 
         for action in env.actions():
             self.hasher.move(action=action)
-            transposition = self.hasher.hash()
-            child_phi, child_delta = self.tt.retrieve(transposition=transposition)
-            if child_delta < best_child_delta:
+            transposition = self.hasher.hash_key()
+            child_phi, child_delta = self._retrieve_child(action=action, transposition=transposition)
+            # In a lost state, every child has a delta number of INF, but an action must still be selected.
+            if best_action == -1 or child_delta < best_child_delta:
                 best_action = action
                 best_child_phi = child_phi
                 second_best_child_delta = best_child_delta
@@ -183,6 +450,32 @@ class DFPN(Agent):
 
         return best_action, best_child_phi, second_best_child_delta
 
+    @staticmethod
+    def _select_child_index(child_phis: List[int], child_deltas: List[int]) -> (int, int, int):
+        """Selects the best child from the cached phi/delta numbers of the children of the current state.
+
+        Args:
+            child_phis (List[int]): the phi number of each child.
+            child_deltas (List[int]): the delta number of each child.
+
+        Returns:
+            best_index (int): The index of the best child.
+            phi_c (int): The phi number of the best child.
+            delta_2 (int): The second smallest delta number that belongs to a child of the given state.
+        """
+        best_index = -1
+        best_child_delta = DFPN.INF
+        second_best_child_delta = DFPN.INF
+        for index, child_delta in enumerate(child_deltas):
+            # Children whose delta numbers have reached INF can still be selected if no child is below INF.
+            if best_index == -1 or child_delta < best_child_delta:
+                best_index = index
+                second_best_child_delta = best_child_delta
+                best_child_delta = child_delta
+            elif child_delta < second_best_child_delta:
+                second_best_child_delta = child_delta
+        return best_index, child_phis[best_index], second_best_child_delta
+
     def action(self, env, last_action=None):
         """
         Requires:
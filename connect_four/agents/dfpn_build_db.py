@@ -2,20 +2,27 @@ import gym
 
 import time
 
-from connect_four.agents import DFPN
+from connect_four.agents import DFPN, SearchCheckpoint, SearchProgress
 from connect_four.agents import difficult_connect_four_positions
+from connect_four.evaluation import EvaluationCache
 from connect_four.evaluation.victor.victor_evaluator import Victor
 from connect_four.hashing import ConnectFourHasher
 from connect_four.transposition.sqlite_transposition_table import SQLiteTranspositionTable
 
-env = gym.make('connect_four-v0')
+env = gym.make('connect_four-v0', copy_observations=False)
 
 env.reset()
 
-evaluator = Victor(model=env)
-hasher = ConnectFourHasher(env=env)
+# Victor evaluations are kept across runs of this script, so later runs do not evaluate the same positions again.
+cache = EvaluationCache(max_size=10000000)
+cache.load(file="connect_four.cache")
+evaluator = Victor(model=env, cache=cache)
+hasher = ConnectFourHasher(env=env, canonical=True)
 tt = SQLiteTranspositionTable(database_file="connect_four.db")
-agent = DFPN(evaluator, hasher, tt)
+# Flushes tt and saves the search stack every 10 minutes. If the build is interrupted,
+# running this script again resumes it from the last checkpoint.
+checkpoint = SearchCheckpoint(file="connect_four.checkpoint", interval=600)
+agent = DFPN(evaluator, hasher, tt, progress=SearchProgress(interval=10000), checkpoint=checkpoint)
 
 start = time.time()
 evaluation = agent.depth_first_proof_number_search(env=env)
@@ -23,3 +30,4 @@ end = time.time()
 print(evaluation)
 print("time to run = ", end - start)
 tt.close()
+cache.save(file="connect_four.cache")
@@ -0,0 +1,41 @@
+import gym
+
+import time
+
+from connect_four.agents import DFPN, SearchBudget
+from connect_four.agents import difficult_connect_four_positions
+from connect_four.evaluation.victor.victor_evaluator import Victor
+from connect_four.hashing import ConnectFourHasher
+from connect_four.transposition.simple_transposition_table import SimpleTranspositionTable
+
+# Compares the number of nodes DFPN expands on the difficult positions with and without the 1+epsilon trick.
+# Only diagram_11_1 finishes within MAX_TIME, in 8 nodes either way, so these positions show no reduction yet.
+# The tested result is on tic-tac-toe: from the initial state, DFPN expands 1659 nodes with epsilon = 0 and
+# 1359 with epsilon = 1.0 (see dfpn_test_tic_tac_toe.py).
+EPSILONS = [0.0, 0.25]
+# Searches that have not finished after this many seconds are reported as ProofStatus.Unknown.
+MAX_TIME = 20
+
+env = gym.make('connect_four-v0')
+
+positions = [
+    (name, env_variables) for name, env_variables in vars(difficult_connect_four_positions).items()
+    if name.startswith(("diagram_", "position_"))
+]
+
+for name, env_variables in positions:
+    for epsilon in EPSILONS:
+        env.reset(env_variables)
+        agent = DFPN(
+            evaluator=Victor(model=env),
+            hasher=ConnectFourHasher(env=env),
+            tt=SimpleTranspositionTable(),
+            budget=SearchBudget(max_time=MAX_TIME),
+            epsilon=epsilon,
+        )
+
+        start = time.time()
+        status = agent.depth_first_proof_number_search(env=env)
+        end = time.time()
+        print("%s, epsilon = %s: %s, nodes = %d, time = %.2f" % (
+            name, epsilon, status, agent.budget.num_nodes, end - start))
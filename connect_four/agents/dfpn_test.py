@@ -25,6 +25,18 @@ class TestDFPN(unittest.TestCase):
         self.assertEqual(0, got_phi)
         self.assertEqual(DFPN.INF, got_delta)
 
+    def test_child_delta_threshold_without_epsilon(self):
+        agent = DFPN(evaluator=None, hasher=None, tt=None)
+        self.assertEqual(11, agent._child_delta_threshold(delta_2=10))
+
+    def test_child_delta_threshold_with_epsilon(self):
+        agent = DFPN(evaluator=None, hasher=None, tt=None, epsilon=0.25)
+        self.assertEqual(13, agent._child_delta_threshold(delta_2=10))
+        # The threshold is always greater than delta_2.
+        self.assertEqual(2, agent._child_delta_threshold(delta_2=1))
+        # delta_2 is INF when there is only one child.
+        self.assertEqual(DFPN.INF + 1, agent._child_delta_threshold(delta_2=DFPN.INF))
+
 
 if __name__ == '__main__':
     unittest.main()
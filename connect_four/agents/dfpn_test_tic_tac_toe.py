@@ -1,12 +1,17 @@
 import gym
+import os
+import tempfile
 import unittest
 
 import numpy as np
 
-from connect_four.agents import DFPN
+from connect_four.agents import DFPN, SearchBudget, SearchCheckpoint, SearchProgress
+from connect_four.evaluation import ProofStatus
 from connect_four.evaluation.simple_evaluator import SimpleEvaluator
 from connect_four.hashing import TicTacToeHasher
+from connect_four.transposition.fixed_size_transposition_table import FixedSizeTranspositionTable
 from connect_four.transposition.simple_transposition_table import SimpleTranspositionTable
+from connect_four.transposition.sqlite_transposition_table import SQLiteTranspositionTable
 
 
 class TestDFPNTicTacToe(unittest.TestCase):
@@ -27,7 +32,7 @@ class TestDFPNTicTacToe(unittest.TestCase):
         # Make sure at least one of the children is in the TT.
         # Looping isn't ideal for testing and manually testing all 9 children would lead to a long test.
         hasher.move(action=0)
-        phi, delta = tt.retrieve(transposition=hasher.hash())
+        phi, delta = tt.retrieve(transposition=hasher.hash_key())
         self.assertEqual(1, phi)
         self.assertEqual(1, delta)
 
@@ -60,7 +65,7 @@ class TestDFPNTicTacToe(unittest.TestCase):
 
         # Verify that any moves that lead to X winning will be considered "Proven".
         hasher.move(action=2)
-        phi, delta = tt.retrieve(transposition=hasher.hash())
+        phi, delta = tt.retrieve(transposition=hasher.hash_key())
         hasher.undo_move()
         # Since child_2 is an AND node, the phi number is INF because it is impossible to disprove the node.
         self.assertEqual(DFPN.INF, phi)
@@ -68,7 +73,7 @@ class TestDFPNTicTacToe(unittest.TestCase):
 
         # Verify that any moves that allow the board to continue will be considered "Unknown".
         hasher.move(action=5)
-        phi, delta = tt.retrieve(transposition=hasher.hash())
+        phi, delta = tt.retrieve(transposition=hasher.hash_key())
         # Since child_2 is an AND node, the phi number is 0 because it disproved the node.
         self.assertEqual(1, phi)
         self.assertEqual(1, delta)
@@ -211,6 +216,159 @@ class TestDFPNTicTacToe(unittest.TestCase):
         # delta should be 0.
         self.assertEqual(0, delta)
 
+    def test_multiple_iterative_deepening_OR_Disproven_initial_state_canonical(self):
+        # Symmetric positions share a TT entry, so fewer entries are needed to disprove the initial state.
+        evaluator = SimpleEvaluator(model=self.env)
+        tt = SimpleTranspositionTable()
+        agent = DFPN(evaluator, TicTacToeHasher(env=self.env, canonical=True), tt)
+
+        phi, delta = agent.multiple_iterative_deepening(env=self.env, phi_threshold=DFPN.INF, delta_threshold=DFPN.INF)
+        self.assertGreaterEqual(phi, DFPN.INF)
+        self.assertEqual(0, delta)
+
+        canonical_tt_size = len(tt.transposition_to_phi_delta_numbers)
+        tt = SimpleTranspositionTable()
+        agent = DFPN(SimpleEvaluator(model=self.env), TicTacToeHasher(env=self.env), tt)
+        agent.multiple_iterative_deepening(env=self.env, phi_threshold=DFPN.INF, delta_threshold=DFPN.INF)
+        self.assertLess(canonical_tt_size, len(tt.transposition_to_phi_delta_numbers))
+
+    def test_multiple_iterative_deepening_OR_Disproven_initial_state_fixed_size_tt(self):
+        # The TT is too small to hold every state, so children are regenerated after they are replaced.
+        tt = FixedSizeTranspositionTable(size_bits=10)
+        agent = DFPN(SimpleEvaluator(model=self.env), TicTacToeHasher(env=self.env), tt)
+
+        phi, delta = agent.multiple_iterative_deepening(env=self.env, phi_threshold=DFPN.INF, delta_threshold=DFPN.INF)
+        self.assertGreaterEqual(phi, DFPN.INF)
+        self.assertEqual(0, delta)
+        self.assertGreater(tt.num_overwrites, 0)
+
+    def test_multiple_iterative_deepening_reuses_stack(self):
+        agent = DFPN(SimpleEvaluator(model=self.env), TicTacToeHasher(env=self.env), SimpleTranspositionTable())
+        agent.multiple_iterative_deepening(env=self.env, phi_threshold=DFPN.INF, delta_threshold=DFPN.INF)
+
+        # There is one frame per ply. Tic-Tac-Toe has at most 9 moves, and terminal states are never expanded.
+        self.assertLessEqual(len(agent.stack), 9)
+        frames = list(agent.stack)
+        child_phis = agent.stack[0].child_phis
+
+        # A second search reuses the same frames and lists.
+        phi, delta = agent.multiple_iterative_deepening(
+            env=self.env, phi_threshold=DFPN.INF, delta_threshold=DFPN.INF)
+        self.assertGreaterEqual(phi, DFPN.INF)
+        self.assertEqual(0, delta)
+        self.assertIs(frames[0], agent.stack[0])
+        self.assertIs(child_phis, agent.stack[0].child_phis)
+
+    def test_depth_first_proof_number_search_resume_from_checkpoint(self):
+        class Crash(Exception):
+            pass
+
+        def crash(progress):
+            raise Crash()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file = os.path.join(temp_dir, "search.checkpoint")
+            # The TT outlives the crash, like a database that was flushed at the last checkpoint.
+            tt = SimpleTranspositionTable()
+            agent = DFPN(SimpleEvaluator(model=self.env), TicTacToeHasher(env=self.env), tt,
+                         progress=SearchProgress(callback=crash, interval=500),
+                         checkpoint=SearchCheckpoint(file=file, interval=0))
+            with self.assertRaises(Crash):
+                agent.depth_first_proof_number_search(env=self.env)
+            self.assertTrue(os.path.exists(file))
+
+            self.env.reset()
+            budget = SearchBudget()
+            agent = DFPN(SimpleEvaluator(model=self.env), TicTacToeHasher(env=self.env), tt, budget=budget,
+                         checkpoint=SearchCheckpoint(file=file, interval=0))
+            self.assertEqual(ProofStatus.Disproven, agent.depth_first_proof_number_search(env=self.env))
+            # The resumed search does not repeat the work done before the crash. A full search expands 1659 nodes.
+            self.assertLess(budget.num_nodes, 1659 - 400)
+            # The checkpoint is removed once the search finishes, and env is back at the root.
+            self.assertFalse(os.path.exists(file))
+            self.assertEqual(9, len(self.env.actions()))
+
+    def test_depth_first_proof_number_search_epsilon(self):
+        agent = DFPN(SimpleEvaluator(model=self.env), TicTacToeHasher(env=self.env), SimpleTranspositionTable(),
+                     epsilon=0.25)
+        self.assertEqual(ProofStatus.Disproven, agent.depth_first_proof_number_search(env=self.env))
+
+    def test_depth_first_proof_number_search_epsilon_num_nodes(self):
+        # The 1+epsilon trick expands fewer nodes to disprove the initial state.
+        want_num_nodes = {0.0: 1659, 1.0: 1359}
+        for epsilon, num_nodes in want_num_nodes.items():
+            self.env.reset()
+            budget = SearchBudget()
+            agent = DFPN(SimpleEvaluator(model=self.env), TicTacToeHasher(env=self.env), SimpleTranspositionTable(),
+                         budget=budget, epsilon=epsilon)
+            self.assertEqual(ProofStatus.Disproven, agent.depth_first_proof_number_search(env=self.env))
+            self.assertEqual(num_nodes, budget.num_nodes)
+
+    def test_depth_first_proof_number_search_budget(self):
+        # The initial state cannot be disproven in 10 nodes. The partial results are still saved to the TT.
+        tt = SimpleTranspositionTable()
+        agent = DFPN(SimpleEvaluator(model=self.env), TicTacToeHasher(env=self.env), tt,
+                     budget=SearchBudget(max_nodes=10))
+        self.assertEqual(ProofStatus.Unknown, agent.depth_first_proof_number_search(env=self.env))
+        self.assertEqual(10, agent.budget.num_nodes)
+        self.assertIn(agent.hasher.hash_key(), tt)
+        phi, delta = tt.retrieve(transposition=agent.hasher.hash_key())
+        self.assertGreater(phi, 0)
+        self.assertGreater(delta, 0)
+
+        # The best action is chosen from the current phi/delta numbers.
+        self.assertIn(agent.action(env=self.env), self.env.actions())
+
+        # Later searches continue from the saved phi/delta numbers.
+        agent.budget = None
+        agent.hasher.undo_move()
+        agent.evaluator.undo_move()
+        self.assertEqual(ProofStatus.Disproven, agent.depth_first_proof_number_search(env=self.env))
+
+    def test_depth_first_proof_number_search_budget_sqlite(self):
+        tt = SQLiteTranspositionTable(database_file=":memory:")
+        agent = DFPN(SimpleEvaluator(model=self.env), TicTacToeHasher(env=self.env), tt,
+                     budget=SearchBudget(max_tt_size=100))
+        self.assertIn(agent.action(env=self.env), self.env.actions())
+        self.assertGreaterEqual(len(tt), 100)
+        tt.close()
+
+    def test_depth_first_proof_number_search_progress(self):
+        reports = []
+        agent = DFPN(SimpleEvaluator(model=self.env), TicTacToeHasher(env=self.env), SimpleTranspositionTable(),
+                     progress=SearchProgress(callback=reports.append, interval=100))
+        self.assertEqual(ProofStatus.Disproven, agent.depth_first_proof_number_search(env=self.env))
+
+        # One report every 100 nodes, and a final report with the (dis)proven root.
+        self.assertEqual(agent.progress.num_nodes // 100 + 1, len(reports))
+        final = reports[-1]
+        self.assertEqual(agent.progress.num_nodes, final.num_nodes)
+        self.assertGreaterEqual(final.root_phi, DFPN.INF)
+        self.assertEqual(0, final.root_delta)
+        self.assertEqual(0, final.depth)
+        self.assertGreater(final.tt_hit_rate, 0)
+        self.assertLess(final.tt_hit_rate, 1)
+        self.assertTrue(any(report.depth > 0 for report in reports[:-1]))
+
+    def test_action_canonical(self):
+        # X wins by playing in the top-right corner. The action must refer to the board as given,
+        # not to whichever rotation or reflection of the child is stored in the TT.
+        self.env.state = np.array([
+            [
+                [1, 1, 0, ],
+                [0, 0, 0, ],
+                [0, 0, 0, ],
+            ],
+            [
+                [0, 0, 0, ],
+                [1, 1, 0, ],
+                [0, 0, 0, ],
+            ],
+        ])
+        agent = DFPN(SimpleEvaluator(model=self.env), TicTacToeHasher(env=self.env, canonical=True),
+                     SimpleTranspositionTable())
+        self.assertEqual(2, agent.action(env=self.env))
+
     def test_multiple_iterative_deepening_AND_Disproven_near_terminal_state(self):
         # In this state, AND is to move but the board is a draw.
         self.env.state = np.array([
@@ -1,19 +1,24 @@
 import numpy as np
 
 from connect_four.agents.agent import Agent
+from connect_four.envs import BatchConnectFourEnv
+from connect_four.envs.bitboard_connect_four_env import make_rollout_env
 
 np.seterr(divide='ignore', invalid='ignore')
 
 
 class FlatMonteCarlo(Agent):
 
-    def __init__(self, num_rollouts):
+    def __init__(self, num_rollouts, batch=False):
         """
 
     Args:
       num_rollouts: the number of rollouts we simulate
+      batch: if True, all rollouts are played in lockstep in a BatchConnectFourEnv.
+        Only supported when env is a ConnectFourEnv.
   """
         self.num_rollouts = num_rollouts
+        self.batch = batch
 
     def action(self, env, last_action=None):
         """Returns an action.
@@ -29,26 +34,45 @@ class FlatMonteCarlo(Agent):
     Returns:
       the best action after performing num_rollouts simulations
   """
+        if self.batch:
+            return self._batch_action(env)
+
         action_total_values = np.zeros(env.action_space)
         action_visits = np.zeros(env.action_space)
 
         # Perform rollouts.
-        env_variables = env.env_variables
+        rollout_env = make_rollout_env(env)
+        env_variables = rollout_env.env_variables
         for _ in range(self.num_rollouts):
             # Select an action for rollout.
-            action = self._select_action_for_rollout(env)
+            action = self._select_action_for_rollout(rollout_env)
 
             # Perform a rollout after taking the action.
-            value = self.rollout(env, action)
+            value = self.rollout(rollout_env, action)
 
             # Adjust action-value for the action.
             action_total_values[action] += value
             action_visits[action] += 1
 
             # Reset the environment to the original state.
-            env.reset(env_variables)
+            rollout_env.reset(env_variables)
+
+        # Select action with the highest action-value.
+        action_values = np.divide(action_total_values, action_visits)
+        best_action = np.nanargmax(action_values)
+        return best_action
+
+    def _batch_action(self, env):
+        batch_env = BatchConnectFourEnv(num_envs=self.num_rollouts, copy_observations=False)
+        batch_env.reset(env_variables=env.env_variables)
+
+        # Select an action for every rollout and perform all rollouts at once.
+        actions = np.random.randint(env.action_space, size=self.num_rollouts)
+        values = self.batch_rollout(batch_env, actions)
 
         # Select action with the highest action-value.
+        action_total_values = np.bincount(actions, weights=values, minlength=env.action_space)
+        action_visits = np.bincount(actions, minlength=env.action_space)
         action_values = np.divide(action_total_values, action_visits)
         best_action = np.nanargmax(action_values)
         return best_action
@@ -90,3 +114,34 @@ class FlatMonteCarlo(Agent):
             value *= -1
 
         return value
+
+    @staticmethod
+    def batch_rollout(batch_env, actions):
+        """Obtains a sample estimate of the action-value for the current player of every game in batch_env.
+
+      Args:
+        batch_env (BatchConnectFourEnv): Note that this function modifies batch_env
+                and every game in batch_env will reach a terminal state.
+        actions (np.ndarray): an int array of shape (batch_env.num_envs,).
+                The action to obtain a sample estimate of the action-value for in each game.
+
+      Returns:
+        values (np.ndarray): a float array of shape (batch_env.num_envs,).
+                The total return after performing a rollout in each game.
+      """
+        _, rewards, dones, _ = batch_env.step(actions)
+        values = rewards
+        sign = 1
+
+        while not dones.all():
+            # Select a random action for every game.
+            actions = np.random.randint(batch_env.action_space, size=batch_env.num_envs)
+            _, rewards, now_dones, _ = batch_env.step(actions)
+
+            # The reward belongs to the player who moved. Inverse it for every move since the first.
+            sign *= -1
+            finished = now_dones & ~dones
+            values[finished] = sign * rewards[finished]
+            dones = now_dones
+
+        return values
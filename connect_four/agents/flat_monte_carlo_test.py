@@ -4,6 +4,7 @@ import gym
 import numpy as np
 
 from connect_four.agents import FlatMonteCarlo
+from connect_four.envs import BatchConnectFourEnv
 from connect_four.envs.connect_four_env import ConnectFourEnv
 
 
@@ -36,6 +37,16 @@ class TestFlatMonteCarlo(unittest.TestCase):
         action = agent.action(env=self.env)
         self.assertEqual(3, action)
 
+    def test_action_leaves_env_unchanged(self):
+        self.env.step(0)
+        want_state = self.env.state.copy()
+        agent = FlatMonteCarlo(num_rollouts=20)
+        agent.action(env=self.env)
+        # Rollouts are played in a separate environment.
+        self.assertIsNone(np.testing.assert_array_equal(want_state, self.env.state))
+        self.assertEqual(1, self.env.player_turn)
+        self.assertEqual(1, len(self.env.moves))
+
     def test_immediate_drawing_action_selected(self):
         # Assumes env.step() only evaluates the win condition based
         # on the most recent move.
@@ -102,6 +113,47 @@ class TestFlatMonteCarlo(unittest.TestCase):
         action = agent.action(env=self.env)
         self.assertEqual(3, action)
 
+    def test_batch_prevent_immediate_win(self):
+        self.env.state = np.array([
+            [
+                [0, 0, 0, 0, ],
+                [1, 1, 1, 0, ],
+                [0, 0, 0, 0, ],
+                [0, 0, 0, 0, ],
+            ],
+            [
+                [1, 1, 0, 0, ],
+                [0, 0, 0, 1, ],
+                [1, 1, 1, 1, ],
+                [1, 1, 1, 1, ],
+            ],
+        ])
+        agent = FlatMonteCarlo(num_rollouts=1000, batch=True)
+        action = agent.action(env=self.env)
+        self.assertEqual(3, action)
+
+    def test_batch_rollout_values(self):
+        # Player 1 wins immediately in column 3. Column 0 is full, so playing there loses immediately.
+        # Playing in column 2 lets Player 2 win in column 3 on the next move.
+        self.env.state = np.array([
+            [
+                [0, 0, 0, 0, ],
+                [0, 0, 0, 1, ],
+                [0, 0, 0, 1, ],
+                [0, 0, 0, 1, ],
+            ],
+            [
+                [1, 1, 1, 0, ],
+                [1, 1, 1, 0, ],
+                [1, 1, 1, 0, ],
+                [1, 1, 1, 0, ],
+            ],
+        ])
+        batch_env = BatchConnectFourEnv(num_envs=2)
+        batch_env.reset(env_variables=self.env.env_variables)
+        values = FlatMonteCarlo.batch_rollout(batch_env, np.array([3, 0]))
+        self.assertIsNone(np.testing.assert_array_equal([1, -1], values))
+
 
 if __name__ == '__main__':
     unittest.main()
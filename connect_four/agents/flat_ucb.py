@@ -1,6 +1,9 @@
 import numpy as np
 
 from connect_four.agents.agent import Agent
+from connect_four.agents.flat_monte_carlo import FlatMonteCarlo
+from connect_four.envs import BatchConnectFourEnv
+from connect_four.envs.bitboard_connect_four_env import make_rollout_env
 
 np.seterr(divide='ignore', invalid='ignore')
 
@@ -8,13 +11,16 @@ np.seterr(divide='ignore', invalid='ignore')
 class FlatUCB(Agent):
     EXPLORATION_CONSTANT = 4
 
-    def __init__(self, num_rollouts=1):
+    def __init__(self, num_rollouts=1, batch_size=None):
         """
 
     Args:
       num_rollouts: the number of rollouts we simulate
+      batch_size: if not None, rollouts are played in lockstep in a BatchConnectFourEnv, batch_size at a time.
+        Only supported when env is a ConnectFourEnv.
   """
         self.num_rollouts = num_rollouts
+        self.batch_size = batch_size
 
     def action(self, env, last_action=None):
         """Returns an action.
@@ -34,28 +40,59 @@ class FlatUCB(Agent):
         action_visits = np.zeros(env.action_space)
 
         # Perform rollouts.
-        env_variables = env.env_variables
-        for _ in range(self.num_rollouts):
-            # Select an action for rollout.
-            action = self._select_action_for_rollout(action_total_values, action_visits)
+        if self.batch_size is not None:
+            self._batch_rollouts(env.env_variables, action_total_values, action_visits)
+        else:
+            rollout_env = make_rollout_env(env)
+            env_variables = rollout_env.env_variables
+            for _ in range(self.num_rollouts):
+                # Select an action for rollout.
+                action = self._select_action_for_rollout(action_total_values, action_visits)
 
-            # Perform a rollout after taking the action.
-            value = self.rollout(env, action)
+                # Perform a rollout after taking the action.
+                value = self.rollout(rollout_env, action)
 
-            # Adjust action-value for the action.
-            action_total_values[action] += value
-            action_visits[action] += 1
+                # Adjust action-value for the action.
+                action_total_values[action] += value
+                action_visits[action] += 1
 
-            # Reset the environment to the original state.
-            env.reset(env_variables)
+                # Reset the environment to the original state.
+                rollout_env.reset(env_variables)
 
         # Uncomment below line to see the number of times each action was visited.
-        print("action_visits =", action_visits, "=>", np.sum(action_visits))
+        # print("action_visits =", action_visits, "=>", np.sum(action_visits))
 
         # Select action with the highest action-value.
         best_action = np.argmax(action_visits)
         return best_action
 
+    def _batch_rollouts(self, env_variables, action_total_values, action_visits):
+        """Performs num_rollouts rollouts from env_variables, batch_size at a time.
+
+        Modifies:
+          - action_total_values and action_visits will include the results of every rollout.
+        """
+        batch_env = BatchConnectFourEnv(num_envs=self.batch_size, copy_observations=False)
+        for start in range(0, self.num_rollouts, self.batch_size):
+            num_envs = min(self.batch_size, self.num_rollouts - start)
+
+            # Select an action for each rollout in this batch. Rollouts that are still pending count as visits
+            # with no value so that the batch is spread across actions.
+            actions = np.zeros(self.batch_size, dtype=np.intp)
+            pending_visits = np.zeros_like(action_visits)
+            for i in range(num_envs):
+                actions[i] = self._select_action_for_rollout(action_total_values, action_visits + pending_visits)
+                pending_visits[actions[i]] += 1
+
+            # Perform the rollouts after taking the actions. Unused games are marked done before they start.
+            batch_env.reset(env_variables=env_variables)
+            batch_env.dones[num_envs:] = True
+            values = FlatMonteCarlo.batch_rollout(batch_env, actions)
+
+            # Adjust action-values for the actions.
+            np.add.at(action_total_values, actions[:num_envs], values[:num_envs])
+            action_visits += pending_visits
+
     @staticmethod
     def _select_action_for_rollout(action_total_values, action_visits) -> int:
         # Select an action from the environment's action space using bandit-based selection.
@@ -1,8 +1,10 @@
 import unittest
 
+import gym
 import numpy as np
 
 from connect_four.agents import FlatUCB
+from connect_four.envs.connect_four_env import ConnectFourEnv
 
 
 class TestFlatUCB(unittest.TestCase):
@@ -13,6 +15,32 @@ class TestFlatUCB(unittest.TestCase):
         action = agent._select_action_for_rollout(action_total_values, action_visits)
         self.assertEqual(1, action)
 
+    def test_batch_immediate_winning_action_selected(self):
+        ConnectFourEnv.M = 4
+        ConnectFourEnv.N = 4
+        ConnectFourEnv.action_space = 4
+        env = gym.make('connect_four-v0')
+        env.state = np.array([
+            [
+                [0, 0, 0, 0, ],
+                [0, 0, 0, 1, ],
+                [0, 0, 0, 1, ],
+                [0, 0, 0, 1, ],
+            ],
+            [
+                [1, 1, 1, 0, ],
+                [1, 1, 1, 0, ],
+                [1, 1, 1, 0, ],
+                [1, 1, 1, 0, ],
+            ],
+        ])
+        agent = FlatUCB(num_rollouts=100, batch_size=16)
+        action = agent.action(env=env)
+        ConnectFourEnv.M = 6
+        ConnectFourEnv.N = 7
+        ConnectFourEnv.action_space = 7
+        self.assertEqual(3, action)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,66 @@
+import os
+import sqlite3
+
+from connect_four.envs import ConnectFourEnv
+from connect_four.hashing import ConnectFourHasher
+from connect_four.transposition.sqlite_transposition_table import SQLiteTranspositionTable
+
+
+def stored_transposition(text: str, num_rows: int, num_cols: int) -> int:
+    """Converts a Transposition stored by SQLiteTranspositionTable into the key DFPN looks it up by.
+
+    Hasher.hash() transpositions have one digit per square, while Hasher.hash_key() transpositions are 64-bit ints
+    stored as decimal TEXT with at most 20 digits. Both consist only of digits, so they are told apart by length.
+
+    Args:
+        text (str): a value of the Transposition column.
+        num_rows (int): the number of rows of the board the database was built for.
+        num_cols (int): the number of columns of the board the database was built for.
+
+    Returns:
+        key (int): the hash_key() of a canonical ConnectFourHasher at the stored state.
+    """
+    if len(text) == num_rows * num_cols:
+        return ConnectFourHasher.key_from_hash(transposition=text, num_rows=num_rows, num_cols=num_cols)
+    return int(text)
+
+
+def migrate_sqlite_to_hash_key(database_file: str, new_database_file: str, num_rows: int, num_cols: int) -> int:
+    """Copies every entry of an SQLiteTranspositionTable database into a new one keyed by hash_key().
+
+    Databases built before DFPN switched to hash_key(), like the downloadable connect_four.db, are keyed by
+    Hasher.hash(). DFPN never looks up those keys.
+
+    Args:
+        database_file (str): the path of the SQLite database to migrate. It is not modified.
+        new_database_file (str): the path of the SQLite database to write.
+        num_rows (int): the number of rows of the board the database was built for.
+        num_cols (int): the number of columns of the board the database was built for.
+
+    Returns:
+        num_entries (int): the number of entries copied.
+    """
+    con = sqlite3.connect(database=database_file)
+    cursor = con.cursor()
+    new_tt = SQLiteTranspositionTable(database_file=new_database_file)
+
+    num_entries = 0
+    cursor.execute("SELECT Transposition, Phi, Delta FROM PhiDelta")
+    for transposition, phi, delta in cursor:
+        new_tt.save(transposition=stored_transposition(text=transposition, num_rows=num_rows, num_cols=num_cols),
+                    phi=phi, delta=delta)
+        num_entries += 1
+
+    new_tt.close()
+    cursor.close()
+    con.close()
+    return num_entries
+
+
+if __name__ == '__main__':
+    # The original database is kept as connect_four.legacy.db.
+    num_migrated = migrate_sqlite_to_hash_key(database_file="connect_four.db", new_database_file="connect_four.db.tmp",
+                                              num_rows=ConnectFourEnv.M, num_cols=ConnectFourEnv.N)
+    os.replace("connect_four.db", "connect_four.legacy.db")
+    os.replace("connect_four.db.tmp", "connect_four.db")
+    print("migrated", num_migrated, "transpositions")
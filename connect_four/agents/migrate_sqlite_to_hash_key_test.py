@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+import gym
+
+from connect_four.agents.migrate_sqlite_to_hash_key import migrate_sqlite_to_hash_key, stored_transposition
+from connect_four.envs import ConnectFourEnv
+from connect_four.hashing import ConnectFourHasher
+from connect_four.transposition.sqlite_transposition_table import SQLiteTranspositionTable
+
+
+class TestMigrateSQLiteToHashKey(unittest.TestCase):
+    def setUp(self) -> None:
+        ConnectFourEnv.M = 6
+        ConnectFourEnv.N = 7
+        self.env = gym.make('connect_four-v0')
+        self.env.reset()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.database_file = os.path.join(self.temp_dir.name, "connect_four.legacy.db")
+        self.new_database_file = os.path.join(self.temp_dir.name, "connect_four.db")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_stored_transposition(self):
+        hasher = ConnectFourHasher(env=self.env, canonical=True)
+        hasher.move(action=1)
+        # hash() keys consist only of digits too.
+        self.assertTrue(hasher.hash().isdigit())
+        self.assertEqual(hasher.hash_key(), stored_transposition(text=hasher.hash(), num_rows=6, num_cols=7))
+        self.assertEqual(hasher.hash_key(), stored_transposition(text=str(hasher.hash_key()), num_rows=6, num_cols=7))
+
+    def test_migrate(self):
+        hasher = ConnectFourHasher(env=self.env, canonical=True)
+        hasher.move(action=3)
+        legacy_transposition = hasher.hash()
+        legacy_key = hasher.hash_key()
+        hasher.move(action=2)
+        transposition = hasher.hash_key()
+
+        tt = SQLiteTranspositionTable(database_file=self.database_file)
+        tt.save(transposition=legacy_transposition, phi=2, delta=3)
+        tt.save(transposition=transposition, phi=4, delta=5)
+        tt.close()
+
+        self.assertEqual(2, migrate_sqlite_to_hash_key(database_file=self.database_file,
+                                                       new_database_file=self.new_database_file, num_rows=6,
+                                                       num_cols=7))
+
+        new_tt = SQLiteTranspositionTable(database_file=self.new_database_file)
+        self.assertNotIn(legacy_transposition, new_tt)
+        self.assertEqual((2, 3), new_tt.retrieve(transposition=legacy_key))
+        self.assertEqual((4, 5), new_tt.retrieve(transposition=transposition))
+        new_tt.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -25,9 +25,6 @@ class Minimax(Agent):
         return self._minimax(env, self.max_depth)[0]
 
     def _minimax(self, env, depth, gamma=0.99):
-        # Get the current state and player.
-        env_variables = env.env_variables
-
         action_values = []
 
         for action in range(env.action_space):
@@ -48,7 +45,7 @@ class Minimax(Agent):
                 value = reward - other_player_value
                 action_values.append(value)
             # undo move
-            env.reset(env_variables)
+            env.undo()
 
         best_action = np.argmax(np.array(action_values))
         # noinspection PyTypeChecker
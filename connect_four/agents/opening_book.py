@@ -0,0 +1,201 @@
+import struct
+import sys
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, Tuple
+
+from connect_four.agents.dfpn import DFPN
+from connect_four.evaluation import ProofStatus, NodeType, Evaluator
+from connect_four.hashing import Hasher
+from connect_four.transposition import TranspositionTable
+from connect_four.transposition.transposition_table import stable_key
+
+
+class OpeningBook:
+    """Maps solved states to their best action and ProofStatus.
+
+    Entries are kept in three parallel arrays sorted by key, so a lookup is a binary search. Keys are
+    Hasher.hash_key() of the states, and actions are Hasher.canonical_action() of the best action, so a canonical
+    Hasher needs only one entry for all rotations and reflections of a state.
+
+    The file is a header followed by the keys as unsigned 64-bit little-endian integers, then one byte per entry for
+    the actions and one byte per entry for the ProofStatus values.
+    """
+
+    MAGIC = b"CFOB"
+    VERSION = 1
+    # magic, version, number of entries.
+    HEADER = struct.Struct("<4sIQ")
+
+    def __init__(self, entries: Dict[int, Tuple[int, ProofStatus]] = None):
+        """
+
+        Args:
+            entries (Dict[int, Tuple[int, ProofStatus]]): maps the keys of states to their best canonical action and
+                their ProofStatus.
+        """
+        entries = entries or {}
+        keys = sorted(entries)
+        self.keys = array('Q', keys)
+        self.actions = bytes(entries[key][0] for key in keys)
+        self.statuses = bytes(entries[key][1].value for key in keys)
+
+    def lookup(self, key: int) -> (int, ProofStatus):
+        """
+        Args:
+            key (int): the key of a state.
+
+        Returns:
+            canonical_action (int): the best action of the state, or None if it is not in this OpeningBook.
+            status (ProofStatus): the ProofStatus of the state. Unknown if it is not in this OpeningBook.
+        """
+        key = stable_key(transposition=key)
+        index = bisect_left(self.keys, key)
+        if index == len(self.keys) or self.keys[index] != key:
+            return None, ProofStatus.Unknown
+        return self.actions[index], ProofStatus(self.statuses[index])
+
+    def __contains__(self, item):
+        return self.lookup(key=item)[0] is not None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def save(self, file: str):
+        """Writes this OpeningBook to file.
+
+        Args:
+            file (str): the path of the opening book file.
+        """
+        keys = array('Q', self.keys)
+        if sys.byteorder == "big":
+            keys.byteswap()
+        with open(file, "wb") as f:
+            f.write(OpeningBook.HEADER.pack(OpeningBook.MAGIC, OpeningBook.VERSION, len(keys)))
+            f.write(keys.tobytes())
+            f.write(self.actions)
+            f.write(self.statuses)
+
+    @staticmethod
+    def load(file: str):
+        """
+        Args:
+            file (str): the path of an opening book file written by save().
+
+        Raises:
+            ValueError: if the file is not an opening book file.
+
+        Returns:
+            book (OpeningBook): the OpeningBook stored in file.
+        """
+        with open(file, "rb") as f:
+            data = f.read()
+        magic, version, num_entries = OpeningBook.HEADER.unpack_from(data, 0)
+        if magic != OpeningBook.MAGIC or version != OpeningBook.VERSION:
+            raise ValueError("not an opening book file:", file)
+
+        book = OpeningBook()
+        offset = OpeningBook.HEADER.size
+        book.keys = array('Q')
+        book.keys.frombytes(data[offset:offset + 8 * num_entries])
+        if sys.byteorder == "big":
+            book.keys.byteswap()
+        offset += 8 * num_entries
+        book.actions = data[offset:offset + num_entries]
+        offset += num_entries
+        book.statuses = data[offset:offset + num_entries]
+        return book
+
+
+def extract_proof_tree(evaluator: Evaluator, hasher: Hasher,
+                       tt: TranspositionTable) -> Dict[int, Tuple[int, ProofStatus]]:
+    """Walks the minimal proof tree of a state solved by DFPN.
+
+    In a state where the player to move reaches its goal (a win for OR, a win or draw for AND), only one action that
+    reaches the goal is followed. In every other state, every action is followed. States solved by evaluator are leaves
+    of the proof tree.
+
+    Requires:
+        1. The state evaluator and hasher are at has been solved by DFPN, and every state DFPN used to solve it is
+           still in tt.
+
+    Args:
+        evaluator (Evaluator): the Evaluator DFPN used. It will be left in its given state.
+        hasher (Hasher): the Hasher DFPN used. It will be left in its given state.
+        tt (TranspositionTable): the TranspositionTable DFPN used.
+
+    Raises:
+        ValueError: if a state in the proof tree is not solved in tt.
+
+    Returns:
+        entries (Dict[int, Tuple[int, ProofStatus]]): maps the key of every interior state of the proof tree to its best
+            canonical action and its ProofStatus. Can be passed to OpeningBook.
+    """
+    entries = {}
+    _extract_proof_tree(evaluator=evaluator, hasher=hasher, tt=tt, entries=entries)
+    return entries
+
+
+def _extract_proof_tree(evaluator: Evaluator, hasher: Hasher, tt: TranspositionTable,
+                        entries: Dict[int, Tuple[int, ProofStatus]]):
+    transposition = hasher.hash_key()
+    key = stable_key(transposition=transposition)
+    if key in entries:
+        return
+    if transposition not in tt:
+        raise ValueError("state is not in the transposition table. key =", key)
+    phi, delta = tt.retrieve(transposition=transposition)
+    if phi != 0 and delta != 0:
+        raise ValueError("state is not solved. key =", key)
+
+    # phi/delta numbers are relative to the player to move. phi == 0 means the player to move reaches its goal.
+    wins = phi == 0
+    node_type = evaluator.get_node_type()
+    if (node_type == NodeType.OR) == wins:
+        status = ProofStatus.Proven
+    else:
+        status = ProofStatus.Disproven
+
+    best_action, best_action_is_leaf = None, False
+    children = []
+    for action in evaluator.actions():
+        evaluator.move(action=action)
+        hasher.move(action=action)
+        child_status = evaluator.evaluate()
+        if child_status != ProofStatus.Unknown:
+            child_phi, child_delta = DFPN.determine_phi_delta(node_type=evaluator.get_node_type(), status=child_status)
+        else:
+            child_transposition = hasher.hash_key()
+            if child_transposition in tt:
+                child_phi, child_delta = tt.retrieve(transposition=child_transposition)
+            else:
+                child_phi, child_delta = None, None
+        hasher.undo_move()
+        evaluator.undo_move()
+
+        is_leaf = child_status != ProofStatus.Unknown
+        if wins:
+            # Prefer actions that win outright, so that the proof tree stays small.
+            if child_delta == 0 and (best_action is None or (is_leaf and not best_action_is_leaf)):
+                best_action, best_action_is_leaf = action, is_leaf
+        else:
+            if child_phi != 0:
+                raise ValueError("a reply of a lost state is not solved. action =", action)
+            if best_action is None:
+                best_action = action
+            if not is_leaf:
+                children.append(action)
+
+    if best_action is None:
+        raise ValueError("no winning action of a won state is solved. key =", key)
+    if wins and not best_action_is_leaf:
+        children.append(best_action)
+    entries[key] = (hasher.canonical_action(action=best_action), status)
+
+    for action in children:
+        evaluator.move(action=action)
+        hasher.move(action=action)
+        _extract_proof_tree(evaluator=evaluator, hasher=hasher, tt=tt, entries=entries)
+        hasher.undo_move()
+        evaluator.undo_move()
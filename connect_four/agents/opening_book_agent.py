@@ -0,0 +1,60 @@
+from typing import Callable
+
+from connect_four.agents.agent import Agent
+from connect_four.agents.opening_book import OpeningBook
+from connect_four.envs import TwoPlayerGameEnv
+from connect_four.hashing import Hasher
+
+
+class OpeningBookAgent(Agent):
+    """Plays the best action stored in an OpeningBook, and asks a fallback Agent for states that are not in it."""
+
+    def __init__(self, book: OpeningBook, hasher: Hasher, make_fallback: Callable[[TwoPlayerGameEnv], Agent] = None):
+        """
+
+        Args:
+            book (OpeningBook): the OpeningBook to play from.
+            hasher (Hasher): a Hasher like the one the book was built with, at the same state as the env that will be
+                played.
+            make_fallback (Callable[[TwoPlayerGameEnv], Agent]): creates an Agent at the current state of an env,
+                e.g. a DFPN. It is called whenever a state is not in book, and the Agent it creates keeps playing
+                until a state is in book again.
+        """
+        self.book = book
+        self.hasher = hasher
+        self.make_fallback = make_fallback
+        self.fallback = None
+
+    def action(self, env, last_action=None):
+        """
+        Requires:
+            1. env is not currently at a terminal state.
+
+        Args:
+            env (TwoPlayerGameEnv): a TwoPlayerGameEnv instance. It will be left in its given state.
+            last_action (int): The last action that occurred in env. None if env is in the initial state.
+
+        Raises:
+            ValueError: if the current state is not in the book and there is no fallback.
+
+        Returns:
+            best_action (int): an action.
+        """
+        if last_action is not None:
+            self.hasher.move(action=last_action)
+
+        canonical_action, _ = self.book.lookup(key=self.hasher.hash_key())
+        if canonical_action is not None:
+            best_action = self.hasher.action_from_canonical(canonical_action=canonical_action)
+            # The fallback has missed this action, so a new one is created for the next state that is not in book.
+            self.fallback = None
+        elif self.fallback is not None:
+            best_action = self.fallback.action(env, last_action)
+        elif self.make_fallback is not None:
+            self.fallback = self.make_fallback(env)
+            best_action = self.fallback.action(env)
+        else:
+            raise ValueError("the current state is not in the opening book and there is no fallback agent")
+
+        self.hasher.move(action=best_action)
+        return best_action
@@ -0,0 +1,126 @@
+import gym
+import os
+import random
+import tempfile
+import unittest
+
+from connect_four.agents import DFPN, difficult_connect_four_positions
+from connect_four.agents.opening_book import OpeningBook, extract_proof_tree
+from connect_four.agents.opening_book_agent import OpeningBookAgent
+from connect_four.envs import ConnectFourEnv, TwoPlayerGameEnv
+from connect_four.evaluation import ProofStatus
+from connect_four.evaluation.simple_evaluator import SimpleEvaluator
+from connect_four.evaluation.victor.victor_evaluator import Victor
+from connect_four.hashing import ConnectFourHasher, TicTacToeHasher
+from connect_four.transposition.simple_transposition_table import SimpleTranspositionTable
+
+
+class TestOpeningBookTicTacToe(unittest.TestCase):
+    def setUp(self) -> None:
+        self.env = gym.make('tic_tac_toe-v0')
+        self.env.reset()
+        self.evaluator = SimpleEvaluator(model=self.env)
+        self.hasher = TicTacToeHasher(env=self.env, canonical=True)
+        self.tt = SimpleTranspositionTable()
+        agent = DFPN(self.evaluator, self.hasher, self.tt)
+        # The initial state of Tic-Tac-Toe is a known draw, which means it is disproven for OR.
+        self.assertEqual(ProofStatus.Disproven, agent.depth_first_proof_number_search(env=self.env))
+
+    def test_extract_proof_tree(self):
+        entries = extract_proof_tree(evaluator=self.evaluator, hasher=self.hasher, tt=self.tt)
+        self.assertEqual(ProofStatus.Disproven, entries[self.hasher.hash_key()][1])
+        # The proof tree only contains some of the states searched by DFPN.
+        self.assertLess(len(entries), len(self.tt))
+        for action, status in entries.values():
+            self.assertIn(action, range(9))
+            self.assertEqual(ProofStatus.Disproven, status)
+
+    def test_save_load(self):
+        book = OpeningBook(entries=extract_proof_tree(evaluator=self.evaluator, hasher=self.hasher, tt=self.tt))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file = os.path.join(temp_dir, "tic_tac_toe.book")
+            book.save(file=file)
+            loaded = OpeningBook.load(file=file)
+
+        self.assertEqual(len(book), len(loaded))
+        for key in book.keys:
+            self.assertEqual(book.lookup(key=key), loaded.lookup(key=key))
+        self.assertEqual((None, ProofStatus.Unknown), loaded.lookup(key=12345))
+        self.assertNotIn(12345, loaded)
+
+    def test_load_not_an_opening_book(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file = os.path.join(temp_dir, "not.book")
+            with open(file, "wb") as f:
+                f.write(bytes(OpeningBook.HEADER.size))
+            with self.assertRaises(ValueError):
+                OpeningBook.load(file=file)
+
+    def test_opening_book_agent_never_loses(self):
+        # O can always draw. The book holds a reply to every move of X, so O never needs a fallback.
+        book = OpeningBook(entries=extract_proof_tree(evaluator=self.evaluator, hasher=self.hasher, tt=self.tt))
+        rng = random.Random(0)
+        for _ in range(50):
+            self.env.reset()
+            agent = OpeningBookAgent(book=book, hasher=TicTacToeHasher(env=self.env, canonical=True))
+            done, reward, last_action = False, None, None
+            while not done:
+                if self.env.player_turn == 0:
+                    last_action = rng.choice(self.env.actions())
+                else:
+                    last_action = agent.action(self.env, last_action)
+                _, reward, done, _ = self.env.step(action=last_action)
+            self.assertFalse(reward == TwoPlayerGameEnv.CONNECTED and self.env.player_turn == 0)
+
+    def test_opening_book_agent_fallback(self):
+        fallbacks = []
+
+        def make_fallback(env):
+            fallbacks.append(DFPN(SimpleEvaluator(model=env), TicTacToeHasher(env=env), SimpleTranspositionTable()))
+            return fallbacks[-1]
+
+        agent = OpeningBookAgent(book=OpeningBook(), hasher=TicTacToeHasher(env=self.env),
+                                 make_fallback=make_fallback)
+        action = agent.action(self.env)
+        self.assertIn(action, self.env.actions())
+        self.assertEqual(1, len(fallbacks))
+
+        # The fallback is reused for the next state that is not in the book.
+        self.env.step(action=action)
+        last_action = self.env.actions()[0]
+        self.env.step(action=last_action)
+        self.assertIn(agent.action(self.env, last_action), self.env.actions())
+        self.assertEqual(1, len(fallbacks))
+
+    def test_opening_book_agent_without_fallback(self):
+        agent = OpeningBookAgent(book=OpeningBook(), hasher=TicTacToeHasher(env=self.env))
+        with self.assertRaises(ValueError):
+            agent.action(self.env)
+
+
+class TestOpeningBookConnectFour(unittest.TestCase):
+    def setUp(self) -> None:
+        ConnectFourEnv.M = 6
+        ConnectFourEnv.N = 7
+
+    def test_extract_proof_tree_diagram_11_1(self):
+        # White can win by playing a1.
+        env = gym.make('connect_four-v0')
+        env.reset(difficult_connect_four_positions.diagram_11_1)
+        evaluator = Victor(model=env)
+        tt = SimpleTranspositionTable()
+        agent = DFPN(evaluator, ConnectFourHasher(env=env, canonical=True), tt)
+        self.assertEqual(ProofStatus.Proven, agent.depth_first_proof_number_search(env=env))
+
+        hasher = ConnectFourHasher(env=env, canonical=True)
+        book = OpeningBook(entries=extract_proof_tree(evaluator=evaluator, hasher=hasher, tt=tt))
+        canonical_action, status = book.lookup(key=hasher.hash_key())
+        self.assertEqual(ProofStatus.Proven, status)
+        self.assertEqual(0, hasher.action_from_canonical(canonical_action=canonical_action))
+
+        agent = OpeningBookAgent(book=book, hasher=hasher)
+        self.assertEqual(0, agent.action(env))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,281 @@
+import copy
+import multiprocessing
+
+from typing import Callable, Dict, List, Tuple
+
+from connect_four.agents.agent import Agent
+from connect_four.agents.dfpn import DFPN
+from connect_four.envs import TwoPlayerGameEnv
+from connect_four.evaluation import ProofStatus, NodeType, Evaluator
+from connect_four.hashing import Hasher
+from connect_four.transposition.shared_transposition_table import SharedTranspositionTable
+
+# The state of a worker process, set by _init_worker().
+_worker_env = None
+_worker_tt = None
+_worker_make_evaluator = None
+_worker_make_hasher = None
+
+
+def _init_worker(env: TwoPlayerGameEnv, tt: SharedTranspositionTable,
+                 make_evaluator: Callable[[TwoPlayerGameEnv], Evaluator],
+                 make_hasher: Callable[[TwoPlayerGameEnv], Hasher]):
+    global _worker_env, _worker_tt, _worker_make_evaluator, _worker_make_hasher
+    _worker_env = env
+    _worker_tt = tt
+    _worker_make_evaluator = make_evaluator
+    _worker_make_hasher = make_hasher
+
+
+def _is_solved(tt: SharedTranspositionTable, transposition: int) -> bool:
+    if transposition not in tt:
+        return False
+    phi, delta = tt.retrieve(transposition=transposition)
+    return phi == 0 or delta == 0
+
+
+def _search(path: Tuple[int, ...]) -> (Tuple[int, ...], ProofStatus):
+    """Runs DFPN in a worker process on the state reached by playing path from the root.
+
+    Args:
+        path (Tuple[int, ...]): the actions leading from the root to the state to search.
+
+    Returns:
+        path (Tuple[int, ...]): the given path.
+        status (ProofStatus): the ProofStatus of the state, or ProofStatus.Unknown if one of its ancestors has
+            already been solved.
+    """
+    env = copy.deepcopy(_worker_env)
+    evaluator = _worker_make_evaluator(env)
+    hasher = _worker_make_hasher(env)
+    for depth, action in enumerate(path):
+        # Ancestors are only saved to the TT by ParallelDFPN once they are solved.
+        # The root is not checked: ParallelDFPN solves it from its children, which it needs to choose an action.
+        if depth > 0 and _is_solved(tt=_worker_tt, transposition=hasher.hash_key()):
+            return path, ProofStatus.Unknown
+        env.step(action=action)
+        evaluator.move(action=action)
+        hasher.move(action=action)
+
+    agent = DFPN(evaluator=evaluator, hasher=hasher, tt=_worker_tt)
+    return path, agent.depth_first_proof_number_search(env=env)
+
+
+class ParallelDFPN(Agent):
+    """Runs DFPN in several worker processes that share a SharedTranspositionTable.
+
+    The tree is split at split_depth: every non-terminal state split_depth moves from the root is searched by one
+    worker, and the results are combined up to the root as they arrive. Workers skip states whose ancestors have
+    already been solved, and reuse every (dis)proof found by the other workers through the shared table.
+    """
+
+    def __init__(self, make_evaluator: Callable[[TwoPlayerGameEnv], Evaluator],
+                 make_hasher: Callable[[TwoPlayerGameEnv], Hasher],
+                 tt: SharedTranspositionTable, num_workers: int = None, split_depth: int = 1):
+        """
+
+        Args:
+            make_evaluator (Callable[[TwoPlayerGameEnv], Evaluator]): creates an Evaluator for an env, e.g. Victor.
+            make_hasher (Callable[[TwoPlayerGameEnv], Hasher]): creates a Hasher for an env, e.g. ConnectFourHasher.
+            tt (SharedTranspositionTable): the TranspositionTable shared by every worker.
+            num_workers (int): the number of worker processes. Defaults to the number of CPUs.
+            split_depth (int): the depth of the states handed to workers. A larger depth creates more, smaller tasks.
+        """
+        self.make_evaluator = make_evaluator
+        self.make_hasher = make_hasher
+        self.tt = tt
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        self.split_depth = split_depth
+
+        # Maps paths from the root to the ProofStatus of the state reached by each path.
+        # Only solved states are included.
+        self.statuses = {}
+
+    def depth_first_proof_number_search(self, env: TwoPlayerGameEnv) -> ProofStatus:
+        """Performs parallel depth-first proof-number search on the state env is currently in to (dis)prove the state.
+
+        Args:
+            env (TwoPlayerGameEnv): a TwoPlayerGameEnv instance currently at root. It will be left in its given state.
+
+        Returns:
+            status (ProofStatus): the ProofStatus (Proven or Disproven) of the state env is currently in.
+                Unknown if the shared TranspositionTable replaced an entry the search depended on.
+        """
+        self.statuses = {}
+        evaluator = self.make_evaluator(env)
+        hasher = self.make_hasher(env)
+        root_node_type = evaluator.get_node_type()
+
+        children_by_path = {}
+        leaves = []
+        self._split(evaluator=evaluator, hasher=hasher, path=(), children_by_path=children_by_path, leaves=leaves)
+        for path in sorted(children_by_path, key=len, reverse=True):
+            self._update(path=path, root_node_type=root_node_type, children_by_path=children_by_path, hasher=hasher)
+
+        if () not in self.statuses:
+            with multiprocessing.Pool(
+                processes=self.num_workers,
+                initializer=_init_worker,
+                initargs=(env, self.tt, self.make_evaluator, self.make_hasher),
+            ) as pool:
+                for path, status in pool.imap_unordered(_search, leaves):
+                    if status == ProofStatus.Unknown:
+                        continue
+                    self.statuses[path] = status
+                    self._save(path=path, status=status, root_node_type=root_node_type, hasher=hasher)
+                    # Combine the result with its ancestors until one of them remains unsolved.
+                    while path and path[:-1] not in self.statuses:
+                        path = path[:-1]
+                        if not self._update(path=path, root_node_type=root_node_type,
+                                            children_by_path=children_by_path, hasher=hasher):
+                            break
+                    if () in self.statuses:
+                        # Stop the remaining workers. Their searches can no longer change the result.
+                        pool.terminate()
+                        break
+
+        return self.statuses.get((), ProofStatus.Unknown)
+
+    def _split(self, evaluator: Evaluator, hasher: Hasher, path: Tuple[int, ...],
+               children_by_path: Dict[Tuple[int, ...], List[Tuple[int, ...]]], leaves: List[Tuple[int, ...]]):
+        """Finds every state split_depth moves below path, recording terminal states and states already solved in
+        the TranspositionTable along the way.
+
+        The root is always split, even if it is solved in the TranspositionTable, so that the ProofStatuses of its
+        children are known to action().
+
+        Args:
+            evaluator (Evaluator): an Evaluator at the state reached by path.
+            hasher (Hasher): a Hasher at the state reached by path.
+            path (Tuple[int, ...]): the actions leading from the root to the current state.
+            children_by_path (Dict[Tuple[int, ...], List[Tuple[int, ...]]]): maps interior paths to their children.
+            leaves (List[Tuple[int, ...]]): the paths that will be searched by workers.
+        """
+        if path:
+            # A previous search may have solved the state.
+            status = self._retrieve_status(hasher=hasher, node_type=evaluator.get_node_type())
+            if status != ProofStatus.Unknown:
+                self.statuses[path] = status
+                return
+
+        if len(path) == self.split_depth:
+            leaves.append(path)
+            return
+
+        children = []
+        for action in evaluator.actions():
+            child = path + (action,)
+            children.append(child)
+
+            evaluator.move(action=action)
+            hasher.move(action=action)
+            status = evaluator.evaluate()
+            if status != ProofStatus.Unknown:
+                self.statuses[child] = status
+            else:
+                self._split(evaluator=evaluator, hasher=hasher, path=child, children_by_path=children_by_path,
+                            leaves=leaves)
+            evaluator.undo_move()
+            hasher.undo_move()
+        children_by_path[path] = children
+
+    def _retrieve_status(self, hasher: Hasher, node_type: NodeType) -> ProofStatus:
+        """
+        Args:
+            hasher (Hasher): a Hasher at a state.
+            node_type (NodeType): the NodeType of the state.
+
+        Returns:
+            status (ProofStatus): the ProofStatus of the state according to the TranspositionTable.
+                Unknown if the state is not in it or has not been solved.
+        """
+        transposition = hasher.hash_key()
+        if transposition not in self.tt:
+            return ProofStatus.Unknown
+        phi, delta = self.tt.retrieve(transposition=transposition)
+        if phi == 0:
+            return ProofStatus.Proven if node_type == NodeType.OR else ProofStatus.Disproven
+        if delta == 0:
+            return ProofStatus.Disproven if node_type == NodeType.OR else ProofStatus.Proven
+        return ProofStatus.Unknown
+
+    @staticmethod
+    def _node_type(path: Tuple[int, ...], root_node_type: NodeType) -> NodeType:
+        if len(path) % 2 == 0:
+            return root_node_type
+        if root_node_type == NodeType.OR:
+            return NodeType.AND
+        return NodeType.OR
+
+    def _update(self, path: Tuple[int, ...], root_node_type: NodeType,
+                children_by_path: Dict[Tuple[int, ...], List[Tuple[int, ...]]], hasher: Hasher) -> bool:
+        """Solves the state at path if the ProofStatuses of its children are sufficient.
+
+        Args:
+            path (Tuple[int, ...]): the path of an interior state.
+            root_node_type (NodeType): the NodeType of the root.
+            children_by_path (Dict[Tuple[int, ...], List[Tuple[int, ...]]]): maps interior paths to their children.
+            hasher (Hasher): a Hasher at the root.
+
+        Returns:
+            solved (bool): True if the state at path is solved.
+        """
+        if path in self.statuses:
+            return True
+
+        node_type = self._node_type(path=path, root_node_type=root_node_type)
+        # OR nodes are proven by any proven child. AND nodes are disproven by any disproven child.
+        if node_type == NodeType.OR:
+            goal, other = ProofStatus.Proven, ProofStatus.Disproven
+        else:
+            goal, other = ProofStatus.Disproven, ProofStatus.Proven
+
+        child_statuses = [self.statuses.get(child, ProofStatus.Unknown) for child in children_by_path[path]]
+        if goal in child_statuses:
+            status = goal
+        elif all(child_status == other for child_status in child_statuses):
+            status = other
+        else:
+            return False
+
+        self.statuses[path] = status
+        self._save(path=path, status=status, root_node_type=root_node_type, hasher=hasher)
+        return True
+
+    def _save(self, path: Tuple[int, ...], status: ProofStatus, root_node_type: NodeType, hasher: Hasher):
+        """Saves a solved state to the shared TranspositionTable so that workers can skip it."""
+        for action in path:
+            hasher.move(action=action)
+        phi, delta = DFPN.determine_phi_delta(
+            node_type=self._node_type(path=path, root_node_type=root_node_type),
+            status=status,
+        )
+        self.tt.save(transposition=hasher.hash_key(), phi=phi, delta=delta)
+        for _ in path:
+            hasher.undo_move()
+
+    def action(self, env, last_action=None):
+        """
+        Requires:
+            1. env is not currently at a terminal state.
+
+        Args:
+            env (TwoPlayerGameEnv): a TwoPlayerGameEnv instance. It will be left in its given state.
+            last_action (int): The last action that occurred in env. Unused, since every search starts from env.
+
+        Returns:
+            best_action (int): an action.
+        """
+        self.depth_first_proof_number_search(env=env)
+
+        node_type = self._node_type(path=(), root_node_type=self.make_evaluator(env).get_node_type())
+        goal = ProofStatus.Proven if node_type == NodeType.OR else ProofStatus.Disproven
+        actions = env.actions()
+        for action in actions:
+            if self.statuses.get((action,)) == goal:
+                return action
+        # Prefer a child that has not been shown to lose.
+        for action in actions:
+            if (action,) not in self.statuses:
+                return action
+        return actions[0]
@@ -0,0 +1,27 @@
+import functools
+import time
+
+import gym
+
+from connect_four.agents import difficult_connect_four_positions
+from connect_four.agents.parallel_dfpn import ParallelDFPN
+from connect_four.evaluation.victor.victor_evaluator import Victor
+from connect_four.hashing import ConnectFourHasher
+from connect_four.transposition.shared_transposition_table import SharedTranspositionTable
+
+if __name__ == '__main__':
+    env = gym.make('connect_four-v0', copy_observations=False)
+    env.reset(env_variables=difficult_connect_four_positions.diagram_13_6_b3)
+
+    agent = ParallelDFPN(
+        make_evaluator=Victor,
+        make_hasher=functools.partial(ConnectFourHasher, canonical=True),
+        tt=SharedTranspositionTable(size_bits=24),
+        split_depth=2,
+    )
+
+    start = time.time()
+    evaluation = agent.depth_first_proof_number_search(env=env)
+    end = time.time()
+    print(evaluation)
+    print("time to run = ", end - start)
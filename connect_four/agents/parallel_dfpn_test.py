@@ -0,0 +1,94 @@
+import gym
+import unittest
+
+import numpy as np
+
+from connect_four.agents.parallel_dfpn import ParallelDFPN
+from connect_four.evaluation import ProofStatus
+from connect_four.evaluation.simple_evaluator import SimpleEvaluator
+from connect_four.hashing import TicTacToeHasher
+from connect_four.transposition.shared_transposition_table import SharedTranspositionTable
+
+
+class TestParallelDFPN(unittest.TestCase):
+    def setUp(self):
+        self.env = gym.make('tic_tac_toe-v0')
+        self.env.reset()
+
+    def test_depth_first_proof_number_search_initial_state(self):
+        # The initial state of Tic-Tac-Toe is a known draw, which means it is disproven for OR.
+        for split_depth in [1, 2]:
+            agent = ParallelDFPN(
+                make_evaluator=SimpleEvaluator,
+                make_hasher=TicTacToeHasher,
+                tt=SharedTranspositionTable(size_bits=14),
+                num_workers=2,
+                split_depth=split_depth,
+            )
+            self.assertEqual(ProofStatus.Disproven, agent.depth_first_proof_number_search(env=self.env))
+            # Every child of the root is disproven.
+            for action in range(9):
+                self.assertEqual(ProofStatus.Disproven, agent.statuses[(action,)])
+
+    def test_action(self):
+        # X wins by playing in the top-right corner.
+        self.env.state = np.array([
+            [
+                [1, 1, 0, ],
+                [0, 0, 0, ],
+                [0, 0, 0, ],
+            ],
+            [
+                [0, 0, 0, ],
+                [1, 1, 0, ],
+                [0, 0, 0, ],
+            ],
+        ])
+        agent = ParallelDFPN(
+            make_evaluator=SimpleEvaluator,
+            make_hasher=TicTacToeHasher,
+            tt=SharedTranspositionTable(size_bits=10),
+            num_workers=2,
+        )
+        self.assertEqual(2, agent.action(env=self.env))
+        self.assertEqual(ProofStatus.Proven, agent.statuses[()])
+
+    def test_action_twice_with_shared_tt(self):
+        # The second search starts from a state the first search already solved in the shared TT.
+        agent = ParallelDFPN(
+            make_evaluator=SimpleEvaluator,
+            make_hasher=TicTacToeHasher,
+            tt=SharedTranspositionTable(size_bits=14),
+            num_workers=2,
+            split_depth=2,
+        )
+        agent.action(env=self.env)
+        self.assertEqual(ProofStatus.Disproven, agent.statuses[()])
+
+        self.env.step(action=4)
+        self.env.step(action=0)
+        action = agent.action(env=self.env)
+        self.assertIn(action, self.env.actions())
+        # X in the center and O in a corner is a draw.
+        self.assertEqual(ProofStatus.Disproven, agent.statuses[()])
+
+    def test_action_twice_wins_with_shared_tt(self):
+        agent = ParallelDFPN(
+            make_evaluator=SimpleEvaluator,
+            make_hasher=TicTacToeHasher,
+            tt=SharedTranspositionTable(size_bits=14),
+            num_workers=2,
+            split_depth=2,
+        )
+        agent.action(env=self.env)
+
+        # O blunders by answering the center with an edge, so X has a forced win.
+        self.env.step(action=4)
+        self.env.step(action=1)
+        self.assertEqual(ProofStatus.Proven, agent.depth_first_proof_number_search(env=self.env))
+        action = agent.action(env=self.env)
+        self.assertEqual(ProofStatus.Proven, agent.statuses[(action,)])
+
+
+if __name__ == '__main__':
+    unittest.main()
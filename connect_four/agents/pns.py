@@ -3,9 +3,168 @@
 from __future__ import annotations
 
 from connect_four.agents.agent import Agent
+from connect_four.agents.search_budget import SearchBudget
+
+from typing import Dict
 
 from connect_four.evaluation import Evaluator
 from connect_four.evaluation.evaluator import ProofStatus, NodeType
+from connect_four.hashing import Hasher
+
+
+class PNSTranspositions:
+    """Shares one PNSNode between all transpositions of a state, which turns the PNS tree into a DAG.
+
+    A shared node is only expanded and evaluated once, no matter how many move orders lead to it.
+    If hasher is canonical, symmetric states share a node too. The children of shared nodes are therefore keyed by
+    Hasher.canonical_action() instead of by action.
+    """
+
+    def __init__(self, hasher: Hasher):
+        """
+
+        Args:
+            hasher (Hasher): a Hasher at the same state as the root of the DAG. It is moved along with the Evaluator.
+        """
+        self.hasher = hasher
+        # Maps the hash keys of states to their nodes.
+        self.nodes: Dict[int, PNSNode] = {}
+
+    def reroot(self, root: PNSNode):
+        """Forgets every node that can no longer be reached from root.
+
+        Args:
+            root (PNSNode): the new root of the DAG. Its key must be set.
+        """
+        reachable = {root.key: root}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for child in node.children.values():
+                if child.key not in reachable:
+                    reachable[child.key] = child
+                    stack.append(child)
+
+        root.parents = []
+        for node in reachable.values():
+            node.parents = [parent for parent in node.parents if reachable.get(parent.key) is parent]
+        self.nodes = reachable
+
+
+class PN2:
+    """Settings and bookkeeping of two-level proof-number search (PN²).
+
+    Whenever the first-level tree creates a leaf that the Evaluator cannot solve, a second-level PNS of at most
+    second_level_nodes expansions is run from it. The proof and disproof numbers of the second-level root are given to
+    the leaf, and the second-level tree is discarded.
+
+    If max_nodes is set and the first-level tree grows past it, subtrees are pruned until at most half of max_nodes
+    nodes remain: solved subtrees first, then the subtrees that are not on the path to the most-proving node, the least
+    promising first. A pruned node keeps its proof and disproof numbers, and is expanded again if it is ever selected.
+    """
+
+    def __init__(self, second_level_nodes: int = 1000, max_nodes: int = None):
+        """
+
+        Args:
+            second_level_nodes (int): the maximum number of nodes a second-level search may expand.
+            max_nodes (int): the maximum number of nodes in the first-level tree. None if it is unbounded.
+        """
+        self.second_level_nodes = second_level_nodes
+        self.max_nodes = max_nodes
+        # The number of nodes in the first-level tree.
+        self.num_nodes = 1
+
+    def evaluate(self, evaluator: Evaluator, node: PNSNode):
+        """Sets the proof and disproof numbers of node with a second-level search.
+
+        Args:
+            evaluator (Evaluator): an Evaluator at the state of node. It will be left in its given state.
+            node (PNSNode): a leaf whose status is ProofStatus.Unknown.
+
+        Modifies:
+            node: its proof and disproof numbers, and its status if the second-level search solves it.
+        """
+        root = PNSNode(node_type=node.node_type)
+        budget = SearchBudget(max_nodes=self.second_level_nodes)
+        while root.proof != 0 and root.disproof != 0 and not budget.exhausted():
+            root.update_tree(evaluator=evaluator, budget=budget)
+
+        node.proof = root.proof
+        node.disproof = root.disproof
+        if root.proof == 0:
+            node.status = ProofStatus.Proven
+        elif root.disproof == 0:
+            node.status = ProofStatus.Disproven
+
+    def prune(self, root: PNSNode):
+        """Prunes subtrees of the tree of root if it has more than max_nodes nodes.
+
+        Args:
+            root (PNSNode): the root of the first-level tree. It is never pruned itself.
+        """
+        if self.max_nodes is None or self.num_nodes <= self.max_nodes:
+            return
+        target = self.max_nodes // 2
+
+        # Solved subtrees are no longer searched, so nothing is lost by pruning them.
+        stack = list(root.children.values())
+        while stack and self.num_nodes > target:
+            node = stack.pop()
+            if not node.children:
+                continue
+            if node.proof == 0 or node.disproof == 0:
+                self._prune_children(node=node)
+            else:
+                stack.extend(node.children.values())
+
+        if self.num_nodes <= target:
+            return
+
+        # The subtrees hanging off the path to the most-proving node.
+        candidates = []
+        node = root
+        while node.children and node.proof != 0 and node.disproof != 0:
+            _, most_proving_child = node.select_most_proving_child()
+            for child in node.children.values():
+                if child is not most_proving_child and child.children:
+                    # The least promising children have the largest proof numbers below OR nodes, and the largest
+                    # disproof numbers below AND nodes.
+                    value = child.proof if node.node_type == NodeType.OR else child.disproof
+                    candidates.append((value, child))
+            node = most_proving_child
+
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        for _, child in candidates:
+            if self.num_nodes <= target:
+                break
+            self._prune_children(node=child)
+
+    def _prune_children(self, node: PNSNode):
+        """Removes every descendant of node, which keeps its proof and disproof numbers."""
+        self.num_nodes -= subtree_size(node=node) - 1
+        node.children = {}
+        if node.proof == 0:
+            node.status = ProofStatus.Proven
+        elif node.disproof == 0:
+            node.status = ProofStatus.Disproven
+
+
+def subtree_size(node: PNSNode) -> int:
+    """
+    Args:
+        node (PNSNode): the root of a tree.
+
+    Returns:
+        size (int): the number of nodes in the tree of node, including node.
+    """
+    size = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        size += 1
+        stack.extend(node.children.values())
+    return size
 
 
 class PNSNode:
@@ -15,6 +174,10 @@ class PNSNode:
         self.disproof = 1
         self.children = {}
         self.node_type = node_type
+        # Only used when nodes are shared by PNSTranspositions: the hash key of this node and the nodes that have it
+        # as a child.
+        self.key = None
+        self.parents = []
 
     def __eq__(self, other):
         if isinstance(other, PNSNode):
@@ -24,25 +187,56 @@ class PNSNode:
                     self.children == other.children and
                     self.node_type == other.node_type)
 
-    def update_tree(self, evaluator: Evaluator):
+    def update_tree(self, evaluator: Evaluator, budget: SearchBudget = None, transpositions: PNSTranspositions = None,
+                    pn2: PN2 = None):
         # Base case.
         if not self.children:
-            self.expand(evaluator=evaluator)
+            if budget is not None:
+                budget.expand()
+            self.expand(evaluator=evaluator, transpositions=transpositions, pn2=pn2)
             self.set_proof_and_disproof_numbers()
+            if transpositions is not None:
+                self.update_ancestors()
             return
 
         # Recursive case.
         old_proof = self.proof
         old_disproof = self.disproof
         while self.proof == old_proof and self.disproof == old_disproof:
+            if budget is not None and budget.exhausted():
+                # The proof and disproof numbers of every node on the path to the root are still up to date.
+                return
+            # In a DAG, update_ancestors() may change the numbers of this node while a child is searched,
+            # so they are compared with their values from before the search.
+            old_proof = self.proof
+            old_disproof = self.disproof
             action, most_proving_child = self.select_most_proving_child()
+            if transpositions is not None:
+                action = transpositions.hasher.action_from_canonical(canonical_action=action)
+                transpositions.hasher.move(action=action)
             evaluator.move(action)
-            most_proving_child.update_tree(evaluator=evaluator)
+            most_proving_child.update_tree(evaluator=evaluator, budget=budget, transpositions=transpositions, pn2=pn2)
+            if transpositions is not None:
+                transpositions.hasher.undo_move()
             evaluator.undo_move()
 
-            old_proof = self.proof
-            old_disproof = self.disproof
             self.set_proof_and_disproof_numbers()
+        if transpositions is not None:
+            self.update_ancestors()
+
+    def update_ancestors(self):
+        """Updates the proof and disproof numbers of every ancestor of this node whose numbers depend on it.
+
+        In a DAG, a node can have parents that are not on the path that update_tree() is searching.
+        """
+        stack = list(self.parents)
+        while stack:
+            node = stack.pop()
+            old_proof = node.proof
+            old_disproof = node.disproof
+            node.set_proof_and_disproof_numbers()
+            if node.proof != old_proof or node.disproof != old_disproof:
+                stack.extend(node.parents)
 
     def set_proof_and_disproof_numbers(self):
         if self.children:
@@ -76,18 +270,40 @@ class PNSNode:
             elif self.status == ProofStatus.Proven:
                 self.proof = 0
                 self.disproof = float('inf')
-            else:  # self.status == ProofStatus.Disproven
-                self.proof = 1
-                self.disproof = 1
+            # Otherwise, self.status == ProofStatus.Unknown. The leaf keeps its numbers: 1 and 1 unless they were set
+            # by a second-level search, or it is a pruned node.
 
-    def expand(self, evaluator: Evaluator):
+    def expand(self, evaluator: Evaluator, transpositions: PNSTranspositions = None, pn2: PN2 = None):
         for action in evaluator.actions():
+            if transpositions is not None:
+                canonical_action = transpositions.hasher.canonical_action(action=action)
+                transpositions.hasher.move(action=action)
+                key = transpositions.hasher.hash_key()
+                transpositions.hasher.undo_move()
+                if key in transpositions.nodes:
+                    # The child has already been reached through another move order. Share its node.
+                    child = transpositions.nodes[key]
+                    self.children[canonical_action] = child
+                    child.parents.append(self)
+                    if ((self.node_type == NodeType.OR and child.proof == 0) or
+                            (self.node_type == NodeType.AND and child.disproof == 0)):
+                        return
+                    continue
+
             # Create the child node.
-            child = self._create_child(action=action)
+            child = self._create_child(action=action if transpositions is None else canonical_action)
+            if pn2 is not None:
+                pn2.num_nodes += 1
+            if transpositions is not None:
+                child.key = key
+                child.parents.append(self)
+                transpositions.nodes[key] = child
 
             # Evaluate the child node.
             evaluator.move(action=action)
             child.status = evaluator.evaluate()
+            if pn2 is not None and child.status == ProofStatus.Unknown:
+                pn2.evaluate(evaluator=evaluator, node=child)
             evaluator.undo_move()
 
             # Set the proof and disproof numbers of the child node.
@@ -126,14 +342,69 @@ class PNSNode:
 
 
 class PNS(Agent):
-    def __init__(self, evaluator: Evaluator):
+    def __init__(self, evaluator: Evaluator, budget: SearchBudget = None, hasher: Hasher = None, pn2: PN2 = None):
+        """
+
+        Args:
+            evaluator (Evaluator): an Evaluator at the same state as the env that will be searched.
+            budget (SearchBudget): if given, every search stops once the budget is exhausted.
+                The partially searched tree is kept and extended by later searches. budget.max_tt_size is ignored.
+            hasher (Hasher): if given, a Hasher at the same state as evaluator. Transpositions then share a single
+                node, so the search tree becomes a DAG.
+            pn2 (PN2): if given, leaves are evaluated by second-level searches and the tree is pruned to stay within
+                pn2.max_nodes. Budgets only count the expansions of the first-level tree.
+
+        Raises:
+            ValueError: if both hasher and pn2 are given. Pruning is not supported in a DAG.
+        """
+        if hasher is not None and pn2 is not None:
+            raise ValueError("PN2 does not support sharing transpositions")
         self.evaluator = evaluator
-        self.root = PNSNode(node_type=evaluator.get_node_type())
-        self.root.update_tree(evaluator=self.evaluator)
+        self.budget = budget
+        self.transpositions = PNSTranspositions(hasher=hasher) if hasher is not None else None
+        self.pn2 = pn2
+        self.root = self._create_root()
+        self.root.update_tree(evaluator=self.evaluator, transpositions=self.transpositions, pn2=self.pn2)
+
+    def _create_root(self) -> PNSNode:
+        root = PNSNode(node_type=self.evaluator.get_node_type())
+        if self.transpositions is not None:
+            root.key = self.transpositions.hasher.hash_key()
+            self.transpositions.nodes = {root.key: root}
+        if self.pn2 is not None:
+            self.pn2.num_nodes = 1
+        return root
+
+    def _move_root(self, action: int):
+        """Moves the root to its child reached by action.
+
+        Requires:
+            1. self.evaluator has already played action.
+        """
+        if self.transpositions is not None:
+            canonical_action = self.transpositions.hasher.canonical_action(action=action)
+            self.transpositions.hasher.move(action=action)
+            action = canonical_action
+        if action in self.root.children:
+            self.root = self.root.children[action]
+            if self.transpositions is not None:
+                self.transpositions.reroot(root=self.root)
+            if self.pn2 is not None:
+                self.pn2.num_nodes = subtree_size(node=self.root)
+        else:
+            # A search stopped by its budget may not have expanded this child.
+            self.root = self._create_root()
 
     def proof_number_search(self):
+        if self.budget is not None:
+            self.budget.start()
         while self.root.proof != 0 and self.root.disproof != 0:
-            self.root.update_tree(evaluator=self.evaluator)
+            if self.budget is not None and self.budget.exhausted():
+                break
+            self.root.update_tree(evaluator=self.evaluator, budget=self.budget, transpositions=self.transpositions,
+                                  pn2=self.pn2)
+            if self.pn2 is not None:
+                self.pn2.prune(root=self.root)
             # print("self.root.proof =", self.root.proof)
             # print("self.root.disproof =", self.root.disproof)
 
@@ -154,12 +425,17 @@ class PNS(Agent):
             #  Since env is not currently at a terminal state, if last_action is not None,
             #  this should not cause problems when moving self.evaluator and self.root.
             self.evaluator.move(action=last_action)
-            self.root = self.root.children[last_action]
+            self._move_root(action=last_action)
 
+        if not self.root.children:
+            # A search stopped by its budget may not have expanded this node, and a PN2 search may have pruned it.
+            self.root.update_tree(evaluator=self.evaluator, transpositions=self.transpositions, pn2=self.pn2)
         self.proof_number_search()
 
-        best_action, best_child = self.root.select_most_proving_child()
+        best_action, _ = self.root.select_most_proving_child()
+        if self.transpositions is not None:
+            best_action = self.transpositions.hasher.action_from_canonical(canonical_action=best_action)
         self.evaluator.move(action=best_action)
-        self.root = best_child
+        self._move_root(action=best_action)
 
         return best_action
@@ -1,12 +1,18 @@
 import gym
+import random
 import unittest
 
 import numpy as np
 
 from connect_four.agents.pns import PNSNode
 from connect_four.agents.pns import PNS
+from connect_four.agents.pns import PN2
+from connect_four.agents.pns import subtree_size
+from connect_four.agents.search_budget import SearchBudget
+from connect_four.envs import TwoPlayerGameEnv
 from connect_four.evaluation.evaluator import NodeType
 from connect_four.evaluation.simple_evaluator import SimpleEvaluator
+from connect_four.hashing import TicTacToeHasher
 
 
 class TestPNSTicTacToe(unittest.TestCase):
@@ -159,6 +165,167 @@ class TestPNSTicTacToe(unittest.TestCase):
             pns.root.update_tree(evaluator=pns.evaluator)
         self.assertEqual(0, pns.root.disproof)
 
+    def test_proof_number_search_budget(self):
+        # The initial state cannot be disproven in 10 expansions. The partially searched tree is kept.
+        evaluator = SimpleEvaluator(model=self.env)
+        pns = PNS(evaluator=evaluator, budget=SearchBudget(max_nodes=10))
+        pns.proof_number_search()
+        self.assertEqual(10, pns.budget.num_nodes)
+        self.assertNotEqual(0, pns.root.proof)
+        self.assertNotEqual(0, pns.root.disproof)
+
+        # Later searches continue from the partially searched tree.
+        pns.budget = None
+        pns.proof_number_search()
+        self.assertEqual(0, pns.root.disproof)
+
+    def test_PNS_action_budget(self):
+        evaluator = SimpleEvaluator(model=self.env)
+        pns = PNS(evaluator=evaluator, budget=SearchBudget(max_nodes=5))
+        action = pns.action(env=self.env)
+        self.assertIn(action, self.env.actions())
+        self.env.step(action=action)
+
+        # The opponent's reply may not have been expanded by the bounded search.
+        last_action = self.env.actions()[-1]
+        self.env.step(action=last_action)
+        self.assertIn(pns.action(env=self.env, last_action=last_action), self.env.actions())
+
+    def test_proof_number_search_transpositions(self):
+        class CountingEvaluator(SimpleEvaluator):
+            num_evaluations = 0
+
+            def evaluate(self):
+                self.num_evaluations += 1
+                return super().evaluate()
+
+        num_evaluations = []
+        for hasher in [None, TicTacToeHasher(env=self.env), TicTacToeHasher(env=self.env, canonical=True)]:
+            evaluator = CountingEvaluator(model=self.env)
+            pns = PNS(evaluator=evaluator, hasher=hasher)
+            pns.proof_number_search()
+            self.assertEqual(0, pns.root.disproof)
+            num_evaluations.append(evaluator.num_evaluations)
+
+        # Sharing transpositions, and then symmetric states as well, evaluates fewer states.
+        self.assertLess(num_evaluations[1], num_evaluations[0])
+        self.assertLess(num_evaluations[2], num_evaluations[1])
+
+    def test_PNS_Proven_action_last_action_is_not_None_canonical(self):
+        self.env.state = np.array([
+            [
+                [0, 0, 1, ],
+                [0, 0, 0, ],
+                [1, 0, 0, ],
+            ],
+            [
+                [0, 0, 0, ],
+                [0, 1, 0, ],
+                [0, 0, 0, ],
+            ],
+        ])
+        self.env.player_turn = 1
+        evaluator = SimpleEvaluator(model=self.env)
+        pns = PNS(evaluator=evaluator, hasher=TicTacToeHasher(env=self.env, canonical=True))
+
+        # O plays in the bottom-right corner.
+        self.env.step(action=8)
+
+        # X can win by playing 0. The action refers to the board as given, not to a rotation or reflection of it.
+        action = pns.action(env=self.env, last_action=8)
+        self.assertEqual(0, action)
+
+    def test_PNS_action_transpositions_never_loses(self):
+        # O can always draw, whatever X plays.
+        rng = random.Random(0)
+        for _ in range(10):
+            self.env.reset()
+            pns = None
+            done, reward, last_action = False, None, None
+            while not done:
+                if self.env.player_turn == 0:
+                    last_action = rng.choice(self.env.actions())
+                elif pns is None:
+                    evaluator = SimpleEvaluator(model=self.env)
+                    pns = PNS(evaluator=evaluator, hasher=TicTacToeHasher(env=self.env, canonical=True))
+                    last_action = pns.action(env=self.env)
+                else:
+                    last_action = pns.action(env=self.env, last_action=last_action)
+                _, reward, done, _ = self.env.step(action=last_action)
+            self.assertFalse(reward == TwoPlayerGameEnv.CONNECTED and self.env.player_turn == 0)
+
+    def test_proof_number_search_pn2(self):
+        # Second-level searches solve leaves that a plain PNS would have to expand in the first-level tree.
+        pns = PNS(evaluator=SimpleEvaluator(model=self.env))
+        pns.proof_number_search()
+        pn2 = PN2(second_level_nodes=50)
+        pns_2 = PNS(evaluator=SimpleEvaluator(model=self.env), pn2=pn2)
+        pns_2.proof_number_search()
+        self.assertEqual(0, pns_2.root.disproof)
+        self.assertEqual(subtree_size(node=pns_2.root), pn2.num_nodes)
+        self.assertLess(pn2.num_nodes, subtree_size(node=pns.root))
+
+    def test_proof_number_search_pn2_max_nodes(self):
+        # The first-level tree is pruned to stay within max_nodes, and the initial state is still disproven.
+        class BoundedPN2(PN2):
+            max_seen = 0
+
+            def prune(self, root):
+                super().prune(root=root)
+                self.max_seen = max(self.max_seen, self.num_nodes)
+
+        pn2 = BoundedPN2(second_level_nodes=10, max_nodes=40)
+        pns = PNS(evaluator=SimpleEvaluator(model=self.env), pn2=pn2)
+        pns.proof_number_search()
+        self.assertEqual(0, pns.root.disproof)
+        self.assertLessEqual(pn2.max_seen, 40)
+        self.assertEqual(subtree_size(node=pns.root), pn2.num_nodes)
+
+    def test_PN2_prune_keeps_numbers(self):
+        evaluator = SimpleEvaluator(model=self.env)
+        pn2 = PN2(second_level_nodes=1, max_nodes=2)
+        pns = PNS(evaluator=evaluator, pn2=pn2)
+        for _ in range(5):
+            pns.root.update_tree(evaluator=evaluator, pn2=pn2)
+        numbers = {action: (child.proof, child.disproof) for action, child in pns.root.children.items()}
+
+        # Every subtree off the path to the most-proving node is pruned, and pruned nodes keep their numbers.
+        pn2.prune(root=pns.root)
+        self.assertEqual(subtree_size(node=pns.root), pn2.num_nodes)
+        _, most_proving_child = pns.root.select_most_proving_child()
+        for action, child in pns.root.children.items():
+            if child is not most_proving_child:
+                self.assertFalse(child.children)
+            self.assertEqual(numbers[action], (child.proof, child.disproof))
+
+    def test_PNS_Proven_action_pn2(self):
+        self.env.state = np.array([
+            [
+                [0, 0, 1, ],
+                [0, 0, 0, ],
+                [1, 0, 0, ],
+            ],
+            [
+                [0, 0, 0, ],
+                [0, 1, 0, ],
+                [0, 0, 0, ],
+            ],
+        ])
+        self.env.player_turn = 1
+        evaluator = SimpleEvaluator(model=self.env)
+        pns = PNS(evaluator=evaluator, pn2=PN2(second_level_nodes=5, max_nodes=10))
+
+        # O plays in the bottom-right corner.
+        self.env.step(action=8)
+
+        # X can win by playing 0.
+        action = pns.action(env=self.env, last_action=8)
+        self.assertEqual(0, action)
+
+    def test_PNS_pn2_hasher(self):
+        with self.assertRaises(ValueError):
+            PNS(evaluator=SimpleEvaluator(model=self.env), hasher=TicTacToeHasher(env=self.env), pn2=PN2())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,53 @@
+import time
+
+from connect_four.transposition import TranspositionTable
+
+
+class SearchBudget:
+    """Limits how long a search may run.
+
+    A search calls start() when it begins and expand() whenever it expands a node, and stops as soon as
+    exhausted() returns True. Limits that are None are not checked.
+    """
+
+    def __init__(self, max_nodes: int = None, max_time: float = None, max_tt_size: int = None):
+        """
+
+        Args:
+            max_nodes (int): the maximum number of nodes to expand.
+            max_time (float): the maximum wall time of a search, in seconds.
+            max_tt_size (int): the maximum number of entries in the search's TranspositionTable. Only checked by
+                searches that pass their TranspositionTable to exhausted(), like DFPN. PNS and CompactPNS keep their
+                tree in memory instead of a TranspositionTable, so they ignore it; use max_nodes to bound them.
+        """
+        self.max_nodes = max_nodes
+        self.max_time = max_time
+        self.max_tt_size = max_tt_size
+
+        self.num_nodes = 0
+        self.start_time = time.monotonic()
+
+    def start(self):
+        """Resets the node count and the timer for a new search."""
+        self.num_nodes = 0
+        self.start_time = time.monotonic()
+
+    def expand(self):
+        """Counts one expanded node."""
+        self.num_nodes += 1
+
+    def exhausted(self, tt: TranspositionTable = None) -> bool:
+        """
+        Args:
+            tt (TranspositionTable): the TranspositionTable used by the search, if any.
+
+        Returns:
+            exhausted (bool): True if any limit has been reached.
+        """
+        if self.max_nodes is not None and self.num_nodes >= self.max_nodes:
+            return True
+        if self.max_time is not None and time.monotonic() - self.start_time >= self.max_time:
+            return True
+        if self.max_tt_size is not None and tt is not None and len(tt) >= self.max_tt_size:
+            return True
+        return False
@@ -0,0 +1,58 @@
+import time
+import unittest
+
+from connect_four.agents.search_budget import SearchBudget
+from connect_four.transposition.simple_transposition_table import SimpleTranspositionTable
+from connect_four.transposition.sqlite_transposition_table import SQLiteTranspositionTable
+
+
+class TestSearchBudget(unittest.TestCase):
+    def test_unlimited(self):
+        budget = SearchBudget()
+        budget.start()
+        for _ in range(100):
+            budget.expand()
+        self.assertFalse(budget.exhausted(tt=SimpleTranspositionTable()))
+
+    def test_max_nodes(self):
+        budget = SearchBudget(max_nodes=2)
+        budget.start()
+        budget.expand()
+        self.assertFalse(budget.exhausted())
+        budget.expand()
+        self.assertTrue(budget.exhausted())
+
+        # start() resets the node count.
+        budget.start()
+        self.assertFalse(budget.exhausted())
+
+    def test_max_time(self):
+        budget = SearchBudget(max_time=0.01)
+        budget.start()
+        self.assertFalse(budget.exhausted())
+        time.sleep(0.02)
+        self.assertTrue(budget.exhausted())
+
+    def test_max_tt_size(self):
+        budget = SearchBudget(max_tt_size=1)
+        budget.start()
+        tt = SimpleTranspositionTable()
+        self.assertFalse(budget.exhausted(tt=tt))
+        tt.save(transposition="a", phi=1, delta=1)
+        self.assertTrue(budget.exhausted(tt=tt))
+        # The TT size is not checked without a TT.
+        self.assertFalse(budget.exhausted())
+
+    def test_max_tt_size_sqlite(self):
+        budget = SearchBudget(max_tt_size=2)
+        budget.start()
+        tt = SQLiteTranspositionTable(database_file=":memory:", flush_size=1)
+        tt.save(transposition=1, phi=1, delta=1)
+        self.assertFalse(budget.exhausted(tt=tt))
+        tt.save(transposition=2, phi=1, delta=1)
+        self.assertTrue(budget.exhausted(tt=tt))
+        tt.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import json
+import os
+import time
+
+from typing import List, Tuple
+
+
+class SearchCheckpoint:
+    """Periodically saves the search stack of a DFPN search to a file, so that the search can be resumed after a crash.
+
+    A checkpoint file holds the key of the root of the search, the actions leading from the root to the state being
+    searched, and the phi/delta thresholds of every state on the way. It is written atomically: a crash while writing
+    leaves the previous checkpoint in place.
+    """
+
+    VERSION = 1
+
+    def __init__(self, file: str, interval: float = 300.0):
+        """
+
+        Args:
+            file (str): the path of the checkpoint file.
+            interval (float): the minimum number of seconds between checkpoints.
+        """
+        self.file = file
+        self.interval = interval
+        self.last_time = time.monotonic()
+
+    def start(self):
+        """Restarts the timer for a new search."""
+        self.last_time = time.monotonic()
+
+    def due(self) -> bool:
+        """
+        Returns:
+            due (bool): True if at least interval seconds have passed since the last checkpoint.
+        """
+        return time.monotonic() - self.last_time >= self.interval
+
+    def save(self, root_key: int, path: List[int], thresholds: List[Tuple[int, int]]):
+        """Atomically replaces the checkpoint file.
+
+        Args:
+            root_key (int): the 64-bit key of the root of the search.
+            path (List[int]): the actions leading from the root to the state being searched.
+            thresholds (List[Tuple[int, int]]): the phi/delta thresholds of the root and of each state along path.
+        """
+        checkpoint = {
+            "version": SearchCheckpoint.VERSION,
+            "root_key": root_key,
+            "path": path,
+            "thresholds": thresholds,
+        }
+        temp_file = self.file + ".tmp"
+        with open(temp_file, "w") as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.file)
+        self.last_time = time.monotonic()
+
+    def load(self, root_key: int) -> (List[int], List[Tuple[int, int]]):
+        """
+        Args:
+            root_key (int): the 64-bit key of the root of the search that will be resumed.
+
+        Raises:
+            ValueError: if the checkpoint file belongs to a search of a different root.
+
+        Returns:
+            path (List[int]): the actions leading from the root to the state being searched.
+                None if there is no checkpoint file.
+            thresholds (List[Tuple[int, int]]): the phi/delta thresholds of the root and of each state along path.
+                None if there is no checkpoint file.
+        """
+        if not os.path.exists(self.file):
+            return None, None
+        with open(self.file) as f:
+            checkpoint = json.load(f)
+        if checkpoint["version"] != SearchCheckpoint.VERSION:
+            raise ValueError("unsupported checkpoint version:", checkpoint["version"])
+        if checkpoint["root_key"] != root_key:
+            raise ValueError("checkpoint is for a different root:", self.file)
+        return checkpoint["path"], [tuple(threshold) for threshold in checkpoint["thresholds"]]
+
+    def remove(self):
+        """Removes the checkpoint file, if any."""
+        if os.path.exists(self.file):
+            os.remove(self.file)
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from connect_four.agents.search_checkpoint import SearchCheckpoint
+
+
+class TestSearchCheckpoint(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.temp_dir.name, "search.checkpoint")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_load_without_file(self):
+        checkpoint = SearchCheckpoint(file=self.file)
+        self.assertEqual((None, None), checkpoint.load(root_key=1))
+
+    def test_save_load(self):
+        checkpoint = SearchCheckpoint(file=self.file)
+        checkpoint.save(root_key=1, path=[3, 4], thresholds=[(10, 20), (5, 6), (1, 2)])
+        self.assertEqual(([3, 4], [(10, 20), (5, 6), (1, 2)]), checkpoint.load(root_key=1))
+        # The temporary file is renamed over the checkpoint file.
+        self.assertEqual(["search.checkpoint"], os.listdir(self.temp_dir.name))
+
+        # A later checkpoint replaces the earlier one.
+        checkpoint.save(root_key=1, path=[], thresholds=[(10, 20)])
+        self.assertEqual(([], [(10, 20)]), SearchCheckpoint(file=self.file).load(root_key=1))
+
+    def test_load_different_root(self):
+        checkpoint = SearchCheckpoint(file=self.file)
+        checkpoint.save(root_key=1, path=[], thresholds=[(10, 20)])
+        with self.assertRaises(ValueError):
+            checkpoint.load(root_key=2)
+
+    def test_due(self):
+        checkpoint = SearchCheckpoint(file=self.file, interval=0)
+        self.assertTrue(checkpoint.due())
+        checkpoint = SearchCheckpoint(file=self.file, interval=3600)
+        self.assertFalse(checkpoint.due())
+
+    def test_remove(self):
+        checkpoint = SearchCheckpoint(file=self.file)
+        checkpoint.remove()
+        checkpoint.save(root_key=1, path=[], thresholds=[(10, 20)])
+        checkpoint.remove()
+        self.assertFalse(os.path.exists(self.file))
+
+
+if __name__ == '__main__':
+    unittest.main()
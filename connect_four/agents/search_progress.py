@@ -0,0 +1,93 @@
+import time
+
+from collections import namedtuple
+from typing import Callable
+
+
+# A snapshot of a running search, passed to the callback of a SearchProgress.
+Progress = namedtuple("Progress", [
+    "num_nodes",
+    "nodes_per_second",
+    "tt_hit_rate",
+    "root_phi",
+    "root_delta",
+    "depth",
+])
+
+
+def print_progress(progress: Progress):
+    """A SearchProgress callback that prints one line per report."""
+    print("nodes = %d, nodes/s = %.0f, TT hit rate = %.3f, root phi = %d, root delta = %d, depth = %d" % progress)
+
+
+class SearchProgress:
+    """Reports the progress of a search to a callback every interval expanded nodes.
+
+    A search calls start() when it begins, expand() whenever it expands a node and lookup() whenever it looks up a
+    child in its TranspositionTable. Searches without a SearchProgress skip all of these calls, so reporting costs
+    nothing when it is disabled.
+    """
+
+    def __init__(self, callback: Callable[[Progress], None] = print_progress, interval: int = 100000):
+        """
+
+        Args:
+            callback (Callable[[Progress], None]): called with a Progress every interval expanded nodes,
+                and once more when the search finishes.
+            interval (int): the number of expanded nodes between reports.
+        """
+        self.callback = callback
+        self.interval = interval
+
+        self.num_nodes = 0
+        self.num_lookups = 0
+        self.num_hits = 0
+        self.root_phi = 0
+        self.root_delta = 0
+        self.depth = 0
+        self.start_time = time.monotonic()
+
+    def start(self):
+        """Resets the counters and the timer for a new search."""
+        self.num_nodes = 0
+        self.num_lookups = 0
+        self.num_hits = 0
+        self.root_phi = 0
+        self.root_delta = 0
+        self.depth = 0
+        self.start_time = time.monotonic()
+
+    def expand(self):
+        """Counts one expanded node and reports the progress every interval nodes."""
+        self.num_nodes += 1
+        if self.num_nodes % self.interval == 0:
+            self.report()
+
+    def lookup(self, hit: bool):
+        """Counts one TranspositionTable lookup.
+
+        Args:
+            hit (bool): True if the looked up state was in the TranspositionTable.
+        """
+        self.num_lookups += 1
+        if hit:
+            self.num_hits += 1
+
+    def progress(self) -> Progress:
+        """
+        Returns:
+            progress (Progress): the current progress of the search.
+        """
+        elapsed = time.monotonic() - self.start_time
+        return Progress(
+            num_nodes=self.num_nodes,
+            nodes_per_second=self.num_nodes / elapsed if elapsed > 0 else 0.0,
+            tt_hit_rate=self.num_hits / self.num_lookups if self.num_lookups else 0.0,
+            root_phi=self.root_phi,
+            root_delta=self.root_delta,
+            depth=self.depth,
+        )
+
+    def report(self):
+        """Passes the current progress to the callback."""
+        self.callback(self.progress())
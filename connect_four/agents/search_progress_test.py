@@ -0,0 +1,45 @@
+import unittest
+
+from connect_four.agents.search_progress import SearchProgress
+
+
+class TestSearchProgress(unittest.TestCase):
+    def test_expand_reports_every_interval(self):
+        reports = []
+        progress = SearchProgress(callback=reports.append, interval=3)
+        progress.start()
+        for _ in range(7):
+            progress.expand()
+        self.assertEqual([3, 6], [report.num_nodes for report in reports])
+
+    def test_tt_hit_rate(self):
+        progress = SearchProgress(callback=lambda _: None)
+        progress.start()
+        self.assertEqual(0.0, progress.progress().tt_hit_rate)
+        progress.lookup(hit=True)
+        progress.lookup(hit=True)
+        progress.lookup(hit=True)
+        progress.lookup(hit=False)
+        self.assertEqual(0.75, progress.progress().tt_hit_rate)
+
+    def test_start_resets(self):
+        reports = []
+        progress = SearchProgress(callback=reports.append, interval=1)
+        progress.start()
+        progress.expand()
+        progress.lookup(hit=True)
+        progress.depth = 2
+        progress.root_phi, progress.root_delta = 3, 4
+
+        progress.start()
+        progress.report()
+        report = reports[-1]
+        self.assertEqual(0, report.num_nodes)
+        self.assertEqual(0.0, report.tt_hit_rate)
+        self.assertEqual(0, report.root_phi)
+        self.assertEqual(0, report.root_delta)
+        self.assertEqual(0, report.depth)
+
+
+if __name__ == '__main__':
+    unittest.main()
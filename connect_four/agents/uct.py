@@ -1,6 +1,7 @@
 import numpy as np
 
 from connect_four.agents.agent import Agent
+from connect_four.envs.bitboard_connect_four_env import make_rollout_env
 
 
 class UCTNode:
@@ -122,14 +123,15 @@ class UCT(Agent):
             self._move_root_to_action(last_action, env.action_space)
 
         # Perform rollouts.
-        env_variables = env.env_variables
+        rollout_env = make_rollout_env(env)
+        env_variables = rollout_env.env_variables
         for _ in range(self.num_rollouts):
-            self.root.update_tree(env)
+            self.root.update_tree(rollout_env)
             self.root_num_visits += 1
-            env.reset(env_variables)
+            rollout_env.reset(env_variables)
 
         # Uncomment below line to see the number of times each action was visited.
-        print("self.root.action_visits =", self.root.action_visits, "=>", np.sum(self.root.action_visits))
+        # print("self.root.action_visits =", self.root.action_visits, "=>", np.sum(self.root.action_visits))
 
         # Select action with the highest number of visits.
         most_visited_action = np.argmax(self.root.action_visits)
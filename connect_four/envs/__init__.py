@@ -2,5 +2,7 @@ from connect_four.envs.two_player_game_env import TwoPlayerGameEnvVariables
 from connect_four.envs.two_player_game_env import TwoPlayerGameEnv
 
 from connect_four.envs.connect_four_env import ConnectFourEnv
+from connect_four.envs.bitboard_connect_four_env import BitboardConnectFourEnv
+from connect_four.envs.batch_connect_four_env import BatchConnectFourEnv
 
 from connect_four.envs.tic_tac_toe_env import TicTacToeEnv
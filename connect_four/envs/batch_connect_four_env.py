@@ -0,0 +1,202 @@
+import functools
+
+import numpy as np
+
+from connect_four.envs import TwoPlayerGameEnv
+from connect_four.envs import TwoPlayerGameEnvVariables
+from connect_four.envs import connect_utils
+from connect_four.envs.connect_four_env import ConnectFourEnv
+
+
+@functools.lru_cache(maxsize=None)
+def _create_lines_by_square(num_rows: int, num_cols: int, num_to_connect: int):
+    """Pads connect_utils.get_lines().indices_by_square into arrays that can be indexed by many squares at once.
+
+    Args:
+        num_rows (int): the number of rows in the board.
+        num_cols (int): the number of columns in the board.
+        num_to_connect (int): the number of tokens in a row needed to win.
+
+    Returns:
+        lines_by_square (np.ndarray): an int array of shape (num_rows * num_cols, L, num_to_connect).
+            lines_by_square[row * num_cols + col] holds the flat indices of every line of num_to_connect squares
+            that contains (row, col). Rows past the number of lines through that square are padding.
+        valid_by_square (np.ndarray): a bool array of shape (num_rows * num_cols, L).
+            valid_by_square[square, i] is False if lines_by_square[square, i] is padding.
+    """
+    lines = connect_utils.get_lines(num_rows=num_rows, num_cols=num_cols, num_to_connect=num_to_connect)
+    max_lines = max(len(line_ids) for line_ids in lines.lines_by_square)
+    lines_by_square = np.zeros(shape=(num_rows * num_cols, max_lines, num_to_connect), dtype=np.intp)
+    valid_by_square = np.zeros(shape=(num_rows * num_cols, max_lines), dtype=bool)
+    for square, square_indices in enumerate(lines.indices_by_square):
+        lines_by_square[square, :len(square_indices)] = square_indices
+        valid_by_square[square, :len(square_indices)] = True
+    lines_by_square.flags.writeable = False
+    valid_by_square.flags.writeable = False
+    return lines_by_square, valid_by_square
+
+
+class BatchConnectFourEnv:
+    """Plays num_envs games of Connect Four in lockstep.
+
+    Every game follows the same rules as ConnectFourEnv. All boards are held in a single (num_envs, 2, M, N) int8
+    array so that a call to step() advances every game with a handful of numpy operations instead of a Python loop
+    per game. Only the lines through each new token are checked for a win.
+
+    Once a game is done, it ignores the actions passed to step() until it is reset.
+    """
+
+    NUM_TO_CONNECT = 4
+
+    def __init__(self, num_envs: int, copy_observations: bool = True):
+        """
+
+        Args:
+            num_envs (int): the number of games to play at once. num_envs > 0.
+            copy_observations (bool): If True, step() and reset() return a copy of the states.
+                If False, they return a read-only view of the states instead.
+        """
+        if num_envs <= 0:
+            raise ValueError("num_envs must be positive, got", num_envs)
+
+        self.num_envs = num_envs
+        self.copy_observations = copy_observations
+        self.num_rows, self.num_cols = ConnectFourEnv.M, ConnectFourEnv.N
+        self.action_space = self.num_cols
+        self._lines_by_square, self._valid_by_square = _create_lines_by_square(
+            num_rows=self.num_rows,
+            num_cols=self.num_cols,
+            num_to_connect=BatchConnectFourEnv.NUM_TO_CONNECT,
+        )
+
+        self.state = np.zeros(shape=(num_envs, 2, self.num_rows, self.num_cols), dtype=np.int8)
+        self.player_turn = np.zeros(shape=num_envs, dtype=np.int8)
+        self.heights = np.zeros(shape=(num_envs, self.num_cols), dtype=np.intp)
+        self.dones = np.zeros(shape=num_envs, dtype=bool)
+
+    def step(self, actions):
+        """Places a token in every game that is not done.
+
+        Args:
+            actions (np.ndarray): an int array of shape (num_envs,). actions[i] is the column to play in game i.
+                Actions for games that are done are ignored.
+
+        Raises:
+            ValueError: if actions has the wrong shape or an action for a game that is not done is out of range.
+
+        Returns:
+            observation (np.ndarray): the states of all games, of shape (num_envs, 2, M, N).
+            rewards (np.ndarray): a float array of shape (num_envs,). The reward for the player who moved in each game.
+                Games that were already done get TwoPlayerGameEnv.DEFAULT_REWARD.
+            dones (np.ndarray): a bool array of shape (num_envs,). True for every game that is over.
+            info (None)
+        """
+        actions = np.asarray(actions)
+        if actions.shape != (self.num_envs,):
+            raise ValueError("actions must have shape", (self.num_envs,), "got", actions.shape)
+
+        envs = np.flatnonzero(~self.dones)
+        cols = actions[envs]
+        if ((cols < 0) | (cols >= self.num_cols)).any():
+            raise ValueError("0 <= action <", self.num_cols, "must be true for every game that is not done")
+
+        rewards = np.full(shape=self.num_envs, fill_value=TwoPlayerGameEnv.DEFAULT_REWARD, dtype=np.float64)
+
+        # Placing a token in a full column is an invalid move.
+        heights = self.heights[envs, cols]
+        invalid = heights == self.num_rows
+        rewards[envs[invalid]] = TwoPlayerGameEnv.INVALID_MOVE
+        self.dones[envs[invalid]] = True
+        envs, cols, heights = envs[~invalid], cols[~invalid], heights[~invalid]
+
+        # Place a token.
+        rows = self.num_rows - 1 - heights
+        players = self.player_turn[envs]
+        self.state[envs, players, rows, cols] = 1
+        self.heights[envs, cols] += 1
+
+        # Check if the player has connected four through the new token.
+        squares = rows * self.num_cols + cols
+        board_size = self.num_rows * self.num_cols
+        flat_state = self.state.reshape(self.num_envs, 2 * board_size)
+        lines = self._lines_by_square[squares] + (players.astype(np.intp) * board_size)[:, None, None]
+        tokens = flat_state[envs[:, None, None], lines]
+        connected = (tokens.all(axis=2) & self._valid_by_square[squares]).any(axis=1)
+        rewards[envs[connected]] = TwoPlayerGameEnv.CONNECTED
+        self.dones[envs[connected]] = True
+
+        # If all locations have been used and neither player has won,
+        # this results in a draw.
+        full = ~connected & (self.heights[envs].sum(axis=1) == board_size)
+        rewards[envs[full]] = TwoPlayerGameEnv.DRAW
+        self.dones[envs[full]] = True
+
+        # Continue play with it now being the other player's turn.
+        playing = envs[~connected & ~full]
+        self.player_turn[playing] = 1 - self.player_turn[playing]
+        return self._observation(), rewards, self.dones.copy(), None
+
+    def legal_action_mask(self):
+        """
+        Returns:
+            legal_action_mask (np.ndarray): a bool array of shape (num_envs, N).
+                legal_action_mask[i, col] is True if game i is not done and col is not full.
+        """
+        return (self.heights < self.num_rows) & ~self.dones[:, None]
+
+    def reset(self, mask=None, env_variables=None):
+        """Resets some or all of the games.
+
+        Args:
+            mask (np.ndarray) (optional): a bool array of shape (num_envs,). Only games where mask is True are reset.
+                If None, every game is reset.
+            env_variables (tuple) (optional): the position to reset the games to, e.g. ConnectFourEnv.env_variables.
+                env_variables[0] (ndarray): should be a a numpy ndarray of shape (2, M, N)
+                env_variables[1] (int): whose turn it should be (0 or 1)
+                If None, the games are reset to the empty board with Player 1 to move.
+
+        Returns:
+            observation (np.ndarray): the states of all games, of shape (num_envs, 2, M, N).
+        """
+        if mask is None:
+            mask = np.ones(shape=self.num_envs, dtype=bool)
+
+        if env_variables is not None:
+            state = np.asarray(env_variables[0])
+            if state.shape != (2, self.num_rows, self.num_cols):
+                raise ValueError("state must have shape", (2, self.num_rows, self.num_cols), "got", state.shape)
+            # The height of a column is one more than the height of its highest token.
+            tokens = (state != 0).any(axis=0)
+            highest_tokens = np.where(tokens.any(axis=0), tokens.argmax(axis=0), self.num_rows)
+            self.state[mask] = state
+            self.player_turn[mask] = env_variables[1]
+            self.heights[mask] = self.num_rows - highest_tokens
+        else:
+            self.state[mask] = 0
+            self.player_turn[mask] = 0
+            self.heights[mask] = 0
+        self.dones[mask] = False
+
+        return self._observation()
+
+    def env_variables(self, index: int) -> TwoPlayerGameEnvVariables:
+        """
+        Args:
+            index (int): the game to get the env_variables of. 0 <= index < num_envs.
+
+        Returns:
+            env_variables (tuple): a tuple that can be passed to ConnectFourEnv.reset() to restore game index.
+        """
+        return TwoPlayerGameEnvVariables(self.state[index].astype(np.float64), int(self.player_turn[index]))
+
+    def _observation(self):
+        """
+        Returns:
+            observation (np.ndarray): a copy of the states if self.copy_observations is True.
+                Otherwise, a read-only view of the states.
+        """
+        if self.copy_observations:
+            return self.state.copy()
+        observation = self.state.view()
+        observation.flags.writeable = False
+        return observation
@@ -0,0 +1,196 @@
+import unittest
+
+import gym
+import numpy as np
+
+from connect_four.envs import TwoPlayerGameEnv
+from connect_four.envs import ConnectFourEnv
+from connect_four.envs import BatchConnectFourEnv
+
+
+class TestBatchConnectFourEnv(unittest.TestCase):
+
+    def setUp(self):
+        ConnectFourEnv.M = 6
+        ConnectFourEnv.N = 7
+        ConnectFourEnv.action_space = 7
+        self.env = BatchConnectFourEnv(num_envs=3)
+
+    def tearDown(self):
+        ConnectFourEnv.M = 6
+        ConnectFourEnv.N = 7
+        ConnectFourEnv.action_space = 7
+
+    def test_reset(self):
+        obs = self.env.reset()
+        self.assertEqual((3, 2, ConnectFourEnv.M, ConnectFourEnv.N), obs.shape)
+        self.assertFalse(obs.any())
+        self.assertFalse(self.env.player_turn.any())
+        self.assertFalse(self.env.dones.any())
+        self.assertTrue(self.env.legal_action_mask().all())
+
+    def test_step_places_tokens(self):
+        obs, rewards, dones, _ = self.env.step(np.array([0, 3, 3]))
+        self.assertEqual(1, obs[0, 0, -1, 0])
+        self.assertEqual(1, obs[1, 0, -1, 3])
+        self.assertEqual(1, obs[2, 0, -1, 3])
+        self.assertEqual(3, obs.sum())
+        self.assertIsNone(np.testing.assert_array_equal(np.zeros(3), rewards))
+        self.assertFalse(dones.any())
+        self.assertIsNone(np.testing.assert_array_equal(np.ones(3), self.env.player_turn))
+
+        obs, _, _, _ = self.env.step(np.array([0, 3, 4]))
+        self.assertEqual(1, obs[0, 1, -2, 0])
+        self.assertEqual(1, obs[1, 1, -2, 3])
+        self.assertEqual(1, obs[2, 1, -1, 4])
+
+    def test_step_invalid_shape(self):
+        with self.assertRaises(ValueError):
+            self.env.step(np.array([0, 1]))
+
+    def test_step_out_of_range(self):
+        with self.assertRaises(ValueError):
+            self.env.step(np.array([0, 1, ConnectFourEnv.N]))
+
+    def test_place_token_in_full_column(self):
+        state = np.zeros(shape=(2, ConnectFourEnv.M, ConnectFourEnv.N))
+        state[1, :, 1] = 1
+        self.env.reset(env_variables=(state, 0))
+        self.assertIsNone(np.testing.assert_array_equal(
+            [True, False, True, True, True, True, True],
+            self.env.legal_action_mask()[0],
+        ))
+
+        _, rewards, dones, _ = self.env.step(np.array([1, 0, 1]))
+        self.assertIsNone(np.testing.assert_array_equal(
+            [TwoPlayerGameEnv.INVALID_MOVE, TwoPlayerGameEnv.DEFAULT_REWARD, TwoPlayerGameEnv.INVALID_MOVE],
+            rewards,
+        ))
+        self.assertIsNone(np.testing.assert_array_equal([True, False, True], dones))
+        self.assertFalse(self.env.legal_action_mask()[0].any())
+
+    def test_done_games_ignore_actions(self):
+        state = np.zeros(shape=(2, ConnectFourEnv.M, ConnectFourEnv.N))
+        state[0, -3:, 0] = 1
+        self.env.reset(env_variables=(state, 0))
+
+        _, rewards, dones, _ = self.env.step(np.array([0, 1, 1]))
+        self.assertIsNone(np.testing.assert_array_equal(
+            [TwoPlayerGameEnv.CONNECTED, TwoPlayerGameEnv.DEFAULT_REWARD, TwoPlayerGameEnv.DEFAULT_REWARD],
+            rewards,
+        ))
+        self.assertIsNone(np.testing.assert_array_equal([True, False, False], dones))
+
+        want_state = self.env.state[0].copy()
+        # Out of range actions are allowed for games that are done.
+        _, rewards, dones, _ = self.env.step(np.array([-1, 1, 1]))
+        self.assertIsNone(np.testing.assert_array_equal(want_state, self.env.state[0]))
+        self.assertEqual(TwoPlayerGameEnv.DEFAULT_REWARD, rewards[0])
+        self.assertTrue(dones[0])
+
+    def test_connected_four_diagonally(self):
+        state = np.array([
+            [
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 1, 0, 0, 0, 0, ],
+                [0, 1, 0, 0, 0, 0, 0, ],
+                [1, 0, 0, 0, 0, 0, 0, ],
+            ],
+            [
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 1, 0, 0, 0, ],
+                [0, 0, 1, 1, 0, 0, 0, ],
+                [0, 1, 1, 1, 0, 0, 0, ],
+            ],
+        ])
+        self.env.reset(env_variables=(state, 0))
+        _, rewards, dones, _ = self.env.step(np.array([3, 4, 5]))
+        self.assertIsNone(np.testing.assert_array_equal(
+            [TwoPlayerGameEnv.CONNECTED, TwoPlayerGameEnv.DEFAULT_REWARD, TwoPlayerGameEnv.DEFAULT_REWARD],
+            rewards,
+        ))
+        self.assertIsNone(np.testing.assert_array_equal([True, False, False], dones))
+
+    def test_only_new_token_is_checked(self):
+        # Player 2 already has four in a row, but only groups containing the new token should be checked.
+        state = np.zeros(shape=(2, ConnectFourEnv.M, ConnectFourEnv.N))
+        state[1, -1, 0:4] = 1
+        self.env.reset(env_variables=(state, 1))
+
+        _, rewards, dones, _ = self.env.step(np.array([6, 6, 6]))
+        self.assertIsNone(np.testing.assert_array_equal(np.zeros(3), rewards))
+        self.assertFalse(dones.any())
+
+    def test_draw(self):
+        # Make all locations expect the top-left belong to Player 2.
+        state = np.ones(shape=(2, ConnectFourEnv.M, ConnectFourEnv.N))
+        state[0, :, :] = 0
+        state[1, 0, 0] = 0
+        self.env.reset(env_variables=(state, 0))
+
+        _, rewards, dones, _ = self.env.step(np.array([0, 0, 0]))
+        self.assertIsNone(np.testing.assert_array_equal([TwoPlayerGameEnv.DRAW] * 3, rewards))
+        self.assertTrue(dones.all())
+
+    def test_reset_mask(self):
+        self.env.step(np.array([0, 1, 2]))
+        self.env.reset(mask=np.array([False, True, False]))
+
+        self.assertEqual(1, self.env.state[0].sum())
+        self.assertEqual(0, self.env.state[1].sum())
+        self.assertEqual(1, self.env.state[2].sum())
+        self.assertIsNone(np.testing.assert_array_equal([1, 0, 1], self.env.player_turn))
+
+    def test_copy_observations_false(self):
+        env = BatchConnectFourEnv(num_envs=2, copy_observations=False)
+        obs, _, _, _ = env.step(np.array([0, 1]))
+        with self.assertRaises(ValueError):
+            obs[0, 0, -1, 0] = 0
+
+    def test_env_variables(self):
+        self.env.step(np.array([0, 1, 2]))
+        env = gym.make('connect_four-v0')
+        env.reset(env_variables=self.env.env_variables(1))
+        self.assertEqual(1, env.state[0, -1, 1])
+        self.assertEqual(1, env.player_turn)
+
+    def test_matches_connect_four_env_random_games(self):
+        random_state = np.random.RandomState(0)
+        num_envs = 100
+        batch_env = BatchConnectFourEnv(num_envs=num_envs)
+        envs = [gym.make('connect_four-v0') for _ in range(num_envs)]
+        dones = np.zeros(num_envs, dtype=bool)
+        while not dones.all():
+            actions = random_state.randint(ConnectFourEnv.N, size=num_envs)
+            obs, rewards, got_dones, _ = batch_env.step(actions)
+            for i, env in enumerate(envs):
+                if dones[i]:
+                    continue
+                want_obs, want_reward, want_done, _ = env.step(actions[i])
+                self.assertIsNone(np.testing.assert_array_equal(want_obs, obs[i]))
+                self.assertEqual(want_reward, rewards[i])
+                self.assertEqual(want_done, got_dones[i])
+                self.assertEqual(env.player_turn, batch_env.player_turn[i])
+                if not want_done:
+                    self.assertEqual(env.actions(), list(np.flatnonzero(batch_env.legal_action_mask()[i])))
+            dones = got_dones
+
+    def test_4x4(self):
+        ConnectFourEnv.M = 4
+        ConnectFourEnv.N = 4
+        ConnectFourEnv.action_space = 4
+        env = BatchConnectFourEnv(num_envs=1)
+        for action in [0, 1, 0, 1, 0, 1]:
+            _, _, dones, _ = env.step(np.array([action]))
+            self.assertFalse(dones[0])
+        _, rewards, dones, _ = env.step(np.array([0]))
+        self.assertEqual(TwoPlayerGameEnv.CONNECTED, rewards[0])
+        self.assertTrue(dones[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
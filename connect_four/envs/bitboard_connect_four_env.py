@@ -0,0 +1,364 @@
+import functools
+import warnings
+
+from typing import Sequence
+
+import numpy as np
+
+from connect_four.envs import TwoPlayerGameEnv
+from connect_four.envs import TwoPlayerGameEnvVariables
+from connect_four.envs.connect_four_env import ConnectFourEnv
+
+
+@functools.lru_cache(maxsize=None)
+def _create_window_starts(num_rows: int, num_cols: int):
+    """Creates the lookup table used to detect four-in-a-row on a bitboard.
+
+    Bitboards are laid out column by column, with num_rows + 1 bits per column. The extra bit on top of each column
+    is always 0 so that shifting a bitboard never carries a token from one column into the next.
+    Bit (col * (num_rows + 1) + height) is set if the square height rows from the bottom of col holds a token.
+
+    Args:
+        num_rows (int): the number of rows in the board.
+        num_cols (int): the number of columns in the board.
+
+    Returns:
+        window_starts_by_bit (List[Tuple[Tuple[int, int]]]): for every bit index of a square on the board,
+            a tuple of (shift, starts) pairs, one per direction. shift is the distance in bits between two
+            adjacent squares in that direction. starts is a mask of the lowest bit of every window of 4 squares
+            in that direction that contains the square.
+    """
+    bits_per_col = num_rows + 1
+    directions = [
+        (0, 1),  # vertical
+        (1, 0),  # horizontal
+        (1, 1),  # up-right diagonal
+        (1, -1),  # down-right diagonal
+    ]
+    window_starts_by_bit = [() for _ in range(num_cols * bits_per_col)]
+    for col in range(num_cols):
+        for height in range(num_rows):
+            window_starts = []
+            for col_diff, height_diff in directions:
+                starts = 0
+                for i in range(4):
+                    start_col, start_height = col - i * col_diff, height - i * height_diff
+                    end_col, end_height = start_col + 3 * col_diff, start_height + 3 * height_diff
+                    if (0 <= start_col < num_cols and 0 <= end_col < num_cols and
+                            0 <= start_height < num_rows and 0 <= end_height < num_rows):
+                        starts |= 1 << (start_col * bits_per_col + start_height)
+                if starts:
+                    window_starts.append((col_diff * bits_per_col + height_diff, starts))
+            window_starts_by_bit[col * bits_per_col + height] = tuple(window_starts)
+    return window_starts_by_bit
+
+
+class BitboardConnectFourEnv(ConnectFourEnv):
+    """A ConnectFourEnv that keeps a bitboard for each player along with the height of every column.
+
+    step(), actions(), env_variables and reset() behave like they do in ConnectFourEnv, but finding the next row in a
+    column, detecting four-in-a-row and detecting a full board are done with integer operations instead of numpy.
+    The (2, M, N) state is only built from the bitboards when it is read (through state, env_variables or an
+    observation), and it is kept until the next move.
+
+    The state property is read-only. Assigning a new state (or calling reset()) is the only way to modify it.
+    """
+
+    def __init__(self, copy_observations: bool = True):
+        """
+
+        Args:
+            copy_observations (bool): If True, step() and reset() return a copy of the state.
+                If False, they return None instead so that moves never build the state.
+                Search code that ignores observations should use False.
+        """
+        # The env_variables most recently returned, along with the bitboards and heights they were created from.
+        self._snapshot = None
+        super().__init__(copy_observations=copy_observations)
+
+    def step(self, action: int):
+        """
+
+        Args:
+          action (int):
+        """
+        if action < 0 or action >= ConnectFourEnv.N:
+            raise ValueError("0 <=", action, "<", ConnectFourEnv.N, "must be true")
+
+        # Placing a token in a full column is an invalid move.
+        if self.heights[action] == self._num_rows:
+            self.moves.append((self.player_turn, None, action))
+            return self._observation(), TwoPlayerGameEnv.INVALID_MOVE, True, None
+
+        # Place a token.
+        new_token_row = self._num_rows - 1 - self.heights[action]
+        self.moves.append((self.player_turn, new_token_row, action))
+        self.bitboards[self.player_turn] |= 1 << (action * self._bits_per_col + self.heights[action])
+        self.heights[action] += 1
+        self._state = None
+
+        # Check if the player has connected four.
+        if self._connected_four(row=new_token_row, col=action):
+            return self._observation(), TwoPlayerGameEnv.CONNECTED, True, None
+
+        # If all locations have been used and neither player has won,
+        # this results in a draw.
+        if self._is_full():
+            return self._observation(), TwoPlayerGameEnv.DRAW, True, None
+
+        # Continue play with it now being the other player's turn.
+        self.player_turn = 1 - self.player_turn
+        return self._observation(), TwoPlayerGameEnv.DEFAULT_REWARD, False, None
+
+    def _observation(self):
+        """
+        Returns:
+            observation (np.ndarray): a copy of the state if self.copy_observations is True. Otherwise, None.
+        """
+        if self.copy_observations:
+            return self.state.copy()
+        return None
+
+    def _find_highest_token(self, column) -> int:
+        """ Finds the highest token belonging to either player in the selected column.
+
+        Args:
+            column (int): 0 ≤ column < ConnectFourEnv.N
+        Returns:
+            row (int): 0 ≤ row < ConnectFourEnv.M if there exist at least 1 token belonging to either player.
+                ConnectFourEnv.M if there are no tokens in the column
+        """
+        return self._num_rows - self.heights[column]
+
+    def _connected_four(self, row: int, col: int) -> bool:
+        """
+        Args:
+            row (int): the starting row
+            col (int): the starting column
+
+        Requires:
+            self.state[player, row, col] == 1
+
+        Returns:
+            connected_four (bool): True if the player connected at least 4 using (row, col);
+                               otherwise, False
+        """
+        bitboard = self.bitboards[self.player_turn]
+        bit = col * self._bits_per_col + self._num_rows - 1 - row
+        for shift, starts in self._window_starts[bit]:
+            # pairs has a bit set wherever that square and the next square in this direction are both set.
+            pairs = bitboard & (bitboard >> shift)
+            # Only count windows of four that contain (row, col).
+            if pairs & (pairs >> (2 * shift)) & starts:
+                return True
+        return False
+
+    def _is_full(self):
+        """
+        Returns:
+            True if there is a token belonging to either player for every possible location.
+        """
+        return self.bitboards[0] | self.bitboards[1] == self._full_board
+
+    @property
+    def state(self):
+        """
+        Returns:
+            state (np.ndarray): the read-only (2, M, N) state. It is built from the bitboards if a move has been
+                made since it was last read.
+        """
+        if self._state is None:
+            self._state = self._build_state()
+        return self._state
+
+    @state.setter
+    def state(self, state):
+        self._set_state(state=np.array(state))
+
+    @property
+    def env_variables(self) -> TwoPlayerGameEnvVariables:
+        """
+        Returns:
+            env_variables (tuple): a tuple that can be passed to reset() to restore a state.
+            - env_variables[0] contains "obs", the observable variable for that state. It is read-only.
+            - env_variables[1] contains "player_turn", indicating whose turn it is in that state.
+        """
+        # The state is read-only, so it can be shared with env_variables. Passing these env_variables back to
+        # reset() restores the bitboards and heights instead of rebuilding them from the state.
+        env_variables = TwoPlayerGameEnvVariables(self.state, self.player_turn)
+        self._snapshot = (env_variables, tuple(self.bitboards), tuple(self.heights))
+        return env_variables
+
+    def reset(self, env_variables=None):
+        """Resets the state of the environment and returns an initial observation.
+
+        Args:
+            env_variables (tuple) (optional):
+                env_variables[0] (ndarray): should be a a numpy ndarray of shape (2, M, N)
+                env_variables[1] (int): whose turn it should be (0 or 1)
+
+        Returns:
+            observation (object): the initial observation.
+        """
+        if env_variables is None:
+            self._set_dimensions(num_rows=ConnectFourEnv.M, num_cols=ConnectFourEnv.N)
+            self._state = None
+            self.bitboards = [0, 0]
+            self.heights = [0] * ConnectFourEnv.N
+            self.player_turn = 0
+        elif self._snapshot is not None and env_variables is self._snapshot[0]:
+            # env_variables came from this environment, and its state cannot have been modified since.
+            _, bitboards, heights = self._snapshot
+            self._set_dimensions(num_rows=env_variables.state.shape[1], num_cols=env_variables.state.shape[2])
+            self._state = env_variables.state
+            self.bitboards = list(bitboards)
+            self.heights = list(heights)
+            self.player_turn = env_variables.player_turn
+        else:
+            self._set_state(state=np.array(env_variables[0]))
+            self.player_turn = env_variables[1]
+        self.moves = []
+
+        return self._observation()
+
+    def _set_dimensions(self, num_rows: int, num_cols: int):
+        """Sets up the lookup tables for a board of the given dimensions.
+
+        Args:
+            num_rows (int): the number of rows in the board.
+            num_cols (int): the number of columns in the board.
+        """
+        if getattr(self, "_num_rows", None) == num_rows and getattr(self, "_num_cols", None) == num_cols:
+            return
+
+        self._num_rows = num_rows
+        self._num_cols = num_cols
+        self._bits_per_col = num_rows + 1
+        self._window_starts = _create_window_starts(num_rows=num_rows, num_cols=num_cols)
+
+        column_mask = (1 << num_rows) - 1
+        self._full_board = 0
+        for col in range(num_cols):
+            self._full_board |= column_mask << (col * self._bits_per_col)
+
+    def _set_state(self, state: np.ndarray):
+        """Replaces the current state and rebuilds the bitboards and column heights from it.
+
+        Args:
+            state (np.ndarray): a numpy ndarray of shape (2, M, N). This environment takes ownership of it.
+        """
+        num_rows, num_cols = state.shape[1], state.shape[2]
+        self._set_dimensions(num_rows=num_rows, num_cols=num_cols)
+        state.flags.writeable = False
+        self._state = state
+
+        self.bitboards = [0, 0]
+        for player in range(2):
+            for row, col in zip(*np.nonzero(state[player])):
+                self.bitboards[player] |= 1 << (int(col) * self._bits_per_col + num_rows - 1 - int(row))
+
+        # The height of a column is one more than the height of its highest token (like _find_highest_token()).
+        mask = (state != 0).any(axis=0)
+        highest_tokens = np.where(mask.any(axis=0), mask.argmax(axis=0), num_rows)
+        self.heights = [num_rows - int(highest_token) for highest_token in highest_tokens]
+
+    def _build_state(self) -> np.ndarray:
+        """
+        Returns:
+            state (np.ndarray): a read-only numpy ndarray of shape (2, M, N) built from the bitboards.
+        """
+        state = np.zeros(shape=(2, self._num_rows, self._num_cols))
+        for player in range(2):
+            bitboard = self.bitboards[player]
+            while bitboard:
+                lowest = bitboard & -bitboard
+                col, height = divmod(lowest.bit_length() - 1, self._bits_per_col)
+                state[player, self._num_rows - 1 - height, col] = 1
+                bitboard ^= lowest
+        state.flags.writeable = False
+        return state
+
+    def undo(self):
+        """Undoes the most recent call to step() in constant time.
+
+        Raises:
+            ValueError: if step() has not been called since the last call to reset().
+
+        Modifies:
+            - this BitboardConnectFourEnv instance will be in the state it was in before the most recent call to step().
+        """
+        if not self.moves:
+            raise ValueError("Cannot undo action for initial state")
+
+        player, row, col = self.moves.pop()
+        if row is not None:
+            self.heights[col] -= 1
+            self.bitboards[player] &= ~(1 << (col * self._bits_per_col + self.heights[col]))
+            self._state = None
+        self.player_turn = player
+
+    def undo_last_action(self, action):
+        """ Deprecated. Use undo() instead.
+
+        Args:
+            action (int): an Action
+
+        Raises:
+            ValuerError if:
+            1. The environment is in the initial state.
+            2. There must be at least one token in the given column (i.e. action)
+            3. The top token in the given column must belong to the opponent of the current player.
+            4. If step() has been called since the last call to reset(), the given action must be the last action
+               passed to step().
+
+        Modifies:
+            - this BitboardConnectFourEnv instance will have undone the given action.
+        """
+        warnings.warn("undo_last_action is deprecated. use undo() instead", DeprecationWarning)
+
+        # If there are no tokens in the state:
+        if not self.bitboards[0] and not self.bitboards[1]:
+            raise ValueError("Cannot undo action for initial state")
+
+        # If the given column is empty:
+        if self.heights[action] == 0:
+            raise ValueError("Cannot undo action for empty column")
+
+        # If the highest token belongs to the current player:
+        bit = 1 << (action * self._bits_per_col + self.heights[action] - 1)
+        if self.bitboards[self.player_turn] & bit:
+            raise ValueError("Cannot undo action that belongs to the current player")
+
+        if self.moves:
+            # The token was placed by step(), so it must be removed from the history of moves too.
+            if self.moves[-1][2] != action:
+                raise ValueError("Cannot undo action that is not the last action")
+            self.undo()
+            return
+
+        # Remove the token and switch play to the other player.
+        self.player_turn = 1 - self.player_turn
+        self.bitboards[self.player_turn] &= ~bit
+        self.heights[action] -= 1
+        self._state = None
+
+    def actions(self) -> Sequence[int]:
+        return [col for col in range(ConnectFourEnv.N) if self.heights[col] < self._num_rows]
+
+
+def make_rollout_env(env: TwoPlayerGameEnv) -> TwoPlayerGameEnv:
+    """Returns an environment for playing out moves from the current state of env.
+
+    Args:
+        env (TwoPlayerGameEnv): a TwoPlayerGameEnv instance.
+
+    Returns:
+        rollout_env (TwoPlayerGameEnv): if env is a ConnectFourEnv, a new BitboardConnectFourEnv in the state of env
+            that does not return observations. Otherwise, env itself.
+    """
+    if not isinstance(env, ConnectFourEnv):
+        return env
+
+    rollout_env = BitboardConnectFourEnv(copy_observations=False)
+    rollout_env.reset(env_variables=env.env_variables)
+    return rollout_env
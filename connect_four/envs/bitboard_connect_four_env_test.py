@@ -0,0 +1,294 @@
+import random
+import unittest
+
+import gym
+import numpy as np
+
+from connect_four.envs import TwoPlayerGameEnv
+from connect_four.envs import BitboardConnectFourEnv, ConnectFourEnv
+from connect_four.envs.bitboard_connect_four_env import make_rollout_env
+
+
+class TestBitboardConnectFourEnv(unittest.TestCase):
+
+    def setUp(self):
+        self.env = gym.make('connect_four_bitboard-v0')
+        ConnectFourEnv.M = 6
+        ConnectFourEnv.N = 7
+        ConnectFourEnv.action_space = 7
+        self.env.reset()
+
+    def tearDown(self):
+        ConnectFourEnv.M = 6
+        ConnectFourEnv.N = 7
+        ConnectFourEnv.action_space = 7
+
+    def test_reset(self):
+        obs = self.env.reset()
+        # upon initialization, it should be Player 1's turn.
+        self.assertEqual(self.env.player_turn, 0)
+        # upon initialization, board should be full of 0s.
+        self.assertIsNone(np.testing.assert_array_equal(
+            obs,
+            np.zeros(shape=(2, ConnectFourEnv.M, ConnectFourEnv.N)),
+        ))
+        self.assertEqual([0, 0], self.env.bitboards)
+        self.assertEqual([0] * ConnectFourEnv.N, self.env.heights)
+
+    def test_state_is_read_only(self):
+        with self.assertRaises(ValueError):
+            self.env.state[0, -1, 0] = 1
+
+    def test_set_state(self):
+        state = np.zeros(shape=(2, ConnectFourEnv.M, ConnectFourEnv.N))
+        # place a token for Player 1 in the first column.
+        state[0, -1, 0] = 1
+        # fill the entire 2nd column with tokens belonging to Player 2.
+        state[1, :, 1] = 1
+        self.env.state = state
+
+        self.assertEqual([1, 6, 0, 0, 0, 0, 0], self.env.heights)
+        # The bottom bit of the first column belongs to Player 1.
+        self.assertEqual(1, self.env.bitboards[0])
+        # The bottom 6 bits of the second column belong to Player 2.
+        self.assertEqual(0b111111 << 7, self.env.bitboards[1])
+        self.assertEqual(ConnectFourEnv.M - 1, self.env._find_highest_token(0))
+        self.assertEqual(0, self.env._find_highest_token(1))
+        self.assertEqual(ConnectFourEnv.M, self.env._find_highest_token(2))
+
+    def test_place_token_in_full_column(self):
+        # fill the entire 2nd column with tokens belonging to Player 2.
+        state = np.zeros(shape=(2, ConnectFourEnv.M, ConnectFourEnv.N))
+        state[1, :, 1] = 1
+        self.env.state = state
+
+        obs, reward, done, _ = self.env.step(1)
+        # verify that the state has not changed.
+        self.assertIsNone(np.testing.assert_array_equal(obs, state))
+        self.assertEqual(reward, TwoPlayerGameEnv.INVALID_MOVE)
+        self.assertTrue(done)
+
+    def test_place_token_and_connected_four_vertically(self):
+        state = np.zeros(shape=(2, ConnectFourEnv.M, ConnectFourEnv.N))
+        state[0, -3:, 0] = 1
+        self.env.state = state
+        expected_state = state.copy()
+        expected_state[0, -4, 0] = 1
+
+        obs, reward, done, _ = self.env.step(0)
+        self.assertIsNone(np.testing.assert_array_equal(obs, expected_state))
+        self.assertEqual(reward, TwoPlayerGameEnv.CONNECTED)
+        self.assertTrue(done)
+
+    def test_place_token_and_connected_four_horizontally(self):
+        state = np.zeros(shape=(2, ConnectFourEnv.M, ConnectFourEnv.N))
+        state[0, -1, 3:6] = 1
+        self.env.state = state
+
+        _, reward, done, _ = self.env.step(6)
+        self.assertEqual(reward, TwoPlayerGameEnv.CONNECTED)
+        self.assertTrue(done)
+
+    def test_place_token_and_connected_four_diagonally(self):
+        self.env.state = np.array([
+            [
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 1, 0, 0, 0, 0, ],
+                [0, 1, 0, 0, 0, 0, 0, ],
+                [1, 0, 0, 0, 0, 0, 0, ],
+            ],
+            [
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 1, 0, 0, 0, ],
+                [0, 0, 1, 1, 0, 0, 0, ],
+                [0, 1, 1, 1, 0, 0, 0, ],
+            ],
+        ])
+
+        _, reward, done, _ = self.env.step(3)
+        self.assertEqual(reward, TwoPlayerGameEnv.CONNECTED)
+        self.assertTrue(done)
+
+    def test_only_new_token_is_checked(self):
+        # Player 2 already has four in a row, but only groups containing the new token should be checked.
+        state = np.zeros(shape=(2, ConnectFourEnv.M, ConnectFourEnv.N))
+        state[1, -1, 0:4] = 1
+        self.env.state = state
+
+        _, reward, done, _ = self.env.step(6)
+        self.assertEqual(reward, TwoPlayerGameEnv.DEFAULT_REWARD)
+        self.assertFalse(done)
+
+    def test_draw(self):
+        # Make all locations expect the top-left belong to Player 2.
+        state = np.ones(shape=(2, ConnectFourEnv.M, ConnectFourEnv.N))
+        state[0, :, :] = 0
+        state[1, 0, 0] = 0
+        self.env.state = state
+
+        expected_state = state.copy()
+        expected_state[0, 0, 0] = 1
+
+        obs, reward, done, _ = self.env.step(0)
+        self.assertIsNone(np.testing.assert_array_equal(obs, expected_state))
+        self.assertEqual(reward, TwoPlayerGameEnv.DRAW)
+        self.assertTrue(done)
+
+    def test_get_env_variables_and_reset(self):
+        self.env.step(0)
+        env_variables = self.env.env_variables
+        bitboards, heights = list(self.env.bitboards), list(self.env.heights)
+
+        self.env.step(0)
+        self.env.step(1)
+
+        obs = self.env.reset(env_variables=env_variables)
+        self.assertIsNone(np.testing.assert_array_equal(obs, env_variables[0]))
+        self.assertEqual(env_variables[1], self.env.player_turn)
+        self.assertEqual(bitboards, self.env.bitboards)
+        self.assertEqual(heights, self.env.heights)
+
+    def test_reset_to_own_env_variables(self):
+        self.env.step(0)
+        env_variables = self.env.env_variables
+        want_state = env_variables.state.copy()
+        bitboards, heights = list(self.env.bitboards), list(self.env.heights)
+        # The state in env_variables is shared with this environment, so it cannot be modified.
+        with self.assertRaises(ValueError):
+            env_variables.state[0, 0, 0] = 1
+
+        # Later moves do not change env_variables.
+        self.env.step(0)
+        self.env.step(1)
+        self.assertIsNone(np.testing.assert_array_equal(want_state, env_variables.state))
+
+        obs = self.env.reset(env_variables=env_variables)
+        self.assertIsNone(np.testing.assert_array_equal(obs, env_variables.state))
+        self.assertIs(env_variables.state, self.env.state)
+        self.assertEqual(env_variables.player_turn, self.env.player_turn)
+        self.assertEqual(bitboards, self.env.bitboards)
+        self.assertEqual(heights, self.env.heights)
+        self.assertEqual([], self.env.moves)
+
+    def test_copy_observations_false(self):
+        env = gym.make('connect_four_bitboard-v0', copy_observations=False)
+        self.assertIsNone(env.reset())
+        obs, _, _, _ = env.step(0)
+        self.assertIsNone(obs)
+        # The state is only built once it is read.
+        self.assertIsNone(env._state)
+        self.assertEqual(1, env.state[0, -1, 0])
+
+    def test_make_rollout_env(self):
+        env = gym.make('connect_four-v0')
+        env.step(3)
+        rollout_env = make_rollout_env(env)
+        self.assertIsInstance(rollout_env, BitboardConnectFourEnv)
+        self.assertFalse(rollout_env.copy_observations)
+        self.assertIsNone(np.testing.assert_array_equal(env.state, rollout_env.state))
+        self.assertEqual(env.player_turn, rollout_env.player_turn)
+
+        # Moves in the rollout environment do not change env.
+        rollout_env.step(3)
+        self.assertEqual(1, np.sum(env.state))
+        self.assertEqual(1, len(env.moves))
+
+    def test_make_rollout_env_tic_tac_toe(self):
+        env = gym.make('tic_tac_toe-v0')
+        self.assertIs(env, make_rollout_env(env))
+
+    def test_undo_last_action_after_single_move(self):
+        want_env_variables = self.env.env_variables
+
+        self.env.step(0)
+        self.env.undo_last_action(action=0)
+
+        got_env_variables = self.env.env_variables
+        self.assertIsNone(np.testing.assert_array_equal(want_env_variables[0], got_env_variables[0]))
+        self.assertEqual(want_env_variables[1], got_env_variables[1])
+        self.assertEqual([0, 0], self.env.bitboards)
+
+    def test_undo_last_action_same_player(self):
+        self.env.step(0)
+        self.env.step(1)
+        with self.assertRaises(ValueError):
+            self.env.undo_last_action(0)
+
+    def test_undo_last_action_then_undo(self):
+        want_env_variables = self.env.env_variables
+
+        self.env.step(0)
+        self.env.step(1)
+        self.env.undo_last_action(action=1)
+        self.env.undo()
+
+        got_env_variables = self.env.env_variables
+        self.assertIsNone(np.testing.assert_array_equal(want_env_variables[0], got_env_variables[0]))
+        self.assertEqual(want_env_variables[1], got_env_variables[1])
+        self.assertEqual([0, 0], self.env.bitboards)
+        with self.assertRaises(ValueError):
+            self.env.undo()
+
+    def test_undo(self):
+        with self.assertRaises(ValueError):
+            self.env.undo()
+
+        for action in [0, 1, 0, 1, 0, 1]:
+            self.env.step(action)
+        want_env_variables = self.env.env_variables
+        bitboards, heights = list(self.env.bitboards), list(self.env.heights)
+
+        _, reward, _, _ = self.env.step(0)
+        self.assertEqual(TwoPlayerGameEnv.CONNECTED, reward)
+        self.env.undo()
+
+        got_env_variables = self.env.env_variables
+        self.assertIsNone(np.testing.assert_array_equal(want_env_variables[0], got_env_variables[0]))
+        self.assertEqual(want_env_variables[1], got_env_variables[1])
+        self.assertEqual(bitboards, self.env.bitboards)
+        self.assertEqual(heights, self.env.heights)
+
+    def test_actions_full_column(self):
+        state = np.zeros(shape=(2, ConnectFourEnv.M, ConnectFourEnv.N))
+        state[1, :, 3] = 1
+        self.env.state = state
+        self.assertEqual([0, 1, 2, 4, 5, 6], self.env.actions())
+
+    def test_matches_connect_four_env_random_games(self):
+        random.seed(0)
+        env = gym.make('connect_four-v0')
+        for _ in range(200):
+            env.reset()
+            self.env.reset()
+            done = False
+            while not done:
+                action = random.randrange(ConnectFourEnv.N)
+                want_obs, want_reward, want_done, _ = env.step(action)
+                got_obs, got_reward, got_done, _ = self.env.step(action)
+                self.assertIsNone(np.testing.assert_array_equal(want_obs, got_obs))
+                self.assertEqual(want_reward, got_reward)
+                self.assertEqual(want_done, got_done)
+                self.assertEqual(env.player_turn, self.env.player_turn)
+                self.assertEqual(env.actions(), self.env.actions())
+                done = want_done
+
+    def test_4x4(self):
+        ConnectFourEnv.M = 4
+        ConnectFourEnv.N = 4
+        ConnectFourEnv.action_space = 4
+        self.env.reset()
+        for action in [0, 1, 0, 1, 0, 1]:
+            _, reward, done, _ = self.env.step(action)
+            self.assertFalse(done)
+        _, reward, done, _ = self.env.step(0)
+        self.assertEqual(TwoPlayerGameEnv.CONNECTED, reward)
+        self.assertTrue(done)
+        self.assertEqual([1, 2, 3], self.env.actions())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,5 @@
+import warnings
+
 from typing import Sequence
 
 import numpy as np
@@ -19,9 +21,16 @@ class ConnectFourEnv(TwoPlayerGameEnv):
 
     action_space = N
 
-    def __init__(self):
+    def __init__(self, copy_observations: bool = True):
+        """
+
+        Args:
+            copy_observations (bool): If True, step() and reset() return a copy of the state.
+                If False, they return a read-only view of the state instead. The view is not a snapshot; it changes
+                as the environment changes. Search code that ignores observations should use False.
+        """
+        self.copy_observations = copy_observations
         self.reset()
-        pass
 
     def step(self, action: int):
         """
@@ -39,23 +48,37 @@ class ConnectFourEnv(TwoPlayerGameEnv):
 
         # Placing a token in a full column is an invalid move.
         if new_token_row == -1:
-            return self.state.copy(), TwoPlayerGameEnv.INVALID_MOVE, True, None
+            self.moves.append((self.player_turn, None, action))
+            return self._observation(), TwoPlayerGameEnv.INVALID_MOVE, True, None
 
         # Place a token.
         self.state[self.player_turn, new_token_row, action] = 1
+        self.moves.append((self.player_turn, new_token_row, action))
 
         # Check if the player has connected four.
         if self._connected_four(row=new_token_row, col=action):
-            return self.state.copy(), TwoPlayerGameEnv.CONNECTED, True, None
+            return self._observation(), TwoPlayerGameEnv.CONNECTED, True, None
 
         # If all locations have been used and neither player has won,
         # this results in a draw.
         if self._is_full():
-            return self.state.copy(), TwoPlayerGameEnv.DRAW, True, None
+            return self._observation(), TwoPlayerGameEnv.DRAW, True, None
 
         # Continue play with it now being the other player's turn.
         self.player_turn = 1 - self.player_turn
-        return self.state.copy(), TwoPlayerGameEnv.DEFAULT_REWARD, False, None
+        return self._observation(), TwoPlayerGameEnv.DEFAULT_REWARD, False, None
+
+    def _observation(self):
+        """
+        Returns:
+            observation (np.ndarray): a copy of the state if self.copy_observations is True.
+                Otherwise, a read-only view of the state.
+        """
+        if self.copy_observations:
+            return self.state.copy()
+        observation = self.state.view()
+        observation.flags.writeable = False
+        return observation
 
     def _find_highest_token(self, column) -> int:
         """ Finds the highest token belonging to either player in the selected column.
@@ -128,11 +151,29 @@ class ConnectFourEnv(TwoPlayerGameEnv):
         else:
             self.state = np.zeros(shape=(2, ConnectFourEnv.M, ConnectFourEnv.N))
             self.player_turn = 0
+        self.moves = []
+
+        return self._observation()
 
-        return self.state.copy()
+    def undo(self):
+        """Undoes the most recent call to step() in constant time.
+
+        Raises:
+            ValueError: if step() has not been called since the last call to reset().
+
+        Modifies:
+            - this ConnectFourEnv instance will be in the state it was in before the most recent call to step().
+        """
+        if not self.moves:
+            raise ValueError("Cannot undo action for initial state")
+
+        player, row, col = self.moves.pop()
+        if row is not None:
+            self.state[player, row, col] = 0
+        self.player_turn = player
 
     def undo_last_action(self, action):
-        """ TODO Deprecate.
+        """ Deprecated. Use undo() instead.
 
         Args:
             action (int): an Action
@@ -142,10 +183,14 @@ class ConnectFourEnv(TwoPlayerGameEnv):
             1. The environment is in the initial state.
             2. There must be at least one token in the given column (i.e. action)
             3. The top token in the given column must belong to the opponent of the current player.
+            4. If step() has been called since the last call to reset(), the given action must be the last action
+               passed to step().
 
         Modifies:
             - this ConnectFourEnv instance will have undone the given action.
         """
+        warnings.warn("undo_last_action is deprecated. use undo() instead", DeprecationWarning)
+
         # If there are no tokens in the state:
         if np.sum(self.state) == 0:
             raise ValueError("Cannot undo action for initial state")
@@ -161,6 +206,13 @@ class ConnectFourEnv(TwoPlayerGameEnv):
         if self.state[self.player_turn][highest_row][action] == 1:
             raise ValueError("Cannot undo action that belongs to the current player")
 
+        if self.moves:
+            # The token was placed by step(), so it must be removed from the history of moves too.
+            if self.moves[-1][2] != action:
+                raise ValueError("Cannot undo action that is not the last action")
+            self.undo()
+            return
+
         # Remove the token and switch play to the other player.
         self.state[1 - self.player_turn, highest_row, action] = 0
         self.player_turn = 1 - self.player_turn
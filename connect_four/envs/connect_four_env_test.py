@@ -225,6 +225,76 @@ class TestConnectFourEnv(unittest.TestCase):
         # verify it is currently Player 1's turn.
         self.assertEqual(want_env_variables[1], got_env_variables[1])
 
+    def test_undo_last_action_then_undo(self):
+        want_env_variables = self.env.env_variables
+
+        self.env.step(0)
+        self.env.step(1)
+        self.env.undo_last_action(action=1)
+        self.env.undo()
+
+        got_env_variables = self.env.env_variables
+        self.assertIsNone(np.testing.assert_array_equal(want_env_variables[0], got_env_variables[0]))
+        self.assertEqual(want_env_variables[1], got_env_variables[1])
+        with self.assertRaises(ValueError):
+            self.env.undo()
+
+    def test_undo_last_action_not_last_action(self):
+        self.env.step(0)
+        self.env.step(1)
+        self.env.step(2)
+        # The top token of column 0 belongs to the opponent, but it was not placed last.
+        with self.assertRaises(ValueError):
+            self.env.undo_last_action(action=0)
+
+    def test_undo_initial_state(self):
+        with self.assertRaises(ValueError):
+            self.env.undo()
+
+    def test_undo_restores_state_and_player_turn(self):
+        want_env_variables = self.env.env_variables
+
+        for action in [0, 1, 0, 1]:
+            self.env.step(action)
+        for _ in range(4):
+            self.env.undo()
+
+        got_env_variables = self.env.env_variables
+        self.assertIsNone(np.testing.assert_array_equal(want_env_variables[0], got_env_variables[0]))
+        self.assertEqual(want_env_variables[1], got_env_variables[1])
+
+    def test_undo_after_connected_four(self):
+        for action in [0, 1, 0, 1, 0, 1]:
+            self.env.step(action)
+        want_env_variables = self.env.env_variables
+
+        _, reward, done, _ = self.env.step(0)
+        self.assertEqual(TwoPlayerGameEnv.CONNECTED, reward)
+        self.env.undo()
+
+        got_env_variables = self.env.env_variables
+        self.assertIsNone(np.testing.assert_array_equal(want_env_variables[0], got_env_variables[0]))
+        self.assertEqual(want_env_variables[1], got_env_variables[1])
+
+    def test_undo_after_invalid_move(self):
+        state = np.zeros(shape=(2, ConnectFourEnv.M, ConnectFourEnv.N))
+        state[1, :, 1] = 1
+        self.env.state = state
+        self.env.step(1)
+        self.env.undo()
+
+        self.assertIsNone(np.testing.assert_array_equal(state, self.env.state))
+        self.assertEqual(0, self.env.player_turn)
+
+    def test_copy_observations_false(self):
+        env = gym.make('connect_four-v0', copy_observations=False)
+        obs, _, _, _ = env.step(0)
+        with self.assertRaises(ValueError):
+            obs[0, -1, 0] = 0
+        # The observation is a view of the state, so it reflects later moves.
+        env.step(0)
+        self.assertEqual(1, obs[1, -2, 0])
+
     def test_actions_initial_state(self):
         want_actions = list(range(7))
         self.assertEqual(want_actions, self.env.actions())
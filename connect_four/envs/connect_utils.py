@@ -1,3 +1,85 @@
+import functools
+
+from collections import namedtuple
+
+import numpy as np
+
+# Lines holds the geometry of every line of num_to_connect squares on a board of a given size.
+# Squares are identified by their flat index, row * num_cols + col.
+#   squares (Tuple[Tuple[Tuple[int, int], ...], ...]): for every line, its (row, col) squares from start to end.
+#   indices (np.ndarray): an int array of shape (num_lines, num_to_connect) of the flat index of every square in
+#       every line.
+#   masks (Tuple[int, ...]): for every line, a bitmask with bit (row * num_cols + col) set for each of its squares.
+#   lines_by_square (Tuple[Tuple[int, ...], ...]): for every flat index, the ids of all lines containing that square.
+#   indices_by_square (Tuple[np.ndarray, ...]): for every flat index, indices[lines_by_square[square]].
+Lines = namedtuple("Lines", ["squares", "indices", "masks", "lines_by_square", "indices_by_square"])
+
+
+@functools.lru_cache(maxsize=None)
+def get_lines(num_rows: int, num_cols: int, num_to_connect: int) -> Lines:
+    """Returns every line of num_to_connect squares on a board with the given dimensions.
+
+    The tables are built the first time a board size is requested and shared by every caller afterwards.
+    Callers must not modify them.
+
+    Lines start at the square they are listed from and extend up-right, right, down-right or down, in that order.
+    E.g. the first line starting at (row, col) is [(row, col), (row - 1, col + 1), ...].
+
+    Args:
+        num_rows (int): the number of rows in the board.
+        num_cols (int): the number of columns in the board.
+        num_to_connect (int): the number of squares in a line.
+
+    Returns:
+        lines (Lines): the lines on the board and a square-to-lines index.
+    """
+    directions = [
+        (-1, 1),  # up-right diagonal
+        (0, 1),  # horizontal
+        (1, 1),  # down-right diagonal
+        (1, 0),  # vertical
+    ]
+    squares = []
+    for start_row in range(num_rows):
+        for start_col in range(num_cols):
+            for row_diff, col_diff in directions:
+                end_row = start_row + (num_to_connect - 1) * row_diff
+                end_col = start_col + (num_to_connect - 1) * col_diff
+                if 0 <= end_row < num_rows and 0 <= end_col < num_cols:
+                    squares.append(tuple(
+                        (start_row + i * row_diff, start_col + i * col_diff) for i in range(num_to_connect)
+                    ))
+
+    indices = np.array(
+        [[row * num_cols + col for row, col in line] for line in squares],
+        dtype=np.intp,
+    ).reshape(len(squares), num_to_connect)
+    indices.flags.writeable = False
+
+    masks = []
+    lines_by_square = [[] for _ in range(num_rows * num_cols)]
+    for line_id, line in enumerate(indices):
+        mask = 0
+        for square in line:
+            mask |= 1 << int(square)
+            lines_by_square[square].append(line_id)
+        masks.append(mask)
+
+    indices_by_square = []
+    for line_ids in lines_by_square:
+        square_indices = indices[line_ids]
+        square_indices.flags.writeable = False
+        indices_by_square.append(square_indices)
+
+    return Lines(
+        squares=tuple(squares),
+        indices=indices,
+        masks=tuple(masks),
+        lines_by_square=tuple(tuple(line_ids) for line_ids in lines_by_square),
+        indices_by_square=tuple(indices_by_square),
+    )
+
+
 def connected(state, num_to_connect, player, row, col):
     """
     Args:
@@ -14,49 +96,8 @@ def connected(state, num_to_connect, player, row, col):
         connected_four (bool): True if the player connected at least num_to_connect using (row, col);
                            otherwise, False
     """
-    row_and_col_adds = [
-        (-1, 0),  # up
-        (-1, 1),  # up-right
-        (0, 1),  # right
-        (1, 1),  # down-right
-    ]
-    for row_add, col_add in row_and_col_adds:
-        num_tokens_in_pos_direction = _num_tokens_in_direction(state, player, row, col, row_add, col_add)
-        num_tokens_in_neg_direction = _num_tokens_in_direction(state, player, row, col, -row_add, -col_add)
-        num_tokens_in_line = num_tokens_in_pos_direction + 1 + num_tokens_in_neg_direction
-
-        if num_tokens_in_line >= num_to_connect:
-            return True
-
-    # Player did not connect four in any direction.
-    return False
-
+    num_rows, num_cols = len(state[player]), len(state[player][0])
+    lines = get_lines(num_rows=num_rows, num_cols=num_cols, num_to_connect=num_to_connect)
+    player_tokens = np.asarray(state[player]).ravel()
+    return bool(player_tokens[lines.indices_by_square[row * num_cols + col]].all(axis=1).any())
 
-def _num_tokens_in_direction(state, player, row, col, row_add, col_add):
-    """ Finds the number of tokens belonging to the given player starting
-    from the given location and continuing in the given direction.
-
-    Args:
-        player (int): 0 or 1. The player we are checking.
-        row (int): the starting row
-        col (int): the starting column
-        row_add (int): the increment for row
-        col_add (int): the increment for col
-
-    Returns:
-        The number of tokens belonging to the player in the given direction.
-        The starting location is not included.
-        E.g. If there is only 1 token belonging to the player
-        adjacent to the given location, returns 1.
-"""
-    player_tokens = state[player]
-    r, c = row, col
-    num_tokens = -1
-
-    # while we are still in bounds and the location belongs to the player.
-    while (0 <= r < len(player_tokens) and 0 <= c < len(player_tokens[0]) and
-           player_tokens[r, c] == 1):
-        r += row_add
-        c += col_add
-        num_tokens += 1
-    return num_tokens
@@ -11,22 +11,6 @@ class TestConnectUtils(unittest.TestCase):
         self.N = 4
         self.state = np.zeros(shape=(2, self.M, self.N))
 
-    def test_num_tokens_in_direction(self):
-        # fill the entire 1st column with tokens belonging to Player 1.
-        self.state[0, :, 0] = 1
-
-        num_tokens = connect_utils._num_tokens_in_direction(
-            state=self.state,
-            player=0,
-            row=0,
-            col=0,
-            row_add=1,
-            col_add=0,
-        )
-        # since the entire column has been filled, there should be self.M - 1 tokens.
-        # We exclude the passe in square.
-        self.assertEqual(num_tokens, self.M - 1)
-
     def test_connected_vertically(self):
         # fill the entire 1st column with tokens belonging to Player 1.
         # Player 1 should have connected M starting with (0, 0).
@@ -75,6 +59,36 @@ class TestConnectUtils(unittest.TestCase):
             col=0,
         ))
 
+    def test_get_lines_6x7(self):
+        lines = connect_utils.get_lines(num_rows=6, num_cols=7, num_to_connect=4)
+        self.assertEqual(69, len(lines.squares))
+        self.assertEqual((69, 4), lines.indices.shape)
+        self.assertEqual(69, len(lines.masks))
+        self.assertEqual(6 * 7, len(lines.lines_by_square))
+        # The corner is in 1 horizontal, 1 vertical and 1 diagonal line.
+        self.assertEqual(3, len(lines.lines_by_square[0]))
+        # Square (2, 3) is in 4 horizontal, 3 vertical and 3 lines along each diagonal.
+        self.assertEqual(13, len(lines.lines_by_square[2 * 7 + 3]))
+
+        for line_id, line in enumerate(lines.squares):
+            want_mask = 0
+            for row, col in line:
+                want_mask |= 1 << (row * 7 + col)
+                self.assertIn(line_id, lines.lines_by_square[row * 7 + col])
+            self.assertEqual(want_mask, lines.masks[line_id])
+
+        for square, line_ids in enumerate(lines.lines_by_square):
+            self.assertIsNone(np.testing.assert_array_equal(
+                lines.indices[list(line_ids)],
+                lines.indices_by_square[square],
+            ))
+
+    def test_get_lines_is_cached(self):
+        self.assertIs(
+            connect_utils.get_lines(num_rows=3, num_cols=3, num_to_connect=3),
+            connect_utils.get_lines(num_rows=3, num_cols=3, num_to_connect=3),
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
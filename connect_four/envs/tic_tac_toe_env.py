@@ -18,9 +18,16 @@ class TicTacToeEnv(TwoPlayerGameEnv):
 
     action_space = M * N
 
-    def __init__(self):
+    def __init__(self, copy_observations: bool = True):
+        """
+
+        Args:
+            copy_observations (bool): If True, step() and reset() return a copy of the state.
+                If False, they return a read-only view of the state instead. The view is not a snapshot; it changes
+                as the environment changes. Search code that ignores observations should use False.
+        """
+        self.copy_observations = copy_observations
         self.reset()
-        pass
 
     def step(self, action: int):
         """
@@ -40,19 +47,32 @@ class TicTacToeEnv(TwoPlayerGameEnv):
 
         # Place a token.
         self.state[self.player_turn, row, col] = 1
+        self.moves.append((self.player_turn, row, col))
 
         # Check if the player has connected three.
         if self._connected_three(row=row, col=col):
-            return self.state.copy(), TwoPlayerGameEnv.CONNECTED, True, None
+            return self._observation(), TwoPlayerGameEnv.CONNECTED, True, None
 
         # If all locations have been used and neither player has won,
         # this results in a draw.
         if self._is_full():
-            return self.state.copy(), TwoPlayerGameEnv.DRAW, True, None
+            return self._observation(), TwoPlayerGameEnv.DRAW, True, None
 
         # Continue play with it now being the other player's turn.
         self.player_turn = 1 - self.player_turn
-        return self.state.copy(), TwoPlayerGameEnv.DEFAULT_REWARD, False, None
+        return self._observation(), TwoPlayerGameEnv.DEFAULT_REWARD, False, None
+
+    def _observation(self):
+        """
+        Returns:
+            observation (np.ndarray): a copy of the state if self.copy_observations is True.
+                Otherwise, a read-only view of the state.
+        """
+        if self.copy_observations:
+            return self.state.copy()
+        observation = self.state.view()
+        observation.flags.writeable = False
+        return observation
 
     @staticmethod
     def _action_to_square(action: int) -> (int, int):
@@ -139,8 +159,25 @@ class TicTacToeEnv(TwoPlayerGameEnv):
         else:
             self.state = np.zeros(shape=(2, TicTacToeEnv.M, TicTacToeEnv.N))
             self.player_turn = 0
+        self.moves = []
+
+        return self._observation()
+
+    def undo(self):
+        """Undoes the most recent call to step() in constant time.
+
+        Raises:
+            ValueError: if step() has not been called since the last call to reset().
+
+        Modifies:
+            - this TicTacToeEnv instance will be in the state it was in before the most recent call to step().
+        """
+        if not self.moves:
+            raise ValueError("Cannot undo action for initial state")
 
-        return self.state.copy()
+        player, row, col = self.moves.pop()
+        self.state[player, row, col] = 0
+        self.player_turn = player
 
     def render(self, mode='human'):
         """Renders the current state of the environment.
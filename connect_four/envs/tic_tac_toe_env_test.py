@@ -68,6 +68,18 @@ class TestTicTacToeEnv(unittest.TestCase):
         self.assertEqual(TwoPlayerGameEnv.CONNECTED, reward)
         self.assertTrue(done)
 
+    def test_undo(self):
+        with self.assertRaises(ValueError):
+            self.env.undo()
+
+        self.env.step(4)
+        self.env.step(0)
+        self.env.undo()
+        want_state = np.zeros(shape=(2, TicTacToeEnv.M, TicTacToeEnv.N))
+        want_state[0, 1, 1] = 1
+        self.assertIsNone(np.testing.assert_array_equal(want_state, self.env.state))
+        self.assertEqual(1, self.env.player_turn)
+
 
 if __name__ == '__main__':
     unittest.main()
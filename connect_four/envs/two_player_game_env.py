@@ -22,6 +22,15 @@ class TwoPlayerGameEnv(gym.Env, ABC):
     def reset(self, env_variables: TwoPlayerGameEnvVariables = None):
         pass
 
+    @abstractmethod
+    def undo(self):
+        """Undoes the most recent call to step().
+
+        Raises:
+            ValueError: if step() has not been called since the last call to reset().
+        """
+        pass
+
     @abstractmethod
     def actions(self) -> Sequence[int]:
         pass
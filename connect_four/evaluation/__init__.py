@@ -1,4 +1,5 @@
 from connect_four.evaluation.evaluator import ProofStatus
 from connect_four.evaluation.evaluator import Evaluator
 from connect_four.evaluation.evaluator import NodeType
+from connect_four.evaluation.evaluation_cache import EvaluationCache
 from connect_four.evaluation.victor.victor_evaluator import Victor
@@ -1,8 +1,12 @@
 from typing import Set, Dict
 
+import numpy as np
+
 from connect_four.game import Square
 from connect_four.problem import Group
+from connect_four.problem import get_groups
 from connect_four.envs import TwoPlayerGameEnvVariables
+from connect_four.envs import connect_utils
 
 
 class Board:
@@ -75,51 +79,13 @@ class Board:
         Returns:
             groups (set<Group>): a set of Group instances. Each group belongs to the given player.
         """
-        directions = [
-            (-1, 1),  # up-right diagonal
-            (0, 1),  # horizontal
-            (1, 1),  # down-right diagonal
-            (1, 0),  # vertical
-        ]
-        groups = set()
-
-        for row in range(len(self.state[0])):
-            for col in range(len(self.state[0][0])):
-                for row_diff, col_diff in directions:
-                    if self.is_potential_group(player, row, col, row_diff, col_diff):
-                        groups.add(Group(
-                            player,
-                            start=Square(row, col),
-                            end=Square(row + 3 * row_diff, col + 3 * col_diff),
-                        ))
+        num_rows, num_cols = len(self.state[0]), len(self.state[0][0])
+        lines = connect_utils.get_lines(num_rows=num_rows, num_cols=num_cols, num_to_connect=4)
+        player_groups = get_groups(num_rows=num_rows, num_cols=num_cols, num_to_connect=4)[player]
 
-        return groups
-
-    def is_potential_group(self, player: int, row: int, col: int, row_diff: int, col_diff: int):
-        """Returns whether or not the given group is a group that belongs to the player.
-
-        Args:
-            player (int): a player (0 or 1). Is the group a group that belongs to this player?
-            row (int): starting row
-            col (int): starting column
-            row_diff (int): direction in which to increment the row (-1, 0 or 1)
-            col_diff (int): direction in which to increment the col (-1, 0 or 1)
-
-        Returns:
-            is_group (bool): True if the group is a valid potential group that belongs to the player.
-                              Otherwise, false.
-        """
-        opponent = 1 - player
-        for _ in range(4):
-            square = Square(row, col)
-            if not self.is_valid(square):
-                return False
-            if self.state[opponent][row][col]:
-                # If there is a token that belongs to the opponent in this group,
-                # then this group is not a potential group that belongs to the given player.
-                return False
-            row, col = row + row_diff, col + col_diff
-        return True
+        # A group is a potential group if none of its squares have a token that belongs to the opponent.
+        opponent_tokens = self._tokens(1 - player)
+        return {group for group, mask in zip(player_groups, lines.masks) if not mask & opponent_tokens}
 
     def potential_groups_at_square(self, square: Square) -> Set[Group]:
         """Finds all potential groups that belong to either player containing square.
@@ -130,28 +96,33 @@ class Board:
         Returns:
             groups_at_square (Set[Group]): All groups that contain square.
         """
-        directions = [
-            (-1, 1),  # up-right diagonal
-            (0, 1),  # horizontal
-            (1, 1),  # down-right diagonal
-            (1, 0),  # vertical
-        ]
-        groups = set()
+        num_rows, num_cols = len(self.state[0]), len(self.state[0][0])
+        lines = connect_utils.get_lines(num_rows=num_rows, num_cols=num_cols, num_to_connect=4)
+        groups_by_player = get_groups(num_rows=num_rows, num_cols=num_cols, num_to_connect=4)
 
-        for row_diff, col_diff in directions:
-            for i in range(4):
-                row = square.row - i * row_diff
-                col = square.col - i * col_diff
-                for player in range(2):
-                    if self.is_potential_group(player, row, col, row_diff, col_diff):
-                        groups.add(Group(
-                            player,
-                            start=Square(row, col),
-                            end=Square(row + 3 * row_diff, col + 3 * col_diff),
-                        ))
+        groups = set()
+        tokens_by_player = [self._tokens(0), self._tokens(1)]
+        for line_id in lines.lines_by_square[square.row * num_cols + square.col]:
+            for player in range(2):
+                if not lines.masks[line_id] & tokens_by_player[1 - player]:
+                    groups.add(groups_by_player[player][line_id])
 
         return groups
 
+    def _tokens(self, player: int) -> int:
+        """
+        Args:
+            player (int): a player (0 or 1).
+
+        Returns:
+            tokens (int): a bitmask with bit (row * N + col) set for every square that has a token
+                belonging to player.
+        """
+        tokens = 0
+        for index in np.flatnonzero(self.state[player]):
+            tokens |= 1 << int(index)
+        return tokens
+
     def potential_groups_by_square(self) -> Dict[Square, Set[Group]]:
         """Returns a dictionary of Squares to all groups that contain that Square.
         Every Group is a potential Group that the current player has in this board state.
@@ -78,7 +78,7 @@ class TestBoard(unittest.TestCase):
         }
         self.assertEqual(want_squares, board.playable_squares())
 
-    def test_is_potential_group(self):
+    def test_is_valid(self):
         self.env.state = np.array([
             [
                 [0, 0, 0, 0, ],
@@ -98,7 +98,7 @@ class TestBoard(unittest.TestCase):
         self.assertTrue(board.is_valid(Square(row=1, col=3)))
         self.assertTrue(board.is_valid(Square(row=2, col=3)))
         self.assertTrue(board.is_valid(Square(row=3, col=3)))
-        self.assertTrue(board.is_potential_group(player=0, row=0, col=3, row_diff=1, col_diff=0))
+        self.assertFalse(board.is_valid(Square(row=4, col=3)))
 
     def test_potential_groups(self):
         self.env.state = np.array([
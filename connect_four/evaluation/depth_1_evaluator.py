@@ -1,15 +1,27 @@
 from connect_four.envs import TwoPlayerGameEnv
+from connect_four.envs.bitboard_connect_four_env import make_rollout_env
 from connect_four.evaluation import ProofStatus, NodeType
 from connect_four.evaluation.simple_evaluator import SimpleEvaluator
 
 
 class Depth1Evaluator(SimpleEvaluator):
+    def __init__(self, model: TwoPlayerGameEnv):
+        """
+        Requires:
+            model's current state cannot be a terminal state.
+
+        Args:
+            model (TwoPlayerGameEnv): a TwoPlayerGameEnv instance. Every evaluation plays and undoes each action,
+                so a ConnectFourEnv is replaced with a BitboardConnectFourEnv in the same state.
+        """
+        super().__init__(model=model)
+        self.model = make_rollout_env(self.model)
+
     def evaluate(self) -> ProofStatus:
         proof_status = super().evaluate()
         if proof_status != ProofStatus.Unknown:
             return proof_status
 
-        env_variables = self.model.env_variables
         for action in self.actions():
             _, reward, done, _ = self.model.step(action=action)
             if done and reward == TwoPlayerGameEnv.CONNECTED:
@@ -17,5 +29,5 @@ class Depth1Evaluator(SimpleEvaluator):
                     proof_status = ProofStatus.Proven
                 else:
                     proof_status = ProofStatus.Disproven
-            self.model.reset(env_variables=env_variables)
+            self.model.undo()
         return proof_status
@@ -3,7 +3,7 @@ import unittest
 import gym
 import numpy as np
 
-from connect_four.envs import ConnectFourEnv
+from connect_four.envs import BitboardConnectFourEnv, ConnectFourEnv
 from connect_four.evaluation import ProofStatus
 from connect_four.evaluation.depth_1_evaluator import Depth1Evaluator
 
@@ -35,6 +35,10 @@ class TestDepth1EvaluatorConnectFour(unittest.TestCase):
         ])
         self.evaluator = Depth1Evaluator(model=self.diagram_11_1_env)
 
+    def test_model_is_bitboard_env(self):
+        self.assertIsInstance(self.evaluator.model, BitboardConnectFourEnv)
+        self.assertIsNone(np.testing.assert_array_equal(self.diagram_11_1_env.state, self.evaluator.state))
+
     def test_diagram_11_1_move_5(self):
         # Move 5.
         self.evaluator.move(action=0)  # White plays a1.
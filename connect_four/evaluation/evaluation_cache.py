@@ -0,0 +1,119 @@
+import os
+import struct
+
+from collections import OrderedDict
+
+import numpy as np
+
+from connect_four.evaluation.evaluator import ProofStatus
+
+
+def board_key(state: np.ndarray) -> bytes:
+    """
+    Args:
+        state (np.ndarray): the state of a TwoPlayerGameEnv, with one 0/1 plane per player.
+
+    Returns:
+        key (bytes): the state packed into one bit per square and player. It is the same in every process,
+            so it can be stored in files.
+    """
+    return np.packbits(state != 0).tobytes()
+
+
+class EvaluationCache:
+    """A bounded least-recently-used cache of the ProofStatus of positions, keyed by board_key().
+
+    One EvaluationCache can be shared by every Evaluator in a process, e.g. by the Evaluators of two agents, and
+    saved to a file to be loaded by a later process. Unknown results are cached as well, since an Evaluator that could
+    not solve a position will not solve it the next time either.
+
+    The file is a header followed by one record per entry: the key, then one byte for the ProofStatus value.
+    Entries are written from least to most recently used.
+    """
+
+    MAGIC = b"CFEC"
+    VERSION = 1
+    # magic, version, key size in bytes, number of entries.
+    HEADER = struct.Struct("<4sIII")
+
+    def __init__(self, max_size: int = 1000000):
+        """
+
+        Args:
+            max_size (int): the maximum number of entries. The least recently used entry is evicted to make room
+                for a new one.
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, item):
+        return item in self.entries
+
+    def get(self, key: bytes) -> ProofStatus:
+        """
+        Args:
+            key (bytes): the board_key() of a position.
+
+        Returns:
+            status (ProofStatus): the cached ProofStatus of the position, or None if it is not cached.
+        """
+        status = self.entries.get(key)
+        if status is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return status
+
+    def put(self, key: bytes, status: ProofStatus):
+        """
+        Args:
+            key (bytes): the board_key() of a position.
+            status (ProofStatus): the ProofStatus of the position.
+        """
+        self.entries[key] = status
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def save(self, file: str):
+        """Writes the entries of this EvaluationCache to file.
+
+        Args:
+            file (str): the path of the cache file.
+        """
+        key_size = len(next(iter(self.entries))) if self.entries else 0
+        temp_file = file + ".tmp"
+        with open(temp_file, "wb") as f:
+            f.write(EvaluationCache.HEADER.pack(EvaluationCache.MAGIC, EvaluationCache.VERSION, key_size,
+                                                len(self.entries)))
+            f.write(b"".join(key + bytes((status.value,)) for key, status in self.entries.items()))
+        os.replace(temp_file, file)
+
+    def load(self, file: str):
+        """Adds the entries stored in file, as the most recently used ones.
+
+        Args:
+            file (str): the path of a cache file written by save(). Nothing is loaded if it does not exist.
+
+        Raises:
+            ValueError: if the file is not an evaluation cache file.
+        """
+        if not os.path.exists(file):
+            return
+        with open(file, "rb") as f:
+            data = f.read()
+        magic, version, key_size, num_entries = EvaluationCache.HEADER.unpack_from(data, 0)
+        if magic != EvaluationCache.MAGIC or version != EvaluationCache.VERSION:
+            raise ValueError("not an evaluation cache file:", file)
+
+        record_size = key_size + 1
+        offset = EvaluationCache.HEADER.size
+        for _ in range(num_entries):
+            self.put(key=data[offset:offset + key_size], status=ProofStatus(data[offset + key_size]))
+            offset += record_size
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+
+import gym
+import numpy as np
+
+from connect_four.envs import ConnectFourEnv
+from connect_four.evaluation import ProofStatus
+from connect_four.evaluation.evaluation_cache import EvaluationCache, board_key
+
+
+class TestEvaluationCache(unittest.TestCase):
+    def setUp(self) -> None:
+        ConnectFourEnv.M = 6
+        ConnectFourEnv.N = 7
+        self.env = gym.make('connect_four-v0')
+        self.env.reset()
+
+    def test_board_key(self):
+        key = board_key(state=self.env.state)
+        # 2 players * 6 rows * 7 columns bits.
+        self.assertEqual(11, len(key))
+
+        self.env.step(action=3)
+        moved_key = board_key(state=self.env.state)
+        self.assertNotEqual(key, moved_key)
+        self.assertEqual(moved_key, board_key(state=np.array(self.env.state)))
+
+        self.env.undo()
+        self.assertEqual(key, board_key(state=self.env.state))
+
+    def test_get_put(self):
+        cache = EvaluationCache()
+        self.assertIsNone(cache.get(key=b"a"))
+        cache.put(key=b"a", status=ProofStatus.Proven)
+        self.assertEqual(ProofStatus.Proven, cache.get(key=b"a"))
+        self.assertIn(b"a", cache)
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_evicts_least_recently_used(self):
+        cache = EvaluationCache(max_size=2)
+        cache.put(key=b"a", status=ProofStatus.Proven)
+        cache.put(key=b"b", status=ProofStatus.Disproven)
+        # Using "a" makes "b" the least recently used entry.
+        cache.get(key=b"a")
+        cache.put(key=b"c", status=ProofStatus.Unknown)
+        self.assertEqual(2, len(cache))
+        self.assertIn(b"a", cache)
+        self.assertNotIn(b"b", cache)
+        self.assertIn(b"c", cache)
+
+    def test_save_load(self):
+        cache = EvaluationCache()
+        cache.put(key=b"aa", status=ProofStatus.Proven)
+        cache.put(key=b"bb", status=ProofStatus.Disproven)
+        cache.put(key=b"cc", status=ProofStatus.Unknown)
+        with tempfile.TemporaryDirectory() as directory:
+            file = os.path.join(directory, "cache")
+            cache.save(file=file)
+
+            loaded = EvaluationCache(max_size=2)
+            loaded.load(file=file)
+            # The most recently used entries are kept.
+            self.assertEqual(2, len(loaded))
+            self.assertEqual(ProofStatus.Disproven, loaded.get(key=b"bb"))
+            self.assertEqual(ProofStatus.Unknown, loaded.get(key=b"cc"))
+
+            # A missing file loads nothing.
+            loaded.load(file=os.path.join(directory, "missing"))
+            self.assertEqual(2, len(loaded))
+
+            with open(file, "wb") as f:
+                f.write(b"\0" * EvaluationCache.HEADER.size)
+            with self.assertRaises(ValueError):
+                loaded.load(file=file)
+
+
+if __name__ == '__main__':
+    unittest.main()
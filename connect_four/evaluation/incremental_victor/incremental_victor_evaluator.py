@@ -4,14 +4,14 @@ from connect_four.evaluation.simple_evaluator import SimpleEvaluator
 from connect_four.evaluation.board import Board
 from connect_four.evaluation.incremental_victor.graph.graph_manager import GraphManager
 from connect_four.evaluation.incremental_victor.solution.victor_solution_manager import VictorSolutionManager
-from connect_four.problem import ConnectFourGroupManager
+from connect_four.problem import BitmaskGroupManager
 
 
 class IncrementalVictor(SimpleEvaluator):
 
     def __init__(self, model: ConnectFourEnv):
         super().__init__(model=model)
-        problem_manager = ConnectFourGroupManager(env_variables=self.model.env_variables)
+        problem_manager = BitmaskGroupManager(env_variables=self.model.env_variables, num_to_connect=4)
         solution_manager = VictorSolutionManager(env_variables=self.model.env_variables)
         self.graph_manager = GraphManager(
             player=self.model.env_variables.player_turn,
@@ -39,7 +39,6 @@ class IncrementalVictor(SimpleEvaluator):
             if playable_square is not None:
                 row = playable_square.row + 1
 
-            self.model.render()
             self.graph_manager.move(row=row, col=action)
 
     def undo_move(self):
@@ -16,7 +16,8 @@ class SimpleEvaluator(Evaluator):
             model (TwoPlayerGameEnv): a TwoPlayerGameEnv instance that can be modified.
         """
         self.model = copy.deepcopy(model)
-        self.list_of_env_variables = []
+        # Observations returned by self.model.step() are never used, so don't pay for copying them.
+        self.model.copy_observations = False
         self.reward = TwoPlayerGameEnv.DEFAULT_REWARD
         self.done = False
 
@@ -37,7 +38,6 @@ class SimpleEvaluator(Evaluator):
 
         assert not self.done
 
-        self.list_of_env_variables.append(self.model.env_variables)
         _, self.reward, self.done, _ = self.model.step(action=action)
 
     def _switch_play(self):
@@ -49,8 +49,7 @@ class SimpleEvaluator(Evaluator):
     def undo_move(self):
         self._switch_play()
 
-        env_variables = self.list_of_env_variables.pop()
-        self.model.reset(env_variables=env_variables)
+        self.model.undo()
         self.reward = TwoPlayerGameEnv.DEFAULT_REWARD
         self.done = False
 
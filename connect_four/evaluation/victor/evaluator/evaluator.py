@@ -1,14 +1,14 @@
 """
 Note that in this module, we use the term "Group" and "Problem" interchangeably.
 """
-from typing import Dict, Set, Union, Optional
+from typing import Dict, List, Set, Union, Optional
 
 from connect_four.evaluation.victor.solution.solution1 import find_all_win_conditions
 from connect_four.game import Square
 from connect_four.problem import Group
 from connect_four.evaluation.board import Board
 from connect_four.evaluation.victor.solution import find_all_solutions, Solution
-from connect_four.evaluation.victor.solution import combination
+from connect_four.evaluation.victor.solution.compatibility import CompatibilityMatrix
 from connect_four.evaluation.victor.threat_hunter import Threat, ThreatCombination, ThreatCombinationType
 from connect_four.evaluation.victor.threat_hunter import find_odd_threat, find_threat_combination
 
@@ -25,6 +25,7 @@ def evaluate(board: Board) -> Optional[Set[Solution]]:
     player_groups = board.potential_groups(player=board.player)
     all_solutions, group_to_solutions = find_all_solutions(board=board)
     solved_groups = set(group_to_solutions.keys())
+    matrix = CompatibilityMatrix(solutions=all_solutions)
 
     if board.player == 1:  # Current player is Black.
         win_conditions = find_all_win_conditions(board=board)
@@ -34,20 +35,15 @@ def evaluate(board: Board) -> Optional[Set[Solution]]:
         if not win_conditions:
             return None
 
-        solution_to_solutions = {}
         for win_condition in win_conditions:
             # If there is a single Problem that has no Solution, don't consider this win_condition.
             # Note that we don't combine Problems from different win conditions since win conditions cannot be combined.
             if solved_groups.union(win_condition.groups) != player_groups:
                 continue
-            disallowed_solutions = solutions_disallowed_with_win_condition(
-                solutions=all_solutions,
-                win_condition=win_condition,
-            )
-            chosen_set = find_chosen_set_dynamic_programming(
+            disallowed_solutions = matrix.to_set(bitset=matrix.disallowed_with(solution=win_condition))
+            chosen_set = find_chosen_set_bitset(
                 problem_to_solutions=group_to_solutions,
-                solution_to_solutions=solution_to_solutions,
-                all_solutions=all_solutions,
+                matrix=matrix,
                 problems_to_solve=player_groups - win_condition.groups,
                 disallowed_solutions=disallowed_solutions,
                 used_solutions={win_condition},
@@ -64,10 +60,9 @@ def evaluate(board: Board) -> Optional[Set[Solution]]:
         if solved_groups != player_groups:
             return None
 
-        return find_chosen_set_dynamic_programming(
+        return find_chosen_set_bitset(
             problem_to_solutions=group_to_solutions,
-            solution_to_solutions={},
-            all_solutions=all_solutions,
+            matrix=matrix,
             problems_to_solve=player_groups,
             disallowed_solutions=set(),
             used_solutions=set(),
@@ -97,8 +92,9 @@ def create_node_graph(solutions: Set[Solution]) -> Dict[Union[Group, Solution],
             Every Solution will at least be connected to itself.
     """
     node_graph = {}
+    matrix = CompatibilityMatrix(solutions=solutions)
 
-    for solution in solutions:
+    for solution_id, solution in enumerate(matrix.solutions):
         # Connect solution to all Problems it solves.
         for group in solution.groups:
             if group not in node_graph:
@@ -106,10 +102,7 @@ def create_node_graph(solutions: Set[Solution]) -> Dict[Union[Group, Solution],
             node_graph[group].add(solution)
 
         # Connect all Solutions that cannot work with solution to solution.
-        node_graph[solution] = set()
-        for other in solutions:
-            if not combination.allowed(s1=solution, s2=other):
-                node_graph[solution].add(other)
+        node_graph[solution] = matrix.to_set(bitset=matrix.row(solution_id=solution_id))
     return node_graph
 
 
@@ -159,75 +152,101 @@ def find_chosen_set(
             return chosen_set
 
 
-def find_chosen_set_dynamic_programming(
+def find_chosen_set_bitset(
         problem_to_solutions: Dict[Group, Set[Solution]],
-        solution_to_solutions: Dict[Solution, Set[Solution]],
-        all_solutions: Set[Solution],
+        matrix: CompatibilityMatrix,
         problems_to_solve: Set[Group],
         disallowed_solutions: Set[Solution],
-        used_solutions: Set[Solution]) -> Set[Solution]:
-    # Base Case.
-    if not problems_to_solve:
-        # If there are no problems, return the set of Solutions are currently using.
-        return used_solutions.copy()
-
-    # Recursive Case.
-    most_difficult_problem = problem_with_fewest_solutions(
-        problem_to_solutions=problem_to_solutions,
-        problems_to_solve=problems_to_solve,
-        disallowed_solutions=disallowed_solutions,
-    )
-    usable_solutions = problem_to_solutions[most_difficult_problem].difference(disallowed_solutions)
+        used_solutions: Set[Solution]) -> Optional[Set[Solution]]:
+    """find_chosen_set_bitset finds a set of Solutions that solve all Problems.
 
-    for solution in usable_solutions:
-        if solution not in solution_to_solutions:
-            solution_to_solutions[solution] = find_disallowed_solutions(solution=solution, solutions=all_solutions)
-
-        # Choose.
-        used_solutions.add(solution)
-        # Recurse.
-        chosen_set = find_chosen_set_dynamic_programming(
-            problem_to_solutions=problem_to_solutions,
-            solution_to_solutions=solution_to_solutions,
-            all_solutions=all_solutions,
-            problems_to_solve=problems_to_solve - solution.groups,
-            disallowed_solutions=disallowed_solutions.union(solution_to_solutions[solution]),
-            used_solutions=used_solutions,
-        )
-        # Unchoose.
-        used_solutions.remove(solution)
+    It always branches on the Problem with the fewest usable Solutions.
+    Problems and Solutions are ids and every set is an int bitset.
 
-        if chosen_set is not None:
-            return chosen_set
+    Args:
+        problem_to_solutions (Dict[Group, Set[Solution]]): maps Problems to the Solutions that solve them.
+        matrix (CompatibilityMatrix): a CompatibilityMatrix of every Solution in problem_to_solutions.
+        problems_to_solve (Set[Group]): a set of groups.
+        disallowed_solutions (Set[Solution]): Solutions that cannot be used.
+        used_solutions (Set[Solution]): a set of Solutions that have already been used
+            to solve Problems outside problems_to_solve.
 
+    Raises:
+        ValueError: if a Problem in problems_to_solve is not in problem_to_solutions.
 
-def problem_with_fewest_solutions(
-        problem_to_solutions: Dict[Group, Set[Solution]],
-        problems_to_solve: Set[Group],
-        disallowed_solutions: Set[Solution]) -> Group:
-    # If there's a single Problem in problems_to_solve not in problem_to_solutions, there's an issue.
+    Returns:
+        chosen_set (Set[Solution]): used_solutions and a chosen set of Solutions that solves problems_to_solve,
+            if one exists. None if it doesn't.
+    """
     if not problems_to_solve.issubset(problem_to_solutions.keys()):
         raise ValueError("No problem in problems and node_graph")
 
-    most_difficult_problem = None
-    num_solutions_of_most_difficult = 100000  # Set to an arbitrary high number.
-
-    # Find the Problem in problems_to_solve with the fewest Solutions in problem_to_solutions.
-    for problem in problems_to_solve:
-        num_nodes = len(problem_to_solutions[problem].difference(disallowed_solutions))
-        if num_nodes < num_solutions_of_most_difficult:
-            most_difficult_problem = problem
-            num_solutions_of_most_difficult = num_nodes
+    # problem_solutions[i] is the bitset of the Solutions that solve the i-th Problem, and
+    # solution_problems[j] is the bitset of the Problems that the Solution with id j solves.
+    problem_solutions = []
+    solution_problems = [0] * len(matrix)
+    for problem_id, problem in enumerate(problems_to_solve):
+        solutions = matrix.to_bitset(solutions=problem_to_solutions[problem])
+        problem_solutions.append(solutions)
+        while solutions:
+            lowest = solutions & -solutions
+            solution_problems[lowest.bit_length() - 1] |= 1 << problem_id
+            solutions ^= lowest
+
+    disallowed = matrix.to_bitset(solutions=(s for s in disallowed_solutions if s in matrix.ids))
+    chosen = _find_chosen_set_bitset(
+        problem_solutions=problem_solutions,
+        solution_problems=solution_problems,
+        matrix=matrix,
+        problems=(1 << len(problem_solutions)) - 1,
+        disallowed=disallowed,
+    )
+    if chosen is None:
+        return None
+    return used_solutions.union(matrix.to_set(bitset=chosen))
 
-    return most_difficult_problem
 
+def _find_chosen_set_bitset(
+        problem_solutions: List[int],
+        solution_problems: List[int],
+        matrix: CompatibilityMatrix,
+        problems: int,
+        disallowed: int) -> Optional[int]:
+    # Base Case.
+    if not problems:
+        return 0
 
-def find_disallowed_solutions(solution: Solution, solutions: Set[Solution]) -> Set[Solution]:
-    disallowed_with_solution = set()
-    for other_solution in solutions:
-        if not combination.allowed(s1=solution, s2=other_solution):
-            disallowed_with_solution.add(other_solution)
-    return disallowed_with_solution
+    # Recursive Case.
+    # Find the Problem with the fewest Solutions that are not disallowed.
+    usable_solutions = None
+    num_usable_solutions = len(matrix) + 1
+    remaining = problems
+    while remaining:
+        lowest = remaining & -remaining
+        usable = problem_solutions[lowest.bit_length() - 1] & ~disallowed
+        num_usable = bin(usable).count("1")
+        if num_usable < num_usable_solutions:
+            usable_solutions = usable
+            num_usable_solutions = num_usable
+            if not num_usable:
+                # This Problem can no longer be solved.
+                return None
+        remaining ^= lowest
+
+    while usable_solutions:
+        lowest = usable_solutions & -usable_solutions
+        solution_id = lowest.bit_length() - 1
+        chosen = _find_chosen_set_bitset(
+            problem_solutions=problem_solutions,
+            solution_problems=solution_problems,
+            matrix=matrix,
+            problems=problems & ~solution_problems[solution_id],
+            disallowed=disallowed | matrix.row(solution_id=solution_id),
+        )
+        if chosen is not None:
+            return chosen | lowest
+        usable_solutions ^= lowest
+    return None
 
 
 def node_with_least_number_of_neighbors(
@@ -515,14 +534,6 @@ def _vertical_groups_in_stacked_column(
     return problems_solved
 
 
-def solutions_disallowed_with_win_condition(solutions: Set[Solution], win_condition: Solution) -> Set[Solution]:
-    disallowed_solutions = set()
-    for solution in solutions:
-        if not combination.allowed(s1=solution, s2=win_condition):
-            disallowed_solutions.add(solution)
-    return disallowed_solutions
-
-
 def unusable_solutions_with_guarantor(
         solutions: Set[Solution], guarantor: Union[Threat, ThreatCombination]) -> Set[Solution]:
     unusable_columns = []
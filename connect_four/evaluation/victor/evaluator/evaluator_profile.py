@@ -5,6 +5,7 @@ import cProfile
 
 from connect_four.evaluation.board import Board
 from connect_four.envs.connect_four_env import ConnectFourEnv
+from connect_four.evaluation.victor.evaluator import evaluator
 
 env = gym.make('connect_four-v0')
 ConnectFourEnv.M = 6
@@ -1,11 +1,58 @@
+import random
 import unittest
+from typing import Dict, Optional, Set
 
+import gym
+
+from connect_four.envs import ConnectFourEnv
+from connect_four.evaluation.board import Board
 from connect_four.game import Square
 from connect_four.problem import Group
 from connect_four.evaluation.victor.rules import Claimeven, Vertical
-from connect_four.evaluation.victor.solution import Solution
+from connect_four.evaluation.victor.solution import Solution, find_all_solutions
+from connect_four.evaluation.victor.solution import combination
+from connect_four.evaluation.victor.solution.solution1 import find_all_win_conditions
+from connect_four.evaluation.victor.solution.compatibility import CompatibilityMatrix
 
 from connect_four.evaluation.victor.evaluator.evaluator import create_node_graph
+from connect_four.evaluation.victor.evaluator.evaluator import find_chosen_set_bitset
+
+
+def find_chosen_set_reference(
+        problem_to_solutions: Dict[Group, Set[Solution]],
+        matrix: CompatibilityMatrix,
+        problems_to_solve: Set[Group],
+        disallowed_solutions: Set[Solution],
+        used_solutions: Set[Solution]) -> Optional[Set[Solution]]:
+    """find_chosen_set_reference is the set-based search that find_chosen_set_bitset replaced.
+    It is kept here as the reference the bitset search is checked against.
+    """
+    # Base Case.
+    if not problems_to_solve:
+        return used_solutions.copy()
+
+    # Recursive Case.
+    # Find the Problem in problems_to_solve with the fewest Solutions that are not disallowed.
+    most_difficult_problem = min(
+        problems_to_solve, key=lambda problem: len(problem_to_solutions[problem] - disallowed_solutions))
+    for solution in problem_to_solutions[most_difficult_problem] - disallowed_solutions:
+        # Choose.
+        used_solutions.add(solution)
+        # Recurse.
+        chosen_set = find_chosen_set_reference(
+            problem_to_solutions=problem_to_solutions,
+            matrix=matrix,
+            problems_to_solve=problems_to_solve - solution.groups,
+            disallowed_solutions=disallowed_solutions.union(
+                matrix.to_set(bitset=matrix.row(solution_id=matrix.ids[solution]))),
+            used_solutions=used_solutions,
+        )
+        # Unchoose.
+        used_solutions.remove(solution)
+
+        if chosen_set is not None:
+            return chosen_set
+    return None
 
 
 class TestEvaluator(unittest.TestCase):
@@ -63,6 +110,113 @@ class TestEvaluator(unittest.TestCase):
         got_node_graph = create_node_graph({solution1, solution2, solution3})
         self.assertEqual(want_node_graph, got_node_graph)
 
+    def assert_chosen_set_matches_reference(
+            self,
+            problem_to_solutions: Dict[Group, Set[Solution]],
+            matrix: CompatibilityMatrix,
+            problems_to_solve: Set[Group],
+            disallowed_solutions: Set[Solution],
+            used_solutions: Set[Solution]) -> bool:
+        want_chosen_set = find_chosen_set_reference(
+            problem_to_solutions=problem_to_solutions,
+            matrix=matrix,
+            problems_to_solve=problems_to_solve,
+            disallowed_solutions=disallowed_solutions,
+            used_solutions=set(used_solutions),
+        )
+        got_chosen_set = find_chosen_set_bitset(
+            problem_to_solutions=problem_to_solutions,
+            matrix=matrix,
+            problems_to_solve=problems_to_solve,
+            disallowed_solutions=disallowed_solutions,
+            used_solutions=used_solutions,
+        )
+        self.assertEqual(want_chosen_set is None, got_chosen_set is None)
+        if got_chosen_set is None:
+            return False
+
+        # The chosen set keeps used_solutions, solves every problem, avoids disallowed_solutions,
+        # and its Solutions can all be combined.
+        self.assertTrue(used_solutions.issubset(got_chosen_set))
+        self.assertFalse(disallowed_solutions.intersection(got_chosen_set - used_solutions))
+        solved_problems = set()
+        for solution in got_chosen_set:
+            solved_problems.update(solution.groups)
+            for other in got_chosen_set:
+                if other is not solution:
+                    self.assertTrue(combination.allowed(s1=solution, s2=other))
+        self.assertTrue(problems_to_solve.issubset(solved_problems))
+        return True
+
+    def test_find_chosen_set_bitset_matches_reference(self):
+        ConnectFourEnv.M = 4
+        ConnectFourEnv.N = 5
+        self.addCleanup(setattr, ConnectFourEnv, "M", 6)
+        self.addCleanup(setattr, ConnectFourEnv, "N", 7)
+        env = gym.make('connect_four-v0')
+        rng = random.Random(0)
+        num_found = 0
+        for _ in range(30):
+            env.reset()
+            done = False
+            for _ in range(rng.randrange(0, 8)):
+                _, _, done, _ = env.step(action=rng.choice(env.actions()))
+                if done:
+                    break
+            if done:
+                continue
+
+            board = Board(env.env_variables)
+            all_solutions, group_to_solutions = find_all_solutions(board=board)
+            if self.assert_chosen_set_matches_reference(
+                    problem_to_solutions=group_to_solutions,
+                    matrix=CompatibilityMatrix(solutions=all_solutions),
+                    problems_to_solve=set(group_to_solutions.keys()),
+                    disallowed_solutions=set(),
+                    used_solutions=set()):
+                num_found += 1
+        self.assertGreater(num_found, 0)
+
+    def test_find_chosen_set_bitset_matches_reference_with_win_condition(self):
+        # Black is to move, so every search is the one evaluate() runs for a win condition of White:
+        # the win condition is used and every Solution it cannot be combined with is disallowed.
+        ConnectFourEnv.M = 6
+        ConnectFourEnv.N = 4
+        self.addCleanup(setattr, ConnectFourEnv, "N", 7)
+        env = gym.make('connect_four-v0')
+        rng = random.Random(0)
+        num_searches = 0
+        num_found = 0
+        for _ in range(200):
+            env.reset()
+            done = False
+            for _ in range(2 * rng.randrange(0, 7) + 1):
+                _, _, done, _ = env.step(action=rng.choice(env.actions()))
+                if done:
+                    break
+            if done:
+                continue
+
+            board = Board(env.env_variables)
+            self.assertEqual(1, board.player)
+            player_groups = board.potential_groups(player=board.player)
+            all_solutions, group_to_solutions = find_all_solutions(board=board)
+            matrix = CompatibilityMatrix(solutions=all_solutions)
+            for win_condition in find_all_win_conditions(board=board):
+                if set(group_to_solutions.keys()).union(win_condition.groups) != player_groups:
+                    continue
+                disallowed_solutions = matrix.to_set(bitset=matrix.disallowed_with(solution=win_condition))
+                num_searches += 1
+                if self.assert_chosen_set_matches_reference(
+                        problem_to_solutions=group_to_solutions,
+                        matrix=matrix,
+                        problems_to_solve=player_groups - win_condition.groups,
+                        disallowed_solutions=disallowed_solutions,
+                        used_solutions={win_condition}):
+                    num_found += 1
+        self.assertGreater(num_searches, num_found)
+        self.assertGreater(num_found, 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,240 @@
+from typing import Iterable, List, Set
+
+from connect_four.evaluation.victor.rules import Claimeven, Baseinverse, Vertical, Aftereven, Baseclaim, Before, \
+    Specialbefore, Lowinverse, Highinverse, Oddthreat, ThreatCombination
+from connect_four.evaluation.victor.solution import Solution
+from connect_four.game import Square
+
+# Rules in the order combination.allowed() checks them. A pair of Solutions is decided by the rule of the Solution
+# that comes first in this order.
+ODD_THREAT, CLAIMEVEN, BASEINVERSE, VERTICAL, AFTEREVEN, LOWINVERSE, HIGHINVERSE, BASECLAIM, BEFORE, SPECIALBEFORE = \
+    range(10)
+RULE_ORDER = [
+    ((Oddthreat, ThreatCombination), ODD_THREAT),
+    (Claimeven, CLAIMEVEN),
+    (Baseinverse, BASEINVERSE),
+    (Vertical, VERTICAL),
+    (Aftereven, AFTEREVEN),
+    (Lowinverse, LOWINVERSE),
+    (Highinverse, HIGHINVERSE),
+    (Baseclaim, BASECLAIM),
+    (Before, BEFORE),
+    (Specialbefore, SPECIALBEFORE),
+]
+
+# Squares are bits of an int: the bit of Square(row, col) is col * MAX_ROWS + row, so the squares of a column are
+# MAX_ROWS consecutive bits.
+MAX_ROWS = 16
+COLUMN_MASK = (1 << MAX_ROWS) - 1
+
+
+def square_bit(square: Square) -> int:
+    """
+    Args:
+        square (Square): a Square with a row below MAX_ROWS.
+
+    Returns:
+        bit (int): an int with only the bit of square set.
+    """
+    if not 0 <= square.row < MAX_ROWS:
+        raise ValueError("square.row must be in [0, MAX_ROWS):", square)
+    return 1 << (square.col * MAX_ROWS + square.row)
+
+
+class SolutionBits:
+    """The parts of a Solution that decide whether it can be combined with another Solution, as ints."""
+
+    def __init__(self, solution: Solution):
+        rule_instance = solution.rule_instance
+        for rule_classes, rank in RULE_ORDER:
+            if isinstance(rule_instance, rule_classes):
+                self.rank = rank
+                break
+        else:
+            raise ValueError("Unacceptable Rule type:", rule_instance)
+
+        self.squares = 0
+        self.columns = 0
+        for square in solution.squares:
+            self.squares |= square_bit(square=square)
+            self.columns |= 1 << square.col
+
+        # The squares at or above the bottom square of every Claimeven, in the same column.
+        # An Inverse cannot use any of them.
+        self.at_or_above_claimeven_bottoms = 0
+        for square in solution.claimeven_bottom_squares:
+            self.at_or_above_claimeven_bottoms |= (square_bit(square=square) << 1) - (1 << (square.col * MAX_ROWS))
+
+        # Solutions that only Black can use.
+        self.black_only = False
+        if isinstance(rule_instance, (Aftereven, Before)):
+            self.black_only = rule_instance.group.player == 1
+        elif isinstance(rule_instance, Specialbefore):
+            self.black_only = rule_instance.before.group.player == 1
+
+        # The squares of the Baseinverse inside a Specialbefore.
+        self.specialbefore_baseinverse = 0
+        if isinstance(rule_instance, Specialbefore):
+            self.specialbefore_baseinverse = (square_bit(square=rule_instance.internal_directly_playable_square) |
+                                              square_bit(square=rule_instance.external_directly_playable_square))
+
+
+def allowed(s1: SolutionBits, s2: SolutionBits) -> bool:
+    """Returns True if the two Solutions can be combined; Otherwise, False.
+
+    Gives the same result as combination.allowed() for the Solutions of s1 and s2.
+
+    Args:
+        s1 (SolutionBits): the SolutionBits of a Solution.
+        s2 (SolutionBits): the SolutionBits of a Solution.
+
+    Returns:
+        combination_allowed (bool): True if the two Solutions can be combined; Otherwise, False.
+    """
+    if s2.rank < s1.rank:
+        solution, other = s2, s1
+    else:
+        solution, other = s1, s2
+    rank, other_rank = solution.rank, other.rank
+
+    if rank == ODD_THREAT:
+        return other_rank != ODD_THREAT and not (solution.columns & other.columns) and not other.black_only
+    if rank == CLAIMEVEN:
+        if other_rank in (LOWINVERSE, HIGHINVERSE):
+            return not (other.squares & solution.at_or_above_claimeven_bottoms)
+        return not (solution.squares & other.squares)
+    if rank in (BASEINVERSE, VERTICAL, BASECLAIM):
+        return not (solution.squares & other.squares)
+    if rank == AFTEREVEN:
+        if other_rank in (LOWINVERSE, HIGHINVERSE):
+            return not (solution.squares & other.squares or other.squares & solution.at_or_above_claimeven_bottoms)
+        if other_rank == BASECLAIM:
+            return not (solution.squares & other.squares)
+        return column_wise_disjoint_or_equal(solution=solution, other=other)
+    if rank == LOWINVERSE:
+        if other_rank in (LOWINVERSE, HIGHINVERSE):
+            return not (solution.squares & other.squares)
+        if other_rank == BASECLAIM:
+            return not (solution.squares & other.squares or solution.squares & other.at_or_above_claimeven_bottoms)
+        return (not (solution.squares & other.at_or_above_claimeven_bottoms) and
+                column_wise_disjoint_or_equal(solution=solution, other=other))
+    if rank == HIGHINVERSE:
+        if other_rank == HIGHINVERSE:
+            return not (solution.squares & other.squares)
+        return not (solution.squares & other.squares or solution.squares & other.at_or_above_claimeven_bottoms)
+    if rank == BEFORE:
+        return column_wise_disjoint_or_equal(solution=solution, other=other)
+    # rank == SPECIALBEFORE, so other is a Specialbefore too.
+    if solution.specialbefore_baseinverse & other.squares:
+        return False
+    return column_wise_disjoint_or_equal(solution=solution, other=other)
+
+
+def column_wise_disjoint_or_equal(solution: SolutionBits, other: SolutionBits) -> bool:
+    """Returns False if the two Solutions share a square in a column, but have different squares in that column."""
+    shared = solution.squares & other.squares
+    if not shared:
+        return True
+    different = solution.squares ^ other.squares
+    columns = solution.columns & other.columns
+    col = 0
+    while columns:
+        if columns & 1:
+            column_mask = COLUMN_MASK << (col * MAX_ROWS)
+            if shared & column_mask and different & column_mask:
+                return False
+        columns >>= 1
+        col += 1
+    return True
+
+
+class CompatibilityMatrix:
+    """Assigns dense ids to Solutions and records which pairs cannot be combined as int bitsets.
+
+    Bit j of the row of the Solution with id i is set if combination.allowed(s1=solutions[i], s2=solutions[j]) is
+    False. Rows are computed the first time they are needed.
+    """
+
+    def __init__(self, solutions: Iterable[Solution]):
+        """
+
+        Args:
+            solutions (Iterable[Solution]): the Solutions to give ids to.
+        """
+        self.solutions: List[Solution] = list(solutions)
+        self.ids = {solution: i for i, solution in enumerate(self.solutions)}
+        self.bits = [SolutionBits(solution=solution) for solution in self.solutions]
+        self.rows = [None] * len(self.solutions)
+
+    def __len__(self):
+        return len(self.solutions)
+
+    def row(self, solution_id: int) -> int:
+        """
+        Args:
+            solution_id (int): the id of a Solution.
+
+        Returns:
+            row (int): the bitset of the ids of every Solution that cannot be combined with the Solution.
+        """
+        row = self.rows[solution_id]
+        if row is None:
+            row = self._disallowed_with(solution_bits=self.bits[solution_id])
+            self.rows[solution_id] = row
+        return row
+
+    def disallowed_with(self, solution: Solution) -> int:
+        """
+        Args:
+            solution (Solution): a Solution, which need not have an id.
+
+        Returns:
+            disallowed (int): the bitset of the ids of every Solution s for which
+                combination.allowed(s1=s, s2=solution) is False.
+        """
+        if solution in self.ids:
+            solution_id = self.ids[solution]
+            # Only a pair of Specialbefores depends on the order of s1 and s2.
+            if self.bits[solution_id].rank != SPECIALBEFORE:
+                return self.row(solution_id=solution_id)
+        solution_bits = SolutionBits(solution=solution)
+        disallowed = 0
+        for i, other_bits in enumerate(self.bits):
+            if not allowed(s1=other_bits, s2=solution_bits):
+                disallowed |= 1 << i
+        return disallowed
+
+    def _disallowed_with(self, solution_bits: SolutionBits) -> int:
+        disallowed = 0
+        for i, other_bits in enumerate(self.bits):
+            if not allowed(s1=solution_bits, s2=other_bits):
+                disallowed |= 1 << i
+        return disallowed
+
+    def to_bitset(self, solutions: Iterable[Solution]) -> int:
+        """
+        Args:
+            solutions (Iterable[Solution]): Solutions with ids.
+
+        Returns:
+            bitset (int): the bitset of the ids of solutions.
+        """
+        bitset = 0
+        for solution in solutions:
+            bitset |= 1 << self.ids[solution]
+        return bitset
+
+    def to_set(self, bitset: int) -> Set[Solution]:
+        """
+        Args:
+            bitset (int): a bitset of ids.
+
+        Returns:
+            solutions (Set[Solution]): the Solutions with the ids in bitset.
+        """
+        solutions = set()
+        while bitset:
+            lowest = bitset & -bitset
+            solutions.add(self.solutions[lowest.bit_length() - 1])
+            bitset ^= lowest
+        return solutions
@@ -0,0 +1,73 @@
+import random
+import unittest
+
+import gym
+
+from connect_four.envs import ConnectFourEnv
+from connect_four.evaluation.board import Board
+from connect_four.evaluation.victor.rules import Claimeven
+from connect_four.evaluation.victor.solution import Solution, find_all_solutions
+from connect_four.evaluation.victor.solution import combination
+from connect_four.evaluation.victor.solution.compatibility import CompatibilityMatrix
+from connect_four.evaluation.victor.solution.solution1 import find_all_win_conditions
+from connect_four.game import Square
+
+
+class TestCompatibilityMatrix(unittest.TestCase):
+    def setUp(self) -> None:
+        ConnectFourEnv.M = 6
+        ConnectFourEnv.N = 7
+        self.env = gym.make('connect_four-v0')
+        self.env.reset()
+
+    def assert_matches_combination(self, board: Board):
+        solutions, _ = find_all_solutions(board=board)
+        matrix = CompatibilityMatrix(solutions=solutions)
+        for i, solution in enumerate(matrix.solutions):
+            row = matrix.row(solution_id=i)
+            for j, other in enumerate(matrix.solutions):
+                self.assertEqual(not combination.allowed(s1=solution, s2=other), bool(row >> j & 1))
+
+        if board.player == 1:
+            for win_condition in find_all_win_conditions(board=board):
+                disallowed = matrix.to_set(bitset=matrix.disallowed_with(solution=win_condition))
+                want = {s for s in matrix.solutions if not combination.allowed(s1=s, s2=win_condition)}
+                self.assertEqual(want, disallowed)
+
+    def test_matches_combination_initial_state(self):
+        self.assert_matches_combination(board=Board(self.env.env_variables))
+
+    def test_matches_combination_random_boards(self):
+        rng = random.Random(0)
+        num_boards = 0
+        while num_boards < 5:
+            self.env.reset()
+            done = False
+            for _ in range(rng.randrange(4, 16)):
+                _, _, done, _ = self.env.step(action=rng.choice(self.env.actions()))
+                if done:
+                    break
+            if not done:
+                self.assert_matches_combination(board=Board(self.env.env_variables))
+                num_boards += 1
+
+    def test_bitsets(self):
+        claimeven_e = Solution(
+            squares=[Square(row=5, col=4), Square(row=4, col=4)],
+            rule_instance=Claimeven(upper=Square(row=4, col=4), lower=Square(row=5, col=4)),
+        )
+        claimeven_e_upper = Solution(
+            squares=[Square(row=3, col=4), Square(row=2, col=4)],
+            rule_instance=Claimeven(upper=Square(row=2, col=4), lower=Square(row=3, col=4)),
+        )
+        matrix = CompatibilityMatrix(solutions=[claimeven_e, claimeven_e_upper])
+        self.assertEqual(2, len(matrix))
+        self.assertEqual({claimeven_e, claimeven_e_upper}, matrix.to_set(bitset=0b11))
+        self.assertEqual(0b10, matrix.to_bitset(solutions=[claimeven_e_upper]))
+        # Each Claimeven can only not be combined with itself.
+        self.assertEqual(0b01, matrix.row(solution_id=0))
+        self.assertEqual(0b10, matrix.row(solution_id=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 from connect_four.evaluation.board import Board
 from connect_four.evaluation.depth_1_evaluator import Depth1Evaluator
+from connect_four.evaluation.evaluation_cache import EvaluationCache, board_key
 from connect_four.evaluation.victor.evaluator import evaluator
 from connect_four.envs import ConnectFourEnv
 from connect_four.evaluation import ProofStatus, NodeType
@@ -8,14 +9,32 @@ from connect_four.evaluation.simple_evaluator import SimpleEvaluator
 
 class Victor(Depth1Evaluator):
 
-    def __init__(self, model: ConnectFourEnv):
+    def __init__(self, model: ConnectFourEnv, cache: EvaluationCache = None):
+        """
+
+        Args:
+            model (ConnectFourEnv): a ConnectFourEnv instance that can be modified.
+            cache (EvaluationCache): if given, the results of the rule search are looked up in and stored to cache.
+                It can be shared with other Victor instances.
+        """
         super().__init__(model=model)
+        self.cache = cache
 
     def evaluate(self) -> ProofStatus:
         proof_status = super().evaluate()
         if proof_status != ProofStatus.Unknown:
             return proof_status
 
+        if self.cache is None:
+            return self._evaluate()
+        key = board_key(state=self.model.state)
+        proof_status = self.cache.get(key=key)
+        if proof_status is None:
+            proof_status = self._evaluate()
+            self.cache.put(key=key, status=proof_status)
+        return proof_status
+
+    def _evaluate(self) -> ProofStatus:
         board = Board(env_variables=self.model.env_variables)
         evaluation = evaluator.evaluate(board=board)
         if evaluation is not None:
@@ -4,7 +4,7 @@ import unittest
 import numpy as np
 
 from connect_four.envs import ConnectFourEnv
-from connect_four.evaluation import ProofStatus
+from connect_four.evaluation import ProofStatus, EvaluationCache
 from connect_four.evaluation.victor.victor_evaluator import Victor
 
 
@@ -79,6 +79,45 @@ class TestVictor(unittest.TestCase):
         got_status = self.evaluator.evaluate()
         self.assertEqual(ProofStatus.Proven, got_status)
 
+    def test_evaluate_shares_cache(self):
+        cache = EvaluationCache()
+        self.evaluator = Victor(model=self.env, cache=cache)
+        self.evaluator.move(action=3)
+        self.assertEqual(ProofStatus.Unknown, self.evaluator.evaluate())
+        self.assertEqual((0, 1), (cache.hits, cache.misses))
+
+        # Another Victor sharing the cache reaches the same position through a different evaluator.
+        other = Victor(model=self.env, cache=cache)
+        other.move(action=3)
+        self.assertEqual(ProofStatus.Unknown, other.evaluate())
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_evaluate_with_cache_diagram_6_1(self):
+        # The cached result of Diagram 6.1 is the same as the evaluated one.
+        self.env.state = np.array([
+            [
+                [0, 0, 0, 1, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 1, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 1, 0, 0, 0, ],
+                [0, 0, 1, 0, 0, 0, 0, ],
+            ],
+            [
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 1, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 1, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 1, 1, 0, 0, ],
+            ],
+        ])
+        cache = EvaluationCache()
+        self.evaluator = Victor(model=self.env, cache=cache)
+        self.assertEqual(ProofStatus.Disproven, self.evaluator.evaluate())
+        self.assertEqual(ProofStatus.Disproven, self.evaluator.evaluate())
+        self.assertEqual(1, cache.hits)
+
 
 if __name__ == '__main__':
     unittest.main()
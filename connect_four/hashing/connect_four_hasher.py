@@ -6,11 +6,39 @@ from connect_four.hashing.square_type_manager import SquareTypeManager
 
 
 class ConnectFourHasher(Hasher):
-    def __init__(self, env: ConnectFourEnv):
+    def __init__(self, env: ConnectFourEnv, canonical: bool = False):
+        """
+
+        Args:
+            env (ConnectFourEnv): the environment whose current state this hasher starts at.
+            canonical (bool): if True, hash_key() returns the same key for a position and its left-right mirror image.
+                The Zobrist hash of the mirrored position is maintained alongside the hash of the position.
+        """
         self.stm = SquareTypeManager(env_variables=env.env_variables, num_to_connect=3)
         self.lowest_empty_row_by_col = self._find_lowest_empty_squares(state=env.env_variables.state)
         self.columns_played_by_move = []
 
+        num_rows, num_cols = self.stm.num_rows, self.stm.num_cols
+        if canonical:
+            self.zobrist_tables = hasher_hash_utils.get_symmetric_zobrist_tables(
+                num_rows=num_rows,
+                num_cols=num_cols,
+                rotations=False,
+            )
+        else:
+            self.zobrist_tables = [hasher_hash_utils.get_zobrist_table(num_rows=num_rows, num_cols=num_cols)]
+        # column_permutations[i][col] is where col is moved by the symmetry hashed with zobrist_tables[i].
+        self.column_permutations = [
+            square_permutation[:num_cols]
+            for square_permutation in hasher_hash_utils.get_square_permutations(zobrist_tables=self.zobrist_tables)
+        ]
+        # keys[i] is the Zobrist hash of the current state using zobrist_tables[i].
+        self.keys = [
+            hasher_hash_utils.get_zobrist_hash(square_types=self.stm.square_types, zobrist_table=zobrist_table)
+            for zobrist_table in self.zobrist_tables
+        ]
+        self.keys_by_move = []
+
     @staticmethod
     def _find_lowest_empty_squares(state):
         lowest_empty_squares = []
@@ -43,6 +71,18 @@ class ConnectFourHasher(Hasher):
         self.lowest_empty_row_by_col[col] -= 1
         self.columns_played_by_move.append(col)
 
+        # Update the keys for every square whose SquareType changed.
+        self.keys_by_move.append(self.keys)
+        changes = self.stm.last_move_changes()
+        self.keys = [
+            hasher_hash_utils.update_zobrist_hash(
+                key=key,
+                square_types=self.stm.square_types,
+                changes=changes,
+                zobrist_table=zobrist_table,
+            ) for key, zobrist_table in zip(self.keys, self.zobrist_tables)
+        ]
+
     def undo_move(self):
         """
         Assumptions:
@@ -52,6 +92,7 @@ class ConnectFourHasher(Hasher):
         self.lowest_empty_row_by_col[last_played_column] += 1
 
         self.stm.undo_move()
+        self.keys = self.keys_by_move.pop()
 
     def hash(self) -> str:
         """
@@ -61,6 +102,7 @@ class ConnectFourHasher(Hasher):
         """
         transposition_arr = np.flipud(m=hasher_hash_utils.convert_square_types_to_transposition_arr(
             square_types=self.stm.square_types,
+            num_cols=self.stm.num_cols,
         ))
         transposition = hasher_hash_utils.get_transposition(transposition_arr=transposition_arr)
         flipped = np.fliplr(m=transposition_arr)
@@ -69,3 +111,63 @@ class ConnectFourHasher(Hasher):
             transposition = flipped_transposition
 
         return transposition
+
+    def hash_key(self) -> int:
+        """
+        Returns:
+            key (int): a 64-bit Zobrist hash of the SquareTypes of the current state.
+                If this hasher is canonical, it is the smaller of the hashes of the current state and its mirror image.
+                Otherwise, unlike hash(), mirrored positions have different keys.
+        """
+        return min(self.keys)
+
+    @staticmethod
+    def key_from_hash(transposition: str, num_rows: int, num_cols: int) -> int:
+        """Converts a hash() into the hash_key() of a canonical ConnectFourHasher at the same state.
+
+        Used to migrate TranspositionTables keyed by hash(), such as connect_four.db, to hash_key().
+
+        Args:
+            transposition (str): the hash() of a state.
+            num_rows (int): the number of rows in the board.
+            num_cols (int): the number of columns in the board.
+
+        Returns:
+            key (int): the hash_key() of a ConnectFourHasher with canonical=True at the state.
+        """
+        # hash() flips the board upside down, so its first row is the bottom row.
+        square_types = bytearray(num_rows * num_cols)
+        for index, char in enumerate(transposition):
+            row, col = divmod(index, num_cols)
+            square_types[(num_rows - 1 - row) * num_cols + col] = hasher_hash_utils.SQUARE_VALUES_BY_CHAR[char]
+        # hash() may be of the mirror image, which has the same canonical key.
+        return min(
+            hasher_hash_utils.get_zobrist_hash(square_types=square_types, zobrist_table=zobrist_table)
+            for zobrist_table in hasher_hash_utils.get_symmetric_zobrist_tables(
+                num_rows=num_rows,
+                num_cols=num_cols,
+                rotations=False,
+            )
+        )
+
+    def canonical_action(self, action: int) -> int:
+        """
+        Args:
+            action (int): an action in the current state.
+
+        Returns:
+            canonical_action (int): the same action in the mirror image of the current state whose hash is
+                hash_key().
+        """
+        return self.column_permutations[self.keys.index(min(self.keys))][action]
+
+    def action_from_canonical(self, canonical_action: int) -> int:
+        """The inverse of canonical_action().
+
+        Args:
+            canonical_action (int): an action in the mirror image of the current state whose hash is hash_key().
+
+        Returns:
+            action (int): the same action in the current state.
+        """
+        return self.column_permutations[self.keys.index(min(self.keys))].index(canonical_action)
@@ -97,6 +97,87 @@ class TestConnectFourHasher(unittest.TestCase):
         transposition_of_flipped = self.hasher.hash()
         self.assertEqual(transposition_of_original, transposition_of_flipped)
 
+    def test_hash_key_move_undo_move(self):
+        initial_key = self.hasher.hash_key()
+        self.hasher.move(action=3)
+        self.assertNotEqual(initial_key, self.hasher.hash_key())
+        self.hasher.undo_move()
+        self.assertEqual(initial_key, self.hasher.hash_key())
+
+    def test_hash_key_matches_new_hasher(self):
+        # The incrementally maintained key should equal the key of a hasher created at the same position.
+        for action in [3, 3, 2, 4, 4, 2, 0, 6, 6, 5]:
+            self.hasher.move(action=action)
+            self.env.step(action=action)
+            self.assertEqual(ConnectFourHasher(env=self.env).hash_key(), self.hasher.hash_key())
+
+    def test_hash_key_different_positions(self):
+        self.hasher.move(action=0)
+        key_0 = self.hasher.hash_key()
+        self.hasher.undo_move()
+        self.hasher.move(action=1)
+        key_1 = self.hasher.hash_key()
+        self.assertNotEqual(key_0, key_1)
+        self.assertLess(key_0, 1 << 64)
+
+    def test_hash_key_canonical_mirrored_moves(self):
+        hasher = ConnectFourHasher(env=self.env, canonical=True)
+        mirrored_hasher = ConnectFourHasher(env=self.env, canonical=True)
+        for action in [3, 2, 2, 1, 0, 6, 5]:
+            self.hasher.move(action=action)
+            hasher.move(action=action)
+            mirrored_hasher.move(action=ConnectFourEnv.N - 1 - action)
+            self.assertEqual(hasher.hash_key(), mirrored_hasher.hash_key())
+            # The canonical key is the smaller of the two keys.
+            self.assertLessEqual(hasher.hash_key(), self.hasher.hash_key())
+        for _ in range(7):
+            hasher.undo_move()
+            mirrored_hasher.undo_move()
+        self.assertEqual(ConnectFourHasher(env=self.env, canonical=True).hash_key(), hasher.hash_key())
+
+    def test_hash_key_canonical_asymmetric_positions(self):
+        hasher = ConnectFourHasher(env=self.env, canonical=True)
+        hasher.move(action=0)
+        key_0 = hasher.hash_key()
+        hasher.undo_move()
+        hasher.move(action=1)
+        self.assertNotEqual(key_0, hasher.hash_key())
+        hasher.undo_move()
+        hasher.move(action=6)
+        self.assertEqual(key_0, hasher.hash_key())
+
+    def test_key_from_hash(self):
+        hasher = ConnectFourHasher(env=self.env, canonical=True)
+        mirrored_hasher = ConnectFourHasher(env=self.env, canonical=True)
+        for action in [3, 2, 2, 1, 0, 0, 4, 5, 5, 6]:
+            hasher.move(action=action)
+            mirrored_hasher.move(action=ConnectFourEnv.N - 1 - action)
+            self.assertEqual(hasher.hash_key(), ConnectFourHasher.key_from_hash(
+                transposition=hasher.hash(),
+                num_rows=ConnectFourEnv.M,
+                num_cols=ConnectFourEnv.N,
+            ))
+            self.assertEqual(hasher.hash_key(), ConnectFourHasher.key_from_hash(
+                transposition=mirrored_hasher.hash(),
+                num_rows=ConnectFourEnv.M,
+                num_cols=ConnectFourEnv.N,
+            ))
+
+    def test_canonical_action(self):
+        hasher = ConnectFourHasher(env=self.env, canonical=True)
+        mirrored_hasher = ConnectFourHasher(env=self.env, canonical=True)
+        for action in [3, 2, 2, 1]:
+            hasher.move(action=action)
+            mirrored_hasher.move(action=ConnectFourEnv.N - 1 - action)
+
+        for action in range(ConnectFourEnv.N):
+            canonical_action = hasher.canonical_action(action=action)
+            self.assertEqual(action, hasher.action_from_canonical(canonical_action=canonical_action))
+            # The canonical action is the same in the mirror image, but refers to the mirrored column.
+            mirrored_action = mirrored_hasher.action_from_canonical(canonical_action=canonical_action)
+            self.assertEqual(ConnectFourEnv.N - 1 - action, mirrored_action)
+            self.assertEqual(canonical_action, mirrored_hasher.canonical_action(action=mirrored_action))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -14,3 +14,35 @@ class Hasher(ABC):
     @abstractmethod
     def hash(self) -> str:
         pass
+
+    @abstractmethod
+    def hash_key(self) -> int:
+        """
+        Returns:
+            key (int): a 64-bit Zobrist hash of the current state. It is maintained incrementally by move() and
+                undo_move(), so it is much cheaper than hash().
+        """
+        pass
+
+    def canonical_action(self, action: int) -> int:
+        """
+        Args:
+            action (int): an action in the current state.
+
+        Returns:
+            canonical_action (int): the same action in the rotation or reflection of the current state whose hash is
+                hash_key(). Hashers that do not combine symmetric states return action.
+        """
+        return action
+
+    def action_from_canonical(self, canonical_action: int) -> int:
+        """The inverse of canonical_action().
+
+        Args:
+            canonical_action (int): an action in the rotation or reflection of the current state whose hash is
+                hash_key().
+
+        Returns:
+            action (int): the same action in the current state.
+        """
+        return canonical_action
@@ -1,3 +1,6 @@
+import functools
+import random
+
 import numpy as np
 
 from connect_four.hashing.square_type_manager import SquareType
@@ -12,15 +15,131 @@ SQUARE_TYPE_TO_SQUARE_CHAR = {
 }
 
 
-def convert_square_types_to_transposition_arr(square_types: List[List[SquareType]]):
-    transposition_arr = []
-    for row in range(len(square_types)):
-        cols = []
-        for col in range(len(square_types[0])):
-            cols.append(SQUARE_TYPE_TO_SQUARE_CHAR[square_types[row][col]])
-        transposition_arr.append(cols)
-    return np.array(transposition_arr)
+# SQUARE_CHARS[square_type.value] == SQUARE_TYPE_TO_SQUARE_CHAR[square_type]
+SQUARE_CHARS = [SQUARE_TYPE_TO_SQUARE_CHAR[SquareType(value)] for value in range(len(SquareType))]
+# The inverse of SQUARE_CHARS.
+SQUARE_VALUES_BY_CHAR = {char: value for value, char in enumerate(SQUARE_CHARS)}
+
+
+def convert_square_types_to_transposition_arr(square_types: bytearray, num_cols: int):
+    """
+    Args:
+        square_types (bytearray): SquareType values of a board, indexed by row * num_cols + col.
+            See SquareTypeManager.square_types.
+        num_cols (int): the number of columns in the board.
+
+    Returns:
+        transposition_arr (np.ndarray): a 2D array of square chars.
+    """
+    transposition_arr = np.array([SQUARE_CHARS[value] for value in square_types])
+    return transposition_arr.reshape(len(square_types) // num_cols, num_cols)
 
 
 def get_transposition(transposition_arr):
     return ''.join(transposition_arr.flatten())
+
+
+# Zobrist keys must be the same in every process so that keys saved in a persistent TranspositionTable stay valid.
+ZOBRIST_SEED = 20200704
+
+
+@functools.lru_cache(maxsize=None)
+def get_zobrist_table(num_rows: int, num_cols: int) -> List[List[int]]:
+    """Returns the table of random 64-bit keys used to compute Zobrist hashes of boards with the given dimensions.
+
+    Args:
+        num_rows (int): the number of rows in the board.
+        num_cols (int): the number of columns in the board.
+
+    Returns:
+        zobrist_table (List[List[int]]): zobrist_table[row * num_cols + col][square_type.value] is the key of a square
+            of that SquareType at (row, col). The key of SquareType.Empty is always 0.
+    """
+    rng = random.Random(ZOBRIST_SEED)
+    zobrist_table = []
+    for _ in range(num_rows * num_cols):
+        keys = [0] * len(SquareType)
+        for square_type in SquareType:
+            if square_type != SquareType.Empty:
+                keys[square_type.value] = rng.getrandbits(64)
+        zobrist_table.append(keys)
+    return zobrist_table
+
+
+@functools.lru_cache(maxsize=None)
+def get_symmetric_zobrist_tables(num_rows: int, num_cols: int, rotations: bool) -> List[List[List[int]]]:
+    """Returns one Zobrist table per symmetry of the board.
+
+    Hashing a board with every table in the list and taking the minimum gives the same key for every position
+    that is a mirror image (or rotation) of another.
+
+    Args:
+        num_rows (int): the number of rows in the board.
+        num_cols (int): the number of columns in the board.
+        rotations (bool): if False, only the identity and the left-right mirror are included.
+            If True, all 8 rotations and reflections of a square board are included.
+
+    Returns:
+        zobrist_tables (List[List[List[int]]]): the first table is get_zobrist_table(num_rows, num_cols).
+    """
+    zobrist_table = np.empty(shape=num_rows * num_cols, dtype=object)
+    for index, keys in enumerate(get_zobrist_table(num_rows=num_rows, num_cols=num_cols)):
+        zobrist_table[index] = keys
+    zobrist_table = zobrist_table.reshape(num_rows, num_cols)
+
+    if rotations:
+        tables = [np.rot90(m=zobrist_table, k=k) for k in range(4)]
+        tables += [np.rot90(m=np.fliplr(m=zobrist_table), k=k) for k in range(4)]
+    else:
+        tables = [zobrist_table, np.fliplr(m=zobrist_table)]
+    return [table.ravel().tolist() for table in tables]
+
+
+def get_square_permutations(zobrist_tables: List[List[List[int]]]) -> List[List[int]]:
+    """Returns how each table from get_symmetric_zobrist_tables() moves the squares of a board.
+
+    Hashing a board with zobrist_tables[i] gives the same key as hashing the board with zobrist_tables[0] after
+    moving the square at index to permutations[i][index].
+
+    Args:
+        zobrist_tables (List[List[List[int]]]): tables from get_symmetric_zobrist_tables().
+
+    Returns:
+        permutations (List[List[int]]): one permutation of square indices per table.
+    """
+    index_by_keys = {tuple(keys): index for index, keys in enumerate(zobrist_tables[0])}
+    return [[index_by_keys[tuple(keys)] for keys in zobrist_table] for zobrist_table in zobrist_tables]
+
+
+def get_zobrist_hash(square_types: bytearray, zobrist_table: List[List[int]]) -> int:
+    """
+    Args:
+        square_types (bytearray): SquareType values of a board. See SquareTypeManager.square_types.
+        zobrist_table (List[List[int]]): a table from get_zobrist_table() with the same dimensions.
+
+    Returns:
+        key (int): the Zobrist hash of square_types.
+    """
+    key = 0
+    for index, value in enumerate(square_types):
+        key ^= zobrist_table[index][value]
+    return key
+
+
+def update_zobrist_hash(key: int, square_types: bytearray, changes: List[int], zobrist_table: List[List[int]]) -> int:
+    """Updates a Zobrist hash after a move in O(changed squares).
+
+    Args:
+        key (int): the Zobrist hash before the move.
+        square_types (bytearray): SquareType values of a board after the move. See SquareTypeManager.square_types.
+        changes (List[int]): (index, previous value) pairs, flattened, for every square changed by the move.
+            See SquareTypeManager.last_move_changes().
+        zobrist_table (List[List[int]]): a table from get_zobrist_table() with the same dimensions.
+
+    Returns:
+        key (int): the Zobrist hash after the move.
+    """
+    for i in range(0, len(changes), 2):
+        keys = zobrist_table[changes[i]]
+        key ^= keys[changes[i + 1]] ^ keys[square_types[changes[i]]]
+    return key
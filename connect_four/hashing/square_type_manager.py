@@ -1,9 +1,9 @@
 from enum import Enum
-from typing import List, Set, Dict
+from typing import List, Set
 
 from connect_four.envs import TwoPlayerGameEnvVariables
 from connect_four.game import Square
-from connect_four.problem import ConnectingGroupManager
+from connect_four.problem import BitmaskGroupManager
 
 
 class SquareType(Enum):
@@ -13,6 +13,12 @@ class SquareType(Enum):
     Player2 = 3
 
 
+# SquareType values as plain ints. SquareTypeManager.square_types stores these instead of SquareType instances.
+EMPTY = SquareType.Empty.value
+INDIFFERENT = SquareType.Indifferent.value
+PLAYER_SQUARE_TYPES = (SquareType.Player1.value, SquareType.Player2.value)
+
+
 class SquareTypeManager:
 
     def __init__(self, env_variables: TwoPlayerGameEnvVariables, num_to_connect: int):
@@ -22,10 +28,11 @@ class SquareTypeManager:
             env_variables (TwoPlayerGameEnvVariables): a TwoPlayerGame's env_variables.
         """
         state, self.player = env_variables
-        num_rows, num_cols = len(state[0]), len(state[0][0])
+        self.num_rows, self.num_cols = len(state[0]), len(state[0][0])
 
-        self.problem_manager = ConnectingGroupManager(env_variables=env_variables, num_to_connect=num_to_connect)
-        self.square_types = self._create_initial_square_types(num_rows=num_rows, num_cols=num_cols)
+        self.problem_manager = BitmaskGroupManager(env_variables=env_variables, num_to_connect=num_to_connect)
+        # square_types[row * num_cols + col] is the SquareType value of (row, col).
+        self.square_types = bytearray(self.num_rows * self.num_cols)
 
         # Play squares that have already been played.
         # Change self.square_types accordingly.
@@ -34,34 +41,37 @@ class SquareTypeManager:
             for row in range(len(state[0])):
                 for col in range(len(state[0][0])):
                     if state[player][row][col] == 1:
-                        if (not self.problem_manager.groups_by_square_by_player[0][row][col] and
-                                not self.problem_manager.groups_by_square_by_player[1][row][col]):
-                            self.square_types[row][col] = SquareType.Indifferent
-                        elif player == 0:
-                            self.square_types[row][col] = SquareType.Player1
+                        if not self._has_live_groups(index=row * self.num_cols + col):
+                            self.square_types[row * self.num_cols + col] = INDIFFERENT
                         else:
-                            self.square_types[row][col] = SquareType.Player2
+                            self.square_types[row * self.num_cols + col] = PLAYER_SQUARE_TYPES[player]
 
-        self.previous_square_types_by_move = []
+        # undo_log holds (index, previous value) pairs, flattened, for every square changed by every move.
+        # undo_log_lengths[i] is the length of undo_log before move i was played.
+        self.undo_log = []
+        self.undo_log_lengths = []
 
-    @staticmethod
-    def _create_initial_square_types(num_rows: int, num_cols: int) -> List[List[SquareType]]:
+    def _has_live_groups(self, index: int) -> bool:
         """
+        Args:
+            index (int): the index of a square, row * num_cols + col.
 
+        Returns:
+            has_live_groups (bool): True if either player can still win a Group containing the square.
+        """
+        live_group_masks = self.problem_manager.live_group_masks
+        return bool((live_group_masks[0] | live_group_masks[1]) & self.problem_manager.group_masks_by_square[index])
+
+    def square_type(self, row: int, col: int) -> SquareType:
+        """
         Args:
-            num_rows (int): the number of rows in the board.
-            num_cols (int): the number of columns in the board.
+            row (int): the row of the square
+            col (int): the column of the square
 
         Returns:
-            square_types (List[List[SquareType]]): a 2D array of SquareTypes all with SquareType.Empty
+            square_type (SquareType): the SquareType of the square at (row, col).
         """
-        square_types = []
-        for row in range(num_rows):
-            rows = []
-            for col in range(num_cols):
-                rows.append(SquareType.Empty)
-            square_types.append(rows)
-        return square_types
+        return SquareType(self.square_types[row * self.num_cols + col])
 
     def move(self, row: int, col: int):
         """Plays a move at the given row and column.
@@ -74,6 +84,13 @@ class SquareTypeManager:
             col (int): the column to play
         """
         affected_squares, _ = self.problem_manager.move(player=self.player, row=row, col=col)
+        self.undo_log_lengths.append(len(self.undo_log))
+
+        # Assign the played square a non-empty SquareType. This allows it be included when finding indifferent squares.
+        index = row * self.num_cols + col
+        self.undo_log.append(index)
+        self.undo_log.append(EMPTY)
+        self.square_types[index] = PLAYER_SQUARE_TYPES[self.player]
 
         indifferent_squares = self._find_indifferent_squares(
             player=self.player,
@@ -81,79 +98,43 @@ class SquareTypeManager:
             col=col,
             affected_squares=affected_squares,
         )
-        previous_square_types = self._update_square_types(row=row, col=col, indifferent_squares=indifferent_squares)
-
-        # Add the dictionary of squares to previous SquareType to the stack so we can undo later.
-        self.previous_square_types_by_move.append(previous_square_types)
+        for indifferent_index in indifferent_squares:
+            if indifferent_index != index:
+                self.undo_log.append(indifferent_index)
+                self.undo_log.append(self.square_types[indifferent_index])
+            self.square_types[indifferent_index] = INDIFFERENT
 
         # Switch play.
         self.player = 1 - self.player
 
     def _find_indifferent_squares(self, player: int, row: int, col: int,
-                                  affected_squares: Set[Square]) -> Set[Square]:
+                                  affected_squares: Set[Square]) -> List[int]:
         """
-
         Args:
+            player (int): the player who played the square at the given row and col
             row (int): the row being played
             col (int): the column being played
-            affected_squares (Set[Square]):
-                A Dictionary mapping Squares to all Groups that were removed.
-                For every square in groups_removed_by_squares, the opponent can no longer win using that Group.
+            affected_squares (Set[Square]): all squares which had a Group removed by the move.
 
-        Modifies:
-            self.square_types: If the square at the given row and col is not indifferent,
-                assigns a SquareType corresponding with the given player.
-                Updates all squares that are indifferent to SquareType.Indifferent.
+        Requires:
+            self.square_types: the square at the given row and col has already been assigned a non-empty SquareType.
 
         Returns:
-            indifferent_squares (Set[Square]): a Set of Squares that can no longer be used to
+            indifferent_squares (List[int]): the indices of all Squares that can no longer be used to
                 complete any Groups for either player.
         """
-        # Assign the played square a non-empty SquareType. This allows it be included when finding indifferent_squares.
-        if player == 0:
-            self.square_types[row][col] = SquareType.Player1
-        else:
-            self.square_types[row][col] = SquareType.Player2
-
-        # Find all indifferent squares.
-        indifferent_squares = set()
+        # If no groups were removed, the played square could not have been used to win for either player.
         if not affected_squares:
-            indifferent_squares.add(Square(row=row, col=col))
+            return [row * self.num_cols + col]
+
+        indifferent_squares = []
         for s in affected_squares:
             # If neither player can win any groups at this square, this square is indifferent.
-            if (self.square_types[s.row][s.col] != SquareType.Empty) and \
-                    (not self.problem_manager.groups_by_square_by_player[0][s.row][s.col]) and \
-                    (not self.problem_manager.groups_by_square_by_player[1][s.row][s.col]):
-                indifferent_squares.add(s)
+            index = s.row * self.num_cols + s.col
+            if self.square_types[index] != EMPTY and not self._has_live_groups(index=index):
+                indifferent_squares.append(index)
         return indifferent_squares
 
-    def _update_square_types(self, row: int, col: int, indifferent_squares: Set[Square]) -> Dict[Square, SquareType]:
-        """
-
-        Args:
-            row (int): the row being played
-            col (int): the column being played
-            indifferent_squares (Set[Square]): a Set of Squares that can no longer be used to
-                complete any Groups for either player.
-
-        Modifies:
-            self.square_types: For every square in indifferent_squares, updates to SquareType.Indifferent.
-
-        Returns:
-            previous_square_types (Dict[Square, SquareType]): a dictionary mapping each Square to the SquareType it was
-                before it was changed.
-        """
-        # Find the SquareType of all squares that are being changed.
-        previous_square_types = {}
-        # Change the square types of indifferent squares.
-        for s in indifferent_squares:
-            previous_square_types[s] = self.square_types[s.row][s.col]
-            self.square_types[s.row][s.col] = SquareType.Indifferent
-
-        previous_square_types[Square(row=row, col=col)] = SquareType.Empty
-
-        return previous_square_types
-
     def undo_move(self):
         """Undoes the most recent move.
 
@@ -161,11 +142,22 @@ class SquareTypeManager:
             (AssertionError): if the internal state of the SquareTypeManager is at the state given upon initialization.
         """
         self.problem_manager.undo_move()
-        assert self.previous_square_types_by_move
+        assert self.undo_log_lengths
 
         # Switch play.
         self.player = 1 - self.player
 
-        previous_square_types = self.previous_square_types_by_move.pop()
-        for square in previous_square_types:
-            self.square_types[square.row][square.col] = previous_square_types[square]
+        # Restore squares in the reverse order they were changed.
+        undo_log = self.undo_log
+        length = self.undo_log_lengths.pop()
+        while len(undo_log) > length:
+            previous_value = undo_log.pop()
+            self.square_types[undo_log.pop()] = previous_value
+
+    def last_move_changes(self) -> List[int]:
+        """
+        Returns:
+            changes (List[int]): (index, previous value) pairs, flattened, for every square changed by the most
+                recent move.
+        """
+        return self.undo_log[self.undo_log_lengths[-1]:]
@@ -3,7 +3,6 @@ import unittest
 
 import numpy as np
 
-from connect_four.game import Square
 from connect_four.hashing.square_type_manager import SquareTypeManager, SquareType
 
 
@@ -28,13 +27,14 @@ class TestSquareTypeManagerTicTacToe(unittest.TestCase):
 
         # Player 1 plays in the bottom-middle square.
         # Remove groups that contain 21 for Player 2.
-        affected_squares = stm.problem_manager._remove_groups(opponent=1, row=2, col=1)
+        affected_squares, _ = stm.problem_manager.move(player=0, row=2, col=1)
+        stm.square_types[7] = SquareType.Player1.value
 
         want_indifferent_squares = {
-            Square(row=0, col=1),  # top-middle
-            Square(row=1, col=1),  # center
-            Square(row=2, col=0),  # bottom-left
-            Square(row=2, col=1),  # bottom-middle
+            1,  # top-middle
+            4,  # center
+            6,  # bottom-left
+            7,  # bottom-middle
         }
         got_indifferent_squares = stm._find_indifferent_squares(
             player=0,
@@ -42,7 +42,7 @@ class TestSquareTypeManagerTicTacToe(unittest.TestCase):
             col=1,
             affected_squares=affected_squares,
         )
-        self.assertEqual(want_indifferent_squares, got_indifferent_squares)
+        self.assertEqual(want_indifferent_squares, set(got_indifferent_squares))
 
     def test_move_previous_square_types_indifferent_squares(self):
         self.env.state = np.array([
@@ -65,19 +65,26 @@ class TestSquareTypeManagerTicTacToe(unittest.TestCase):
             col=1,
         )
         want_previous_square_types = {
-            Square(row=0, col=1): SquareType.Player2,  # top-middle
-            Square(row=1, col=1): SquareType.Player2,  # center
-            Square(row=2, col=0): SquareType.Player2,  # bottom-left
-            Square(row=2, col=1): SquareType.Empty,
+            1: SquareType.Player2.value,  # top-middle
+            4: SquareType.Player2.value,  # center
+            6: SquareType.Player2.value,  # bottom-left
+            7: SquareType.Empty.value,  # bottom-middle
         }
-        self.assertEqual(want_previous_square_types, stm.previous_square_types_by_move[-1])
+        changes = stm.last_move_changes()
+        got_previous_square_types = dict(zip(changes[::2], changes[1::2]))
+        self.assertEqual(want_previous_square_types, got_previous_square_types)
+        self.assertEqual(SquareType.Indifferent, stm.square_type(row=2, col=1))
+
+        stm.undo_move()
+        self.assertEqual(SquareType.Player2, stm.square_type(row=0, col=1))
+        self.assertEqual(SquareType.Empty, stm.square_type(row=2, col=1))
 
     def test_move(self):
         stm = SquareTypeManager(env_variables=self.env.env_variables, num_to_connect=3)
         stm.move(row=0, col=0)
         # Validate that play has switched to the opponent.
         self.assertEqual(1, stm.player)
-        self.assertEqual(1, len(stm.previous_square_types_by_move))
+        self.assertEqual(1, len(stm.undo_log_lengths))
 
     def test_undo_move_raises_assertion_error(self):
         # undo_move() should raise an assertion error if the STM is at the given state.
@@ -90,11 +97,11 @@ class TestSquareTypeManagerTicTacToe(unittest.TestCase):
 
         stm.move(row=0, col=0)
         self.assertEqual(1, stm.player)
-        self.assertTrue(stm.previous_square_types_by_move)
+        self.assertTrue(stm.undo_log_lengths)
 
         stm.undo_move()
         self.assertEqual(0, stm.player)
-        self.assertFalse(stm.previous_square_types_by_move)
+        self.assertFalse(stm.undo_log_lengths)
 
 
 if __name__ == '__main__':
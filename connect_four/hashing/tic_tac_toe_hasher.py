@@ -8,9 +8,29 @@ from connect_four.hashing.square_type_manager import SquareTypeManager
 
 class TicTacToeHasher(Hasher):
 
-    def __init__(self, env: TicTacToeEnv):
+    def __init__(self, env: TicTacToeEnv, canonical: bool = False):
+        """
+
+        Args:
+            env (TicTacToeEnv): the environment whose current state this hasher starts at.
+            canonical (bool): if True, hash_key() returns the same key for every rotation and reflection of a position.
+                The Zobrist hashes of all 8 symmetric positions are maintained alongside each other.
+        """
         self.stm = SquareTypeManager(env_variables=env.env_variables, num_to_connect=3)
 
+        if canonical:
+            self.zobrist_tables = hasher_hash_utils.get_symmetric_zobrist_tables(num_rows=3, num_cols=3, rotations=True)
+        else:
+            self.zobrist_tables = [hasher_hash_utils.get_zobrist_table(num_rows=3, num_cols=3)]
+        # square_permutations[i][square] is where square is moved by the symmetry hashed with zobrist_tables[i].
+        self.square_permutations = hasher_hash_utils.get_square_permutations(zobrist_tables=self.zobrist_tables)
+        # keys[i] is the Zobrist hash of the current state using zobrist_tables[i].
+        self.keys = [
+            hasher_hash_utils.get_zobrist_hash(square_types=self.stm.square_types, zobrist_table=zobrist_table)
+            for zobrist_table in self.zobrist_tables
+        ]
+        self.keys_by_move = []
+
     def move(self, action: int):
         """
         Assumptions:
@@ -23,12 +43,25 @@ class TicTacToeHasher(Hasher):
         row, col = action // 3, action % 3
         self.stm.move(row=row, col=col)
 
+        # Update the keys for every square whose SquareType changed.
+        self.keys_by_move.append(self.keys)
+        changes = self.stm.last_move_changes()
+        self.keys = [
+            hasher_hash_utils.update_zobrist_hash(
+                key=key,
+                square_types=self.stm.square_types,
+                changes=changes,
+                zobrist_table=zobrist_table,
+            ) for key, zobrist_table in zip(self.keys, self.zobrist_tables)
+        ]
+
     def undo_move(self):
         """
         Assumptions:
             1. The current state of Tic-Tac-Toe is not in the state given upon initialization.
         """
         self.stm.undo_move()
+        self.keys = self.keys_by_move.pop()
 
     def hash(self) -> str:
         """
@@ -38,6 +71,7 @@ class TicTacToeHasher(Hasher):
         """
         transposition_arr = hasher_hash_utils.convert_square_types_to_transposition_arr(
             square_types=self.stm.square_types,
+            num_cols=self.stm.num_cols,
         )
         transposition = hasher_hash_utils.get_transposition(transposition_arr=transposition_arr)
 
@@ -56,3 +90,35 @@ class TicTacToeHasher(Hasher):
                 transposition = flipped_rotated_transposition
 
         return transposition
+
+    def hash_key(self) -> int:
+        """
+        Returns:
+            key (int): a 64-bit Zobrist hash of the SquareTypes of the current state.
+                If this hasher is canonical, it is the smallest of the hashes of every rotation and reflection of the
+                current state. Otherwise, unlike hash(), rotated and mirrored positions have different keys.
+        """
+        return min(self.keys)
+
+    def canonical_action(self, action: int) -> int:
+        """
+        Args:
+            action (int): an action in the current state.
+
+        Returns:
+            canonical_action (int): the same action in the rotation or reflection of the current state whose hash is
+                hash_key().
+        """
+        return self.square_permutations[self.keys.index(min(self.keys))][action]
+
+    def action_from_canonical(self, canonical_action: int) -> int:
+        """The inverse of canonical_action().
+
+        Args:
+            canonical_action (int): an action in the rotation or reflection of the current state whose hash is
+                hash_key().
+
+        Returns:
+            action (int): the same action in the current state.
+        """
+        return self.square_permutations[self.keys.index(min(self.keys))].index(canonical_action)
@@ -35,6 +35,7 @@ class TestTicTacToeHasher(unittest.TestCase):
         ])
         got_transposition_arr = hasher_hash_utils.convert_square_types_to_transposition_arr(
             square_types=self.hasher.stm.square_types,
+            num_cols=3,
         )
         self.assertIsNone(np.testing.assert_array_equal(
             want_transposition_arr,
@@ -141,6 +142,59 @@ class TestTicTacToeHasher(unittest.TestCase):
         got_transposition = self.hasher.hash()
         self.assertEqual(want_transposition, got_transposition)
 
+    def test_hash_key_matches_new_hasher(self):
+        initial_key = self.hasher.hash_key()
+        for action in [4, 0, 8, 2, 1]:
+            self.hasher.move(action=action)
+            self.env.step(action=action)
+            self.assertEqual(TicTacToeHasher(env=self.env).hash_key(), self.hasher.hash_key())
+        for _ in range(5):
+            self.hasher.undo_move()
+        self.assertEqual(initial_key, self.hasher.hash_key())
+
+    def test_hash_key_canonical_rotations_and_reflections(self):
+        corners = [0, 2, 8, 6]
+        keys = set()
+        for corner in corners:
+            hasher = TicTacToeHasher(env=self.env, canonical=True)
+            hasher.move(action=corner)
+            hasher.move(action=4)
+            keys.add(hasher.hash_key())
+        self.assertEqual(1, len(keys))
+
+        hasher = TicTacToeHasher(env=self.env, canonical=True)
+        hasher.move(action=1)
+        self.assertNotIn(hasher.hash_key(), keys)
+
+    def test_canonical_action(self):
+        # Each hasher is at a rotation or reflection of the same position: X in a corner, O in the center.
+        corners = [0, 2, 8, 6]
+        hashers = []
+        for corner in corners:
+            hasher = TicTacToeHasher(env=self.env, canonical=True)
+            hasher.move(action=corner)
+            hasher.move(action=4)
+            hashers.append(hasher)
+
+        for action in [1, 3, 5, 7, 8]:
+            first = hashers[0]
+            canonical_action = first.canonical_action(action=action)
+            self.assertEqual(action, first.action_from_canonical(canonical_action=canonical_action))
+            first.move(action=action)
+            child_key = first.hash_key()
+            first.undo_move()
+
+            # The canonical action leads to the same child in every rotation or reflection.
+            for hasher in hashers[1:]:
+                hasher.move(action=hasher.action_from_canonical(canonical_action=canonical_action))
+                self.assertEqual(child_key, hasher.hash_key())
+                hasher.undo_move()
+
+    def test_canonical_action_not_canonical(self):
+        self.hasher.move(action=2)
+        self.assertEqual(5, self.hasher.canonical_action(action=5))
+        self.assertEqual(5, self.hasher.action_from_canonical(canonical_action=5))
+
 
 if __name__ == '__main__':
     unittest.main()
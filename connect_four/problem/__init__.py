@@ -1,6 +1,8 @@
 from connect_four.problem.group import Group
 from connect_four.problem.group import GroupDirection
+from connect_four.problem.group import get_groups
 
 from connect_four.problem.connecting_group_manager import ConnectingGroupManager
+from connect_four.problem.bitmask_group_manager import BitmaskGroupManager
 from connect_four.problem.tic_tac_toe_group_manager import TicTacToeGroupManager
 from connect_four.problem.connect_four_group_manager import ConnectFourGroupManager
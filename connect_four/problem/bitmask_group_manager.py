@@ -0,0 +1,173 @@
+from typing import List, Set
+
+from connect_four.envs import TwoPlayerGameEnvVariables, connect_utils
+from connect_four.game import Square
+from connect_four.problem.group import Group, get_groups
+from connect_four.problem.problem import Problem
+from connect_four.problem.problem_manager import ProblemManager
+
+
+class BitmaskGroupManager(ProblemManager):
+    """A ProblemManager that tracks the Groups each player can still win as bitsets.
+
+    Bit i of a mask refers to the i-th line of connect_utils.get_lines(), i.e. the Group
+    get_groups()[player][i]. Playing a square clears the bits of every opponent Group through that square,
+    so move() and undo_move() take a few integer operations instead of updating a Set per square.
+    """
+
+    def __init__(self, env_variables: TwoPlayerGameEnvVariables, num_to_connect: int):
+        """Initializes the BitmaskGroupManager with the given env_variables.
+
+        Args:
+            env_variables (TwoPlayerGameEnvVariables): a TwoPlayerGame's env_variables.
+            num_to_connect (int): the number of squares that need to be connected for a win.
+        """
+        state, self.player = env_variables
+        self.num_rows, self.num_cols = len(state[0]), len(state[0][0])
+
+        self.groups_by_player = get_groups(num_rows=self.num_rows, num_cols=self.num_cols,
+                                           num_to_connect=num_to_connect)
+        lines = connect_utils.get_lines(num_rows=self.num_rows, num_cols=self.num_cols, num_to_connect=num_to_connect)
+
+        # group_masks_by_square[row * num_cols + col] has bit i set if Group i contains (row, col).
+        self.group_masks_by_square = []
+        for line_ids in lines.lines_by_square:
+            mask = 0
+            for line_id in line_ids:
+                mask |= 1 << line_id
+            self.group_masks_by_square.append(mask)
+
+        # live_group_masks[player] has bit i set if player can still win Group i.
+        all_groups_mask = (1 << len(lines.squares)) - 1
+        self.live_group_masks = [all_groups_mask, all_groups_mask]
+
+        # Play squares that have already been played.
+        # Note that the order of the play does not matter because removing Groups commutes.
+        for player in range(len(state)):
+            for row in range(self.num_rows):
+                for col in range(self.num_cols):
+                    if state[player][row][col] == 1:
+                        self._remove_groups(opponent=1 - player, row=row, col=col)
+
+        # removed_masks_by_move[i] is (opponent, removed_mask) for the i-th move played.
+        self.removed_masks_by_move = []
+
+    def _remove_groups(self, opponent: int, row: int, col: int) -> int:
+        """
+        Args:
+            opponent (int): the player whose Groups we are removing.
+            row (int): the row being played
+            col (int): the column being played
+
+        Modifies:
+            self.live_group_masks: clears every Group of opponent that contains (row, col).
+
+        Returns:
+            removed_mask (int): the mask of Groups that were removed.
+        """
+        removed_mask = self.live_group_masks[opponent] & self.group_masks_by_square[row * self.num_cols + col]
+        self.live_group_masks[opponent] ^= removed_mask
+        return removed_mask
+
+    def groups_in_mask(self, player: int, mask: int) -> Set[Group]:
+        """
+        Args:
+            player (int): the player the Groups belong to.
+            mask (int): a mask of Groups.
+
+        Returns:
+            groups (Set[Group]): the Groups of player whose bits are set in mask.
+        """
+        groups = self.groups_by_player[player]
+        result = set()
+        while mask:
+            low_bit = mask & -mask
+            result.add(groups[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return result
+
+    def move(self, player: int, row: int, col: int) -> (Set[Square], Set[Problem]):
+        """Plays a move at the given row and column for the given player.
+
+        Assumptions:
+            1.  The internal state of the BitmaskGroupManager is not at a terminal state.
+
+        Args:
+            player (int): the player making the move.
+            row (int): the row to play
+            col (int): the column to play
+
+        Returns:
+            affected_squares (Set[Square]): all squares which had a Problem removed.
+            removed_problems (Set[Problem]): all Problems which were removed.
+        """
+        opponent = 1 - player
+        removed_mask = self._remove_groups(opponent=opponent, row=row, col=col)
+        self.removed_masks_by_move.append((opponent, removed_mask))
+        self.player = 1 - self.player
+
+        removed_problems = self.groups_in_mask(player=opponent, mask=removed_mask)
+        affected_squares = set()
+        for group in removed_problems:
+            affected_squares.update(group.squares)
+        return affected_squares, removed_problems
+
+    def undo_move(self) -> Set[Problem]:
+        """Undoes the most recent move.
+
+        Raises:
+            (AssertionError): if the internal state of the BitmaskGroupManager is
+                at the state given upon initialization.
+
+        Returns:
+            added_problems (Set[Problem]): the Problems that were added after undoing the most recent move.
+        """
+        assert self.removed_masks_by_move
+
+        opponent, removed_mask = self.removed_masks_by_move.pop()
+        self.live_group_masks[opponent] |= removed_mask
+        self.player = 1 - self.player
+
+        return self.groups_in_mask(player=opponent, mask=removed_mask)
+
+    def get_problems_by_square_by_player(self) -> List[List[List[Set[Problem]]]]:
+        """Builds the per-square Sets of Problems from the live masks. Prefer the masks where possible.
+
+        Returns:
+            groups_by_square_by_player (List[List[List[Set[Problem]]]]): a 3D array of a Set of Groups.
+                1. The first dimension is the player.
+                2. The second dimension is the row.
+                3. The third dimension is the col.
+
+                For a given player and a given Square, you can retrieve all Problems
+                that player can win from that Square with:
+                    set_of_possible_winning_groups_at_player_row_col = groups_by_square_by_player[player][row][col]
+        """
+        return [
+            [
+                [
+                    self.groups_in_mask(
+                        player=player,
+                        mask=self.live_group_masks[player] & self.group_masks_by_square[row * self.num_cols + col],
+                    ) for col in range(self.num_cols)
+                ] for row in range(self.num_rows)
+            ] for player in range(2)
+        ]
+
+    def get_current_problems(self) -> Set[Problem]:
+        """
+
+        Returns:
+            problems (Set[Problem]): a set of all Problems that belong to the current player.
+        """
+        return self.groups_in_mask(player=self.player, mask=self.live_group_masks[self.player])
+
+    def get_all_problems(self) -> Set[Problem]:
+        """
+
+        Returns:
+            problems (Set[Problem]): a set of all Problems that belong to the either player.
+        """
+        problems = self.groups_in_mask(player=0, mask=self.live_group_masks[0])
+        problems.update(self.groups_in_mask(player=1, mask=self.live_group_masks[1]))
+        return problems
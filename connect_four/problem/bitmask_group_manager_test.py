@@ -0,0 +1,100 @@
+import random
+import unittest
+
+import gym
+import numpy as np
+
+from connect_four.envs import ConnectFourEnv
+from connect_four.game import Square
+from connect_four.problem import Group
+from connect_four.problem.bitmask_group_manager import BitmaskGroupManager
+from connect_four.problem.connecting_group_manager import ConnectingGroupManager
+
+
+class TestBitmaskGroupManager(unittest.TestCase):
+    def setUp(self) -> None:
+        self.env = gym.make('connect_four-v0')
+        ConnectFourEnv.M = 6
+        ConnectFourEnv.N = 7
+        self.env.reset()
+
+    def test_initial_state(self):
+        self.env.state = np.array([
+            [
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 1, 0, 0, 0, ],
+            ],
+            [
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+                [0, 0, 0, 0, 0, 0, 0, ],
+            ],
+        ])
+        self.env.player_turn = 1
+        bgm = BitmaskGroupManager(env_variables=self.env.env_variables, num_to_connect=4)
+        cgm = ConnectingGroupManager(env_variables=self.env.env_variables, num_to_connect=4)
+
+        self.assertEqual(69, len(bgm.get_all_problems() - cgm.get_current_problems()))
+        self.assertEqual(cgm.get_current_problems(), bgm.get_current_problems())
+        self.assertEqual(cgm.get_all_problems(), bgm.get_all_problems())
+        self.assertEqual(cgm.get_problems_by_square_by_player(), bgm.get_problems_by_square_by_player())
+
+    def test_move_undo_move(self):
+        bgm = BitmaskGroupManager(env_variables=self.env.env_variables, num_to_connect=4)
+
+        affected_squares, removed_problems = bgm.move(player=0, row=5, col=0)
+        want_removed_problems = {
+            Group(player=1, start=Square(row=5, col=0), end=Square(row=2, col=3)),
+            Group(player=1, start=Square(row=5, col=0), end=Square(row=5, col=3)),
+            Group(player=1, start=Square(row=2, col=0), end=Square(row=5, col=0)),
+        }
+        self.assertEqual(want_removed_problems, removed_problems)
+        self.assertIn(Square(row=2, col=3), affected_squares)
+        self.assertEqual(1, bgm.player)
+        self.assertEqual(66, len(bgm.get_current_problems()))
+
+        self.assertEqual(want_removed_problems, bgm.undo_move())
+        self.assertEqual(0, bgm.player)
+        self.assertEqual(138, len(bgm.get_all_problems()))
+
+    def test_undo_move_raises_assertion_error(self):
+        bgm = BitmaskGroupManager(env_variables=self.env.env_variables, num_to_connect=4)
+        with self.assertRaises(AssertionError):
+            bgm.undo_move()
+
+    def test_matches_connecting_group_manager_random_games(self):
+        rng = random.Random(0)
+        for _ in range(20):
+            self.env.reset()
+            bgm = BitmaskGroupManager(env_variables=self.env.env_variables, num_to_connect=4)
+            cgm = ConnectingGroupManager(env_variables=self.env.env_variables, num_to_connect=4)
+
+            heights = [0] * ConnectFourEnv.N
+            player = 0
+            num_moves = rng.randint(1, 20)
+            for _ in range(num_moves):
+                col = rng.choice([c for c in range(ConnectFourEnv.N) if heights[c] < ConnectFourEnv.M])
+                row = ConnectFourEnv.M - 1 - heights[col]
+                heights[col] += 1
+
+                self.assertEqual(
+                    cgm.move(player=player, row=row, col=col),
+                    bgm.move(player=player, row=row, col=col),
+                )
+                self.assertEqual(cgm.get_current_problems(), bgm.get_current_problems())
+                player = 1 - player
+
+            for _ in range(num_moves):
+                self.assertEqual(cgm.undo_move(), bgm.undo_move())
+            self.assertEqual(cgm.get_all_problems(), bgm.get_all_problems())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ from typing import List, Set, Dict
 from connect_four.envs import TwoPlayerGameEnvVariables
 from connect_four.game import Square
 from connect_four.problem import Group
+from connect_four.problem.group import get_groups
 from connect_four.problem.problem import Problem
 from connect_four.problem.problem_manager import ProblemManager
 
@@ -52,42 +53,8 @@ class ConnectingGroupManager(ProblemManager):
         Returns:
             all_groups (Set[Group]): the set of all Groups that can be used by either player in an empty board.
         """
-        directions = [
-            (-1, 1),  # up-right diagonal
-            (0, 1),  # horizontal
-            (1, 1),  # down-right diagonal
-            (1, 0),  # vertical
-        ]
-        all_groups = set()
-        for player in range(2):
-            for start_row in range(num_rows):
-                for start_col in range(num_cols):
-                    for direction in directions:
-                        end_row = start_row + (num_to_connect - 1) * direction[0]
-                        end_col = start_col + (num_to_connect - 1) * direction[1]
-                        if ConnectingGroupManager._is_valid(
-                                row=end_row, col=end_col, num_rows=num_rows, num_cols=num_cols):
-                            all_groups.add(Group(
-                                player=player,
-                                start=Square(row=start_row, col=start_col),
-                                end=Square(row=end_row, col=end_col),
-                            ))
-        return all_groups
-
-    @staticmethod
-    def _is_valid(row: int, col: int, num_rows: int, num_cols: int) -> bool:
-        """
-
-        Args:
-            row (int): the row to validate
-            col (int): the column to validate
-            num_rows (int): the upper bound of valid rows (exclusive)
-            num_cols (int): the upper bound of valid columns (exclusive)
-
-        Returns:
-            is_valid (bool): whether or not the given (row, col) pair is valid.
-        """
-        return 0 <= row < num_rows and 0 <= col < num_cols
+        groups_by_player = get_groups(num_rows=num_rows, num_cols=num_cols, num_to_connect=num_to_connect)
+        return set(groups_by_player[0] + groups_by_player[1])
 
     @staticmethod
     def _create_all_groups_by_square_by_player(
@@ -109,20 +76,12 @@ class ConnectingGroupManager(ProblemManager):
                 with:
                     set_of_possible_winning_groups_at_player_row_col = groups_by_square_by_player[player][row][col]
         """
-        groups_by_square_by_player = []
-        for player in range(2):
-            player_squares = []
-            for row in range(num_rows):
-                rows = []
-                for col in range(num_cols):
-                    groups_at_square = set()
-                    square = Square(row=row, col=col)
-                    for group in all_groups:
-                        if player == group.player and square in group.squares:
-                            groups_at_square.add(group)
-                    rows.append(groups_at_square)
-                player_squares.append(rows)
-            groups_by_square_by_player.append(player_squares)
+        groups_by_square_by_player = [
+            [[set() for _ in range(num_cols)] for _ in range(num_rows)] for _ in range(2)
+        ]
+        for group in all_groups:
+            for square in group.squares:
+                groups_by_square_by_player[group.player][square.row][square.col].add(group)
         return groups_by_square_by_player
 
     def _play_square(self, player: int, row: int, col: int) -> Dict[Square, Set[Group]]:
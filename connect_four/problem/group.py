@@ -1,5 +1,9 @@
+import functools
+
+from connect_four.envs import connect_utils
 from connect_four.game import Square
 from enum import Enum
+from typing import Tuple
 
 from connect_four.problem.problem import Problem
 
@@ -89,3 +93,25 @@ class Group(Problem):
 
     def __repr__(self):
         return self.__str__()
+
+
+@functools.lru_cache(maxsize=None)
+def get_groups(num_rows: int, num_cols: int, num_to_connect: int) -> Tuple[Tuple[Group, ...], Tuple[Group, ...]]:
+    """Returns every Group on a board with the given dimensions.
+
+    The Groups are built the first time a board size is requested and shared by every caller afterwards.
+
+    Args:
+        num_rows (int): the number of rows in the board.
+        num_cols (int): the number of columns in the board.
+        num_to_connect (int): the number of squares in a Group.
+
+    Returns:
+        groups_by_player (Tuple[Tuple[Group, ...], Tuple[Group, ...]]): groups_by_player[player][line_id] is the
+            Group belonging to player made up of the squares of connect_utils.get_lines().squares[line_id].
+    """
+    lines = connect_utils.get_lines(num_rows=num_rows, num_cols=num_cols, num_to_connect=num_to_connect)
+    return tuple(
+        tuple(Group(player=player, start=Square(*line[0]), end=Square(*line[-1])) for line in lines.squares)
+        for player in range(2)
+    )
@@ -3,6 +3,7 @@ import unittest
 from connect_four.game import Square
 from connect_four.problem import Group
 from connect_four.problem import GroupDirection
+from connect_four.problem import get_groups
 
 
 class TestGroup(unittest.TestCase):
@@ -57,6 +58,15 @@ class TestGroup(unittest.TestCase):
         self.assertEqual(GroupDirection.up_right_diagonal,
                          Group(player=1, start=Square(3, 0), end=Square(0, 3)).direction)
 
+    def test_get_groups(self):
+        groups_by_player = get_groups(num_rows=3, num_cols=3, num_to_connect=3)
+        self.assertEqual(2, len(groups_by_player))
+        for player in range(2):
+            self.assertEqual(8, len(set(groups_by_player[player])))
+            for group in groups_by_player[player]:
+                self.assertEqual(player, group.player)
+        self.assertIn(Group(player=0, start=Square(2, 0), end=Square(0, 2)), groups_by_player[0])
+
 
 if __name__ == '__main__':
     unittest.main()
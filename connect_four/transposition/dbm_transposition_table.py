@@ -1,5 +1,7 @@
 import dbm
 
+from typing import Union
+
 from connect_four.transposition import TranspositionTable
 
 
@@ -7,33 +9,43 @@ class DBMTranspositionTable(TranspositionTable):
     def __init__(self, phi_file: str, delta_file: str):
         self.phi_db = dbm.open(phi_file, "c")
         self.delta_db = dbm.open(delta_file, "c")
+        # phi is saved before delta, so every state in delta_db is in phi_db too.
+        # Some dbm modules count their keys by iterating over them, so the count is kept here.
+        self.num_entries = len(self.delta_db)
 
-    def save(self, transposition: str, phi: int, delta: int):
+    def save(self, transposition: Union[str, int], phi: int, delta: int):
         """Saves state with the given phi and delta numbers. Overwrites the phi/delta numbers if
         state is already saved in this TranspositionTable.
 
         Args:
-            transposition (str): a transposition of a state in the state space of a TwoPlayerGameEnv.
+            transposition (Union[str, int]): a transposition of a state in the state space of a TwoPlayerGameEnv.
+                Either Hasher.hash() or Hasher.hash_key().
             phi (int): the phi number of the state to save.
             delta: the delta number of the state to save.
         """
+        # dbm keys must be strings or bytes.
+        transposition = str(transposition)
         phi_bytes = phi.to_bytes(length=8, byteorder="big", signed=False)
         self.phi_db[transposition] = phi_bytes
+        if transposition not in self.delta_db:
+            self.num_entries += 1
         delta_bytes = delta.to_bytes(length=8, byteorder="big", signed=False)
         self.delta_db[transposition] = delta_bytes
 
-    def retrieve(self, transposition: str) -> (int, int):
+    def retrieve(self, transposition: Union[str, int]) -> (int, int):
         """
         Raises:
             KeyError: if state is not in this transposition table.
 
         Args:
-            transposition (str): a transposition of a state in the state space of a TwoPlayerGameEnv.
+            transposition (Union[str, int]): a transposition of a state in the state space of a TwoPlayerGameEnv.
+                Either Hasher.hash() or Hasher.hash_key().
 
         Returns:
             phi (int): the phi number of the state to retrieve.
             delta: the delta number of the state to retrieve.
         """
+        transposition = str(transposition)
         phi = int.from_bytes(bytes=self.phi_db[transposition], byteorder="big", signed=False)
         delta = int.from_bytes(bytes=self.delta_db[transposition], byteorder="big", signed=False)
         return phi, delta
@@ -47,8 +59,12 @@ class DBMTranspositionTable(TranspositionTable):
         Returns:
             contained (bool): true if transposition is contained in this TranspositionTable; otherwise, false.
         """
+        item = str(item)
         return item in self.phi_db and item in self.delta_db
 
+    def __len__(self):
+        return self.num_entries
+
     def close(self):
         self.phi_db.close()
         self.delta_db.close()
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 
 import gym
@@ -10,6 +12,12 @@ from connect_four.transposition.dbm_transposition_table import DBMTranspositionT
 class TestDBMTranspositionTable(unittest.TestCase):
     def setUp(self) -> None:
         self.env = gym.make('tic_tac_toe-v0')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.phi_file = os.path.join(self.temp_dir.name, "test_tic_tac_toe_phi")
+        self.delta_file = os.path.join(self.temp_dir.name, "test_tic_tac_toe_delta")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
 
     def test_save_and_retrieve_initial_state_1_and_1(self):
         self.env.state = np.array([
@@ -25,7 +33,7 @@ class TestDBMTranspositionTable(unittest.TestCase):
             ],
         ])
         transposition = TicTacToeHasher(self.env).hash()
-        tt = DBMTranspositionTable(phi_file="test_tic_tac_toe_phi", delta_file="test_tic_tac_toe_delta")
+        tt = DBMTranspositionTable(phi_file=self.phi_file, delta_file=self.delta_file)
         want_phi, want_delta = 1, 1
         tt.save(transposition=transposition, phi=want_phi, delta=want_delta)
         got_phi, got_delta = tt.retrieve(transposition=transposition)
@@ -47,7 +55,7 @@ class TestDBMTranspositionTable(unittest.TestCase):
             ],
         ])
         transposition = TicTacToeHasher(self.env).hash()
-        tt = DBMTranspositionTable(phi_file="test_tic_tac_toe_phi", delta_file="test_tic_tac_toe_delta")
+        tt = DBMTranspositionTable(phi_file=self.phi_file, delta_file=self.delta_file)
         tt.save(transposition=transposition, phi=1, delta=1)
 
         want_phi, want_delta = 2, 2
@@ -56,6 +64,29 @@ class TestDBMTranspositionTable(unittest.TestCase):
         self.assertEqual(want_phi, got_phi)
         self.assertEqual(want_delta, got_delta)
 
+    def test_save_and_retrieve_hash_key(self):
+        transposition = TicTacToeHasher(self.env).hash_key()
+        tt = DBMTranspositionTable(phi_file=self.phi_file, delta_file=self.delta_file)
+        tt.save(transposition=transposition, phi=2, delta=3)
+        self.assertIn(transposition, tt)
+        got_phi, got_delta = tt.retrieve(transposition=transposition)
+        self.assertEqual(2, got_phi)
+        self.assertEqual(3, got_delta)
+        self.assertNotIn(transposition + 1, tt)
+
+    def test_len(self):
+        tt = DBMTranspositionTable(phi_file=self.phi_file, delta_file=self.delta_file)
+        self.assertEqual(0, len(tt))
+        tt.save(transposition=1, phi=1, delta=1)
+        tt.save(transposition=2, phi=1, delta=1)
+        tt.save(transposition=1, phi=2, delta=2)
+        self.assertEqual(2, len(tt))
+        tt.close()
+
+        tt = DBMTranspositionTable(phi_file=self.phi_file, delta_file=self.delta_file)
+        self.assertEqual(2, len(tt))
+        tt.close()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,229 @@
+from array import array
+from enum import Enum
+from typing import Union
+
+from connect_four.transposition import TranspositionTable
+from connect_four.transposition.transposition_table import stable_key
+
+
+class ReplacementPolicy(Enum):
+    # A new entry always replaces the entry in its slot.
+    AlwaysReplace = 0
+    # A new entry only replaces the entry in its slot if it has at least as much work.
+    DepthPreferred = 1
+    # Each slot index holds a bucket of two entries: a depth-preferred entry and an always-replace entry.
+    TwoTier = 2
+
+
+class FixedSizeTranspositionTable(TranspositionTable):
+    """A TranspositionTable with a fixed number of slots allocated up front.
+
+    Unlike SimpleTranspositionTable, entries can be replaced by newer entries whose keys map to the same slot,
+    so a state that was saved may no longer be contained later on.
+
+    Hasher.hash() transpositions are reduced to 64-bit keys with stable_key(). Since two of them can share a key,
+    the transposition itself is kept too, and compared on every lookup.
+    """
+
+    # Bytes used by each slot: an 8-byte key, phi, delta and work plus a 1-byte occupied flag.
+    # Hasher.hash() transpositions add a reference per slot.
+    BYTES_PER_SLOT = 4 * 8 + 1
+    # Work given to proven or disproven entries, so that unsolved entries never replace them in depth-preferred slots.
+    SOLVED_WORK = 1 << 62
+
+    def __init__(self, size_bits: int = 20, policy: ReplacementPolicy = ReplacementPolicy.TwoTier,
+                 max_bytes: int = None):
+        """
+
+        Args:
+            size_bits (int): the table has 2^size_bits slots.
+            policy (ReplacementPolicy): how to choose which entry to keep when two entries map to the same slot.
+            max_bytes (int): if given, size_bits is reduced until the table uses at most max_bytes bytes.
+
+        Raises:
+            ValueError: if a table with 2 slots does not fit in max_bytes.
+        """
+        if max_bytes is not None:
+            while size_bits > 1 and (1 << size_bits) * FixedSizeTranspositionTable.BYTES_PER_SLOT > max_bytes:
+                size_bits -= 1
+            if (1 << size_bits) * FixedSizeTranspositionTable.BYTES_PER_SLOT > max_bytes:
+                raise ValueError("max_bytes is too small for a transposition table. max_bytes =", max_bytes)
+        self.size_bits = size_bits
+        self.policy = policy
+        self.num_slots = 1 << size_bits
+
+        # TwoTier uses slots (2i, 2i + 1) as bucket i. The other policies use one slot per index.
+        if policy == ReplacementPolicy.TwoTier:
+            self.index_mask = (self.num_slots >> 1) - 1
+        else:
+            self.index_mask = self.num_slots - 1
+
+        zeros = bytes(8 * self.num_slots)
+        self.keys = array('Q', zeros)
+        self.phis = array('q', zeros)
+        self.deltas = array('q', zeros)
+        self.works = array('q', zeros)
+        self.occupied = bytearray(self.num_slots)
+        # The Hasher.hash() transposition of each slot, or None for Hasher.hash_key() transpositions.
+        # Only allocated once a Hasher.hash() transposition is saved.
+        self.transpositions = None
+        self.num_entries = 0
+
+        self.num_hits = 0
+        self.num_misses = 0
+        self.num_overwrites = 0
+
+    def _matches(self, slot: int, key: int, transposition: Union[str, int]) -> bool:
+        """
+        Args:
+            slot (int): a slot.
+            key (int): the stable_key() of transposition.
+            transposition (Union[str, int]): either Hasher.hash() or Hasher.hash_key().
+
+        Returns:
+            matches (bool): True if the slot holds transposition.
+        """
+        if not self.occupied[slot] or self.keys[slot] != key:
+            return False
+        if self.transpositions is None:
+            return not isinstance(transposition, str)
+        stored = self.transpositions[slot]
+        if isinstance(transposition, str):
+            return stored == transposition
+        return stored is None
+
+    def _find(self, key: int, transposition: Union[str, int]) -> int:
+        """
+        Args:
+            key (int): the stable_key() of transposition.
+            transposition (Union[str, int]): either Hasher.hash() or Hasher.hash_key().
+
+        Returns:
+            slot (int): the slot holding transposition, or -1 if it is not in this table.
+        """
+        if self.policy == ReplacementPolicy.TwoTier:
+            slot = (key & self.index_mask) << 1
+            if self._matches(slot=slot, key=key, transposition=transposition):
+                return slot
+            slot += 1
+        else:
+            slot = key & self.index_mask
+        if self._matches(slot=slot, key=key, transposition=transposition):
+            return slot
+        return -1
+
+    def _write(self, slot: int, key: int, transposition: Union[str, int], phi: int, delta: int, work: int):
+        if not self.occupied[slot]:
+            self.num_entries += 1
+        elif not self._matches(slot=slot, key=key, transposition=transposition):
+            self.num_overwrites += 1
+        self.occupied[slot] = 1
+        self.keys[slot] = key
+        self.phis[slot] = phi
+        self.deltas[slot] = delta
+        self.works[slot] = work
+        if isinstance(transposition, str):
+            if self.transpositions is None:
+                self.transpositions = [None] * self.num_slots
+            self.transpositions[slot] = transposition
+        elif self.transpositions is not None:
+            self.transpositions[slot] = None
+
+    def _stored_transposition(self, slot: int, key: int) -> Union[str, int]:
+        """
+        Returns:
+            transposition (Union[str, int]): the transposition saved in slot, whose stable_key() is key.
+        """
+        if self.transpositions is not None and self.transpositions[slot] is not None:
+            return self.transpositions[slot]
+        return key
+
+    def save(self, transposition: Union[str, int], phi: int, delta: int, work: int = None):
+        """Saves state with the given phi and delta numbers. Overwrites the phi/delta numbers if
+        state is already saved in this TranspositionTable.
+
+        Depending on the ReplacementPolicy, the state may not be saved if its slot holds an entry with more work.
+
+        Args:
+            transposition (Union[str, int]): a transposition of a state in the state space of a TwoPlayerGameEnv.
+                Either Hasher.hash() or Hasher.hash_key().
+            phi (int): the phi number of the state to save.
+            delta: the delta number of the state to save.
+            work (int): an estimate of the effort spent on the state, e.g. the number of nodes searched below it.
+                Used by the DepthPreferred and TwoTier policies. Defaults to phi + delta, which grows as a state
+                is searched more deeply.
+        """
+        key = stable_key(transposition=transposition)
+        if phi == 0 or delta == 0:
+            work = FixedSizeTranspositionTable.SOLVED_WORK
+        elif work is None:
+            work = phi + delta
+
+        if self.policy == ReplacementPolicy.AlwaysReplace:
+            self._write(slot=key & self.index_mask, key=key, transposition=transposition, phi=phi, delta=delta,
+                        work=work)
+        elif self.policy == ReplacementPolicy.DepthPreferred:
+            slot = key & self.index_mask
+            if (not self.occupied[slot] or self._matches(slot=slot, key=key, transposition=transposition) or
+                    work >= self.works[slot]):
+                self._write(slot=slot, key=key, transposition=transposition, phi=phi, delta=delta, work=work)
+        else:  # self.policy == ReplacementPolicy.TwoTier
+            slot = self._find(key=key, transposition=transposition)
+            deep_slot = (key & self.index_mask) << 1
+            if slot == deep_slot or not self.occupied[deep_slot] or work >= self.works[deep_slot]:
+                if slot == deep_slot + 1:
+                    # The state is moving to the depth-preferred slot. Its old entry is not an overwrite.
+                    self.occupied[slot] = 0
+                    self.num_entries -= 1
+                if slot != deep_slot and self.occupied[deep_slot]:
+                    # Demote the entry in the depth-preferred slot to the always-replace slot.
+                    self._write(
+                        slot=deep_slot + 1,
+                        key=self.keys[deep_slot],
+                        transposition=self._stored_transposition(slot=deep_slot, key=self.keys[deep_slot]),
+                        phi=self.phis[deep_slot],
+                        delta=self.deltas[deep_slot],
+                        work=self.works[deep_slot],
+                    )
+                self._write(slot=deep_slot, key=key, transposition=transposition, phi=phi, delta=delta, work=work)
+            else:
+                self._write(slot=deep_slot + 1, key=key, transposition=transposition, phi=phi, delta=delta,
+                            work=work)
+
+    def retrieve(self, transposition: Union[str, int]) -> (int, int):
+        """
+        Raises:
+            KeyError: if state is not in this transposition table.
+
+        Args:
+            transposition (Union[str, int]): a transposition of a state in the state space of a TwoPlayerGameEnv.
+                Either Hasher.hash() or Hasher.hash_key().
+
+        Returns:
+            phi (int): the phi number of the state to retrieve.
+            delta: the delta number of the state to retrieve.
+        """
+        slot = self._find(key=stable_key(transposition=transposition), transposition=transposition)
+        if slot < 0:
+            self.num_misses += 1
+            raise KeyError(transposition)
+        self.num_hits += 1
+        return self.phis[slot], self.deltas[slot]
+
+    def __contains__(self, item):
+        """
+
+        Args:
+            item (State): a transposition of a state in the state space of a TwoPlayerGameEnv.
+
+        Returns:
+            contained (bool): true if transposition is contained in this TranspositionTable; otherwise, false.
+                Unlike retrieve(), it is not counted in num_hits or num_misses.
+        """
+        return self._find(key=stable_key(transposition=item), transposition=item) >= 0
+
+    def __len__(self):
+        return self.num_entries
+
+    def close(self):
+        pass
@@ -0,0 +1,117 @@
+import gym
+import unittest
+
+from connect_four.hashing import TicTacToeHasher
+from connect_four.transposition.fixed_size_transposition_table import FixedSizeTranspositionTable
+from connect_four.transposition.fixed_size_transposition_table import ReplacementPolicy
+from connect_four.transposition.transposition_table import stable_key
+
+
+class TestFixedSizeTranspositionTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.env = gym.make('tic_tac_toe-v0')
+
+    def test_save_and_retrieve_hash_key(self):
+        transposition = TicTacToeHasher(self.env).hash_key()
+        for policy in ReplacementPolicy:
+            tt = FixedSizeTranspositionTable(size_bits=4, policy=policy)
+            tt.save(transposition=transposition, phi=2, delta=3)
+            self.assertIn(transposition, tt)
+            self.assertEqual((2, 3), tt.retrieve(transposition=transposition))
+            self.assertNotIn(transposition + 1, tt)
+
+            tt.save(transposition=transposition, phi=4, delta=5)
+            self.assertEqual((4, 5), tt.retrieve(transposition=transposition))
+            self.assertEqual(1, len(tt))
+
+    def test_save_and_retrieve_hash(self):
+        transposition = TicTacToeHasher(self.env).hash()
+        tt = FixedSizeTranspositionTable(size_bits=4)
+        tt.save(transposition=transposition, phi=1, delta=1)
+        self.assertEqual((1, 1), tt.retrieve(transposition=transposition))
+
+    def test_save_and_retrieve_hash_compares_transpositions(self):
+        for policy in ReplacementPolicy:
+            tt = FixedSizeTranspositionTable(size_bits=4, policy=policy)
+            tt.save(transposition="012", phi=1, delta=2)
+            tt.save(transposition=5, phi=3, delta=4)
+            self.assertEqual((1, 2), tt.retrieve(transposition="012"))
+            self.assertEqual((3, 4), tt.retrieve(transposition=5))
+            # An int with the same 64-bit key as a str is a different transposition.
+            self.assertNotIn(stable_key(transposition="012"), tt)
+            self.assertNotIn("5", tt)
+
+    def test_retrieve_raises_key_error(self):
+        tt = FixedSizeTranspositionTable(size_bits=4)
+        with self.assertRaises(KeyError):
+            tt.retrieve(transposition=1)
+        self.assertEqual(1, tt.num_misses)
+        self.assertEqual(0, tt.num_hits)
+
+    def test_contains_is_not_counted(self):
+        tt = FixedSizeTranspositionTable(size_bits=4)
+        tt.save(transposition=1, phi=1, delta=1)
+        self.assertIn(1, tt)
+        self.assertNotIn(2, tt)
+        tt.retrieve(transposition=1)
+        self.assertEqual(1, tt.num_hits)
+        self.assertEqual(0, tt.num_misses)
+
+    def test_always_replace(self):
+        tt = FixedSizeTranspositionTable(size_bits=4, policy=ReplacementPolicy.AlwaysReplace)
+        tt.save(transposition=1, phi=1, delta=1, work=100)
+        # 17 maps to the same slot as 1.
+        tt.save(transposition=17, phi=2, delta=2, work=1)
+        self.assertNotIn(1, tt)
+        self.assertEqual((2, 2), tt.retrieve(transposition=17))
+        self.assertEqual(1, tt.num_overwrites)
+
+    def test_depth_preferred(self):
+        tt = FixedSizeTranspositionTable(size_bits=4, policy=ReplacementPolicy.DepthPreferred)
+        tt.save(transposition=1, phi=1, delta=1, work=100)
+        tt.save(transposition=17, phi=2, delta=2, work=1)
+        self.assertIn(1, tt)
+        self.assertNotIn(17, tt)
+
+        tt.save(transposition=17, phi=2, delta=2, work=100)
+        self.assertNotIn(1, tt)
+        self.assertIn(17, tt)
+
+    def test_depth_preferred_keeps_solved_entries(self):
+        tt = FixedSizeTranspositionTable(size_bits=4, policy=ReplacementPolicy.DepthPreferred)
+        tt.save(transposition=1, phi=0, delta=FixedSizeTranspositionTable.SOLVED_WORK)
+        tt.save(transposition=17, phi=2, delta=2, work=1000)
+        self.assertIn(1, tt)
+
+    def test_two_tier(self):
+        tt = FixedSizeTranspositionTable(size_bits=4, policy=ReplacementPolicy.TwoTier)
+        # 1, 9 and 17 all map to bucket 1.
+        tt.save(transposition=1, phi=1, delta=1, work=100)
+        tt.save(transposition=9, phi=2, delta=2, work=1)
+        self.assertIn(1, tt)
+        self.assertIn(9, tt)
+
+        # The shallow entry is always replaced.
+        tt.save(transposition=17, phi=3, delta=3, work=1)
+        self.assertIn(1, tt)
+        self.assertNotIn(9, tt)
+        self.assertIn(17, tt)
+
+        # A deeper entry takes the depth-preferred slot and demotes the old entry.
+        tt.save(transposition=9, phi=2, delta=2, work=200)
+        self.assertIn(1, tt)
+        self.assertIn(9, tt)
+        self.assertNotIn(17, tt)
+        self.assertEqual(2, len(tt))
+
+    def test_max_bytes(self):
+        tt = FixedSizeTranspositionTable(size_bits=20, max_bytes=1 << 12)
+        self.assertLessEqual(tt.num_slots * FixedSizeTranspositionTable.BYTES_PER_SLOT, 1 << 12)
+        self.assertEqual(64, tt.num_slots)
+
+        with self.assertRaises(ValueError):
+            FixedSizeTranspositionTable(size_bits=20, max_bytes=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import mmap
+import os
+import struct
+
+from typing import Union
+
+from connect_four.transposition import TranspositionTable
+from connect_four.transposition.transposition_table import stable_key
+
+
+class MmapTranspositionTable(TranspositionTable):
+    """A TranspositionTable stored in a memory-mapped, open-addressed hash file.
+
+    The file is a header followed by 2^size_bits fixed-width records of (key, phi, delta), each an unsigned
+    64-bit little-endian integer. A record is placed in slot key mod 2^size_bits, or the next free slot after it.
+    Opening the file only maps it, so the OS pages records in as they are looked up. A file opened with
+    read_only=True can be shared by any number of processes. DFPN saves to its TranspositionTable, so it searches a
+    read-only file through an OverlayTranspositionTable.
+    """
+
+    MAGIC = b"CFTT"
+    VERSION = 1
+    # magic, version, number of slots, number of entries.
+    HEADER = struct.Struct("<4sIQQ")
+    # key, phi, delta. An empty slot has phi == delta == 0, which no saved state can have.
+    RECORD = struct.Struct("<QQQ")
+
+    def __init__(self, file: str, read_only: bool = True, size_bits: int = 20):
+        """
+
+        Args:
+            file (str): the path of the hash file.
+            read_only (bool): if True, the file must already exist and save() raises a ValueError.
+                If False, the file is created if it does not exist.
+            size_bits (int): the number of slots of a newly created file is 2^size_bits.
+                Ignored if the file already exists.
+
+        Raises:
+            ValueError: if the file exists but is not a hash file.
+        """
+        self.read_only = read_only
+        if not read_only and not os.path.exists(file):
+            self._create(file=file, num_slots=1 << size_bits)
+
+        self.file = open(file, "rb" if read_only else "r+b")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ if read_only else mmap.ACCESS_WRITE)
+
+        magic, version, self.num_slots, self.num_entries = MmapTranspositionTable.HEADER.unpack_from(self.mm, 0)
+        if magic != MmapTranspositionTable.MAGIC or version != MmapTranspositionTable.VERSION:
+            self.close()
+            raise ValueError("not a transposition table file:", file)
+        self.slot_mask = self.num_slots - 1
+
+    @staticmethod
+    def _create(file: str, num_slots: int):
+        with open(file, "wb") as f:
+            f.write(MmapTranspositionTable.HEADER.pack(
+                MmapTranspositionTable.MAGIC, MmapTranspositionTable.VERSION, num_slots, 0))
+            # Empty slots are all zeros. On most file systems, truncate() makes this a sparse file.
+            f.truncate(MmapTranspositionTable.HEADER.size + num_slots * MmapTranspositionTable.RECORD.size)
+
+    def _find(self, key: int) -> (int, bool):
+        """
+        Args:
+            key (int): a 64-bit key.
+
+        Returns:
+            offset (int): the offset of the record holding key, or of the empty record where key would be saved.
+            found (bool): True if key is in this table.
+        """
+        slot = key & self.slot_mask
+        for _ in range(self.num_slots):
+            offset = MmapTranspositionTable.HEADER.size + slot * MmapTranspositionTable.RECORD.size
+            record_key, phi, delta = MmapTranspositionTable.RECORD.unpack_from(self.mm, offset)
+            if phi == 0 and delta == 0:
+                return offset, False
+            if record_key == key:
+                return offset, True
+            slot = (slot + 1) & self.slot_mask
+        return -1, False
+
+    def save(self, transposition: Union[str, int], phi: int, delta: int):
+        """Saves state with the given phi and delta numbers. Overwrites the phi/delta numbers if
+        state is already saved in this TranspositionTable.
+
+        Args:
+            transposition (Union[str, int]): a transposition of a state in the state space of a TwoPlayerGameEnv.
+                Either Hasher.hash() or Hasher.hash_key().
+            phi (int): the phi number of the state to save.
+            delta: the delta number of the state to save.
+
+        Raises:
+            ValueError: if this TranspositionTable is read-only, or if it is full.
+        """
+        if self.read_only:
+            raise ValueError("cannot save to a read-only MmapTranspositionTable")
+
+        key = stable_key(transposition=transposition)
+        offset, found = self._find(key=key)
+        if not found:
+            # Keep one slot empty so that lookups of missing keys always terminate early.
+            if self.num_entries >= self.num_slots - 1:
+                raise ValueError("MmapTranspositionTable is full. num_slots =", self.num_slots)
+            self.num_entries += 1
+            MmapTranspositionTable.HEADER.pack_into(
+                self.mm, 0, MmapTranspositionTable.MAGIC, MmapTranspositionTable.VERSION,
+                self.num_slots, self.num_entries)
+        MmapTranspositionTable.RECORD.pack_into(self.mm, offset, key, phi, delta)
+
+    def retrieve(self, transposition: Union[str, int]) -> (int, int):
+        """
+        Raises:
+            KeyError: if state is not in this transposition table.
+
+        Args:
+            transposition (Union[str, int]): a transposition of a state in the state space of a TwoPlayerGameEnv.
+                Either Hasher.hash() or Hasher.hash_key().
+
+        Returns:
+            phi (int): the phi number of the state to retrieve.
+            delta: the delta number of the state to retrieve.
+        """
+        offset, found = self._find(key=stable_key(transposition=transposition))
+        if not found:
+            raise KeyError(transposition)
+        _, phi, delta = MmapTranspositionTable.RECORD.unpack_from(self.mm, offset)
+        return phi, delta
+
+    def __contains__(self, item):
+        """
+
+        Args:
+            item (State): a transposition of a state in the state space of a TwoPlayerGameEnv.
+
+        Returns:
+            contained (bool): true if transposition is contained in this TranspositionTable; otherwise, false.
+        """
+        _, found = self._find(key=stable_key(transposition=item))
+        return found
+
+    def __len__(self):
+        return self.num_entries
+
+    def flush(self):
+        if not self.read_only:
+            self.mm.flush()
+
+    def close(self):
+        if not self.mm.closed:
+            if not self.read_only:
+                self.mm.flush()
+            self.mm.close()
+        self.file.close()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+import gym
+
+from connect_four.hashing import TicTacToeHasher
+from connect_four.transposition.mmap_transposition_table import MmapTranspositionTable
+
+
+class TestMmapTranspositionTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.env = gym.make('tic_tac_toe-v0')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.temp_dir.name, "tic_tac_toe.tt")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_save_and_retrieve_hash_key(self):
+        transposition = TicTacToeHasher(self.env).hash_key()
+        tt = MmapTranspositionTable(file=self.file, read_only=False, size_bits=4)
+        tt.save(transposition=transposition, phi=2, delta=3)
+        self.assertIn(transposition, tt)
+        self.assertEqual((2, 3), tt.retrieve(transposition=transposition))
+        self.assertNotIn(transposition + 1, tt)
+
+        tt.save(transposition=transposition, phi=4, delta=5)
+        self.assertEqual((4, 5), tt.retrieve(transposition=transposition))
+        self.assertEqual(1, len(tt))
+        tt.close()
+
+    def test_save_and_retrieve_hash(self):
+        transposition = TicTacToeHasher(self.env).hash()
+        tt = MmapTranspositionTable(file=self.file, read_only=False, size_bits=4)
+        tt.save(transposition=transposition, phi=1, delta=1)
+        self.assertEqual((1, 1), tt.retrieve(transposition=transposition))
+        tt.close()
+
+    def test_retrieve_raises_key_error(self):
+        tt = MmapTranspositionTable(file=self.file, read_only=False, size_bits=4)
+        with self.assertRaises(KeyError):
+            tt.retrieve(transposition=1)
+        tt.close()
+
+    def test_collisions(self):
+        tt = MmapTranspositionTable(file=self.file, read_only=False, size_bits=2)
+        # 1, 5 and 9 all start probing at slot 1.
+        for i, key in enumerate([1, 5, 9]):
+            tt.save(transposition=key, phi=i + 1, delta=i + 1)
+        for i, key in enumerate([1, 5, 9]):
+            self.assertEqual((i + 1, i + 1), tt.retrieve(transposition=key))
+        self.assertNotIn(13, tt)
+
+        # One slot is always left empty.
+        with self.assertRaises(ValueError):
+            tt.save(transposition=13, phi=1, delta=1)
+        tt.close()
+
+    def test_close_and_reopen_read_only(self):
+        transposition = TicTacToeHasher(self.env).hash_key()
+        tt = MmapTranspositionTable(file=self.file, read_only=False, size_bits=4)
+        tt.save(transposition=transposition, phi=0, delta=100000000000000)
+        tt.close()
+
+        tt1 = MmapTranspositionTable(file=self.file)
+        tt2 = MmapTranspositionTable(file=self.file)
+        self.assertEqual((0, 100000000000000), tt1.retrieve(transposition=transposition))
+        self.assertEqual((0, 100000000000000), tt2.retrieve(transposition=transposition))
+        self.assertEqual(1, len(tt2))
+        with self.assertRaises(ValueError):
+            tt1.save(transposition=transposition, phi=1, delta=1)
+        tt1.close()
+        tt2.close()
+
+    def test_invalid_file(self):
+        with open(self.file, "wb") as f:
+            f.write(bytes(MmapTranspositionTable.HEADER.size))
+        with self.assertRaises(ValueError):
+            MmapTranspositionTable(file=self.file)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+from typing import Union
+
+from connect_four.transposition import TranspositionTable
+from connect_four.transposition.simple_transposition_table import SimpleTranspositionTable
+
+
+class OverlayTranspositionTable(TranspositionTable):
+    """Layers a writable TranspositionTable over a TranspositionTable that is only read.
+
+    Saved entries go to the overlay, and lookups check the overlay before the base. This lets DFPN search with a
+    read-only MmapTranspositionTable shared by many processes: each process keeps the entries it saves to itself.
+    """
+
+    def __init__(self, base: TranspositionTable, overlay: TranspositionTable = None):
+        """
+
+        Args:
+            base (TranspositionTable): the TranspositionTable that is only read, e.g. a read-only
+                MmapTranspositionTable.
+            overlay (TranspositionTable): the TranspositionTable saved entries go to.
+                Defaults to a new SimpleTranspositionTable.
+        """
+        self.base = base
+        if overlay is None:
+            overlay = SimpleTranspositionTable()
+        self.overlay = overlay
+
+    def save(self, transposition: Union[str, int], phi: int, delta: int):
+        """Saves state with the given phi and delta numbers to the overlay. Overwrites the phi/delta numbers if
+        state is already saved in the overlay. The base is not modified.
+
+        Args:
+            transposition (Union[str, int]): a transposition of a state in the state space of a TwoPlayerGameEnv.
+                Either Hasher.hash() or Hasher.hash_key().
+            phi (int): the phi number of the state to save.
+            delta: the delta number of the state to save.
+        """
+        self.overlay.save(transposition=transposition, phi=phi, delta=delta)
+
+    def retrieve(self, transposition: Union[str, int]) -> (int, int):
+        """
+        Raises:
+            KeyError: if state is in neither the overlay nor the base.
+
+        Args:
+            transposition (Union[str, int]): a transposition of a state in the state space of a TwoPlayerGameEnv.
+                Either Hasher.hash() or Hasher.hash_key().
+
+        Returns:
+            phi (int): the phi number of the state to retrieve.
+            delta: the delta number of the state to retrieve.
+        """
+        if transposition in self.overlay:
+            return self.overlay.retrieve(transposition=transposition)
+        return self.base.retrieve(transposition=transposition)
+
+    def __contains__(self, item):
+        """
+
+        Args:
+            item (State): a transposition of a state in the state space of a TwoPlayerGameEnv.
+
+        Returns:
+            contained (bool): true if transposition is contained in the overlay or the base; otherwise, false.
+        """
+        return item in self.overlay or item in self.base
+
+    def __len__(self):
+        """
+        Returns:
+            num_entries (int): the number of states saved to the overlay. The base does not grow, so its states are
+                not counted.
+        """
+        return len(self.overlay)
+
+    def flush(self):
+        self.overlay.flush()
+
+    def close(self):
+        self.overlay.close()
+        self.base.close()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+import gym
+
+from connect_four.agents import DFPN
+from connect_four.evaluation import ProofStatus
+from connect_four.evaluation.simple_evaluator import SimpleEvaluator
+from connect_four.hashing import TicTacToeHasher
+from connect_four.transposition.mmap_transposition_table import MmapTranspositionTable
+from connect_four.transposition.overlay_transposition_table import OverlayTranspositionTable
+from connect_four.transposition.simple_transposition_table import SimpleTranspositionTable
+
+
+class TestOverlayTranspositionTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.env = gym.make('tic_tac_toe-v0')
+        self.env.reset()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.temp_dir.name, "tic_tac_toe.tt")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_save_and_retrieve(self):
+        base = SimpleTranspositionTable()
+        base.save(transposition=1, phi=1, delta=2)
+        base.save(transposition=2, phi=3, delta=4)
+        tt = OverlayTranspositionTable(base=base)
+
+        # Saved entries shadow the entries of the base, which is not modified.
+        tt.save(transposition=2, phi=5, delta=6)
+        tt.save(transposition=3, phi=7, delta=8)
+        self.assertEqual((1, 2), tt.retrieve(transposition=1))
+        self.assertEqual((5, 6), tt.retrieve(transposition=2))
+        self.assertEqual((7, 8), tt.retrieve(transposition=3))
+        self.assertEqual((3, 4), base.retrieve(transposition=2))
+        self.assertNotIn(3, base)
+        self.assertIn(3, tt)
+        self.assertNotIn(4, tt)
+        # Only the entries saved to the overlay are counted.
+        self.assertEqual(2, len(tt))
+        with self.assertRaises(KeyError):
+            tt.retrieve(transposition=4)
+
+    def test_dfpn_over_read_only_mmap(self):
+        mmap_tt = MmapTranspositionTable(file=self.file, read_only=False, size_bits=14)
+        agent = DFPN(SimpleEvaluator(model=self.env), TicTacToeHasher(env=self.env), mmap_tt)
+        self.assertEqual(ProofStatus.Disproven, agent.depth_first_proof_number_search(env=self.env))
+        mmap_tt.close()
+
+        read_only_tt = MmapTranspositionTable(file=self.file)
+        num_entries = len(read_only_tt)
+        tt = OverlayTranspositionTable(base=read_only_tt)
+        agent = DFPN(SimpleEvaluator(model=self.env), TicTacToeHasher(env=self.env), tt)
+        self.assertIn(agent.action(env=self.env), self.env.actions())
+        self.assertEqual(num_entries, len(read_only_tt))
+        tt.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
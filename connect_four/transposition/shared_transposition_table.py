@@ -0,0 +1,139 @@
+import multiprocessing
+
+from typing import Union
+
+from connect_four.transposition import TranspositionTable
+from connect_four.transposition.transposition_table import stable_key
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """A fixed-size TranspositionTable in shared memory that can be used by several processes at once.
+
+    Slots are grouped into buckets of BUCKET_SIZE slots. A key can only be saved in its bucket.
+    Each bucket is guarded by one of num_locks locks, so processes only wait for each other when they access
+    buckets that share a lock. When a bucket is full, the entry with the least work is replaced. An entry's work
+    is phi + delta; proven and disproven entries have the most work.
+
+    The table must be created before the processes that share it, and passed to them when they are started.
+    """
+
+    BUCKET_SIZE = 4
+    # Work of proven or disproven entries, so that they are replaced last.
+    SOLVED_WORK = 1 << 62
+
+    def __init__(self, size_bits: int = 20, num_locks: int = 1024):
+        """
+
+        Args:
+            size_bits (int): the table has 2^size_bits slots. Must be at least 2.
+            num_locks (int): the number of locks guarding the buckets. Must be a power of 2.
+        """
+        self.num_slots = 1 << size_bits
+        self.bucket_mask = self.num_slots // SharedTranspositionTable.BUCKET_SIZE - 1
+        # An empty slot has phi == delta == 0, which no saved state can have.
+        self.keys = multiprocessing.RawArray('Q', self.num_slots)
+        self.phis = multiprocessing.RawArray('Q', self.num_slots)
+        self.deltas = multiprocessing.RawArray('Q', self.num_slots)
+        self.locks = [multiprocessing.Lock() for _ in range(num_locks)]
+        self.lock_mask = num_locks - 1
+        # num_entries[i] is the number of filled slots in the buckets guarded by locks[i].
+        self.num_entries = multiprocessing.RawArray('Q', num_locks)
+
+    def _find(self, key: int, start: int) -> int:
+        """
+        Requires:
+            1. The lock of the bucket starting at start is held.
+
+        Args:
+            key (int): a 64-bit key.
+            start (int): the first slot of the bucket of key.
+
+        Returns:
+            slot (int): the slot holding key, or -1 if key is not in this table.
+        """
+        keys, phis, deltas = self.keys, self.phis, self.deltas
+        for slot in range(start, start + SharedTranspositionTable.BUCKET_SIZE):
+            if phis[slot] == 0 and deltas[slot] == 0:
+                # Slots are filled in order and never emptied, so key is not in a later slot.
+                return -1
+            if keys[slot] == key:
+                return slot
+        return -1
+
+    def save(self, transposition: Union[str, int], phi: int, delta: int):
+        """Saves state with the given phi and delta numbers. Overwrites the phi/delta numbers if
+        state is already saved in this TranspositionTable.
+
+        Args:
+            transposition (Union[str, int]): a transposition of a state in the state space of a TwoPlayerGameEnv.
+                Either Hasher.hash() or Hasher.hash_key().
+            phi (int): the phi number of the state to save.
+            delta: the delta number of the state to save.
+        """
+        key = stable_key(transposition=transposition)
+        bucket = key & self.bucket_mask
+        start = bucket * SharedTranspositionTable.BUCKET_SIZE
+        keys, phis, deltas = self.keys, self.phis, self.deltas
+        lock_index = bucket & self.lock_mask
+        with self.locks[lock_index]:
+            replace_slot, replace_work = -1, None
+            for slot in range(start, start + SharedTranspositionTable.BUCKET_SIZE):
+                slot_phi, slot_delta = phis[slot], deltas[slot]
+                if slot_phi == 0 and slot_delta == 0:
+                    replace_slot = slot
+                    self.num_entries[lock_index] += 1
+                    break
+                if keys[slot] == key:
+                    replace_slot = slot
+                    break
+                if slot_phi == 0 or slot_delta == 0:
+                    work = SharedTranspositionTable.SOLVED_WORK
+                else:
+                    work = slot_phi + slot_delta
+                if replace_work is None or work < replace_work:
+                    replace_slot, replace_work = slot, work
+            keys[replace_slot] = key
+            phis[replace_slot] = phi
+            deltas[replace_slot] = delta
+
+    def retrieve(self, transposition: Union[str, int]) -> (int, int):
+        """
+        Raises:
+            KeyError: if state is not in this transposition table.
+
+        Args:
+            transposition (Union[str, int]): a transposition of a state in the state space of a TwoPlayerGameEnv.
+                Either Hasher.hash() or Hasher.hash_key().
+
+        Returns:
+            phi (int): the phi number of the state to retrieve.
+            delta: the delta number of the state to retrieve.
+        """
+        key = stable_key(transposition=transposition)
+        bucket = key & self.bucket_mask
+        with self.locks[bucket & self.lock_mask]:
+            slot = self._find(key=key, start=bucket * SharedTranspositionTable.BUCKET_SIZE)
+            if slot < 0:
+                raise KeyError(transposition)
+            return self.phis[slot], self.deltas[slot]
+
+    def __contains__(self, item):
+        """
+
+        Args:
+            item (State): a transposition of a state in the state space of a TwoPlayerGameEnv.
+
+        Returns:
+            contained (bool): true if transposition is contained in this TranspositionTable; otherwise, false.
+        """
+        key = stable_key(transposition=item)
+        bucket = key & self.bucket_mask
+        with self.locks[bucket & self.lock_mask]:
+            return self._find(key=key, start=bucket * SharedTranspositionTable.BUCKET_SIZE) >= 0
+
+    def __len__(self):
+        # Reads every counter without its lock, so entries saved concurrently may not be counted yet.
+        return sum(self.num_entries)
+
+    def close(self):
+        pass
@@ -0,0 +1,60 @@
+import multiprocessing
+import unittest
+
+import gym
+
+from connect_four.hashing import TicTacToeHasher
+from connect_four.transposition.shared_transposition_table import SharedTranspositionTable
+
+
+def _save(tt: SharedTranspositionTable, transposition: int):
+    tt.save(transposition=transposition, phi=5, delta=6)
+
+
+class TestSharedTranspositionTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.env = gym.make('tic_tac_toe-v0')
+
+    def test_save_and_retrieve_hash_key(self):
+        transposition = TicTacToeHasher(self.env).hash_key()
+        tt = SharedTranspositionTable(size_bits=4, num_locks=2)
+        tt.save(transposition=transposition, phi=2, delta=3)
+        self.assertIn(transposition, tt)
+        self.assertEqual((2, 3), tt.retrieve(transposition=transposition))
+        self.assertNotIn(transposition + 1, tt)
+
+        tt.save(transposition=transposition, phi=4, delta=5)
+        self.assertEqual((4, 5), tt.retrieve(transposition=transposition))
+
+    def test_retrieve_raises_key_error(self):
+        tt = SharedTranspositionTable(size_bits=4, num_locks=2)
+        with self.assertRaises(KeyError):
+            tt.retrieve(transposition=1)
+
+    def test_full_bucket_replaces_least_work(self):
+        tt = SharedTranspositionTable(size_bits=2, num_locks=1)
+        # There is only one bucket of 4 slots.
+        tt.save(transposition=1, phi=0, delta=100)
+        tt.save(transposition=2, phi=1, delta=1)
+        tt.save(transposition=3, phi=5, delta=5)
+        tt.save(transposition=4, phi=3, delta=3)
+        tt.save(transposition=5, phi=1, delta=1)
+        self.assertIn(1, tt)
+        self.assertNotIn(2, tt)
+        self.assertIn(3, tt)
+        self.assertIn(4, tt)
+        self.assertIn(5, tt)
+        # Replacing an entry does not change the number of entries.
+        self.assertEqual(4, len(tt))
+
+    def test_shared_between_processes(self):
+        tt = SharedTranspositionTable(size_bits=4, num_locks=2)
+        process = multiprocessing.Process(target=_save, args=(tt, 7))
+        process.start()
+        process.join()
+        self.assertEqual((5, 6), tt.retrieve(transposition=7))
+        self.assertEqual(1, len(tt))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,5 @@
+from typing import Union
+
 from connect_four.transposition import TranspositionTable
 
 
@@ -5,24 +7,26 @@ class SimpleTranspositionTable(TranspositionTable):
     def __init__(self):
         self.transposition_to_phi_delta_numbers = {}
 
-    def save(self, transposition: str, phi: int, delta: int):
+    def save(self, transposition: Union[str, int], phi: int, delta: int):
         """Saves state with the given phi and delta numbers. Overwrites the phi/delta numbers if
         state is already saved in this TranspositionTable.
 
         Args:
-            transposition (str): a transposition of a state in the state space of a TwoPlayerGameEnv.
+            transposition (Union[str, int]): a transposition of a state in the state space of a TwoPlayerGameEnv.
+                Either Hasher.hash() or Hasher.hash_key().
             phi (int): the phi number of the state to save.
             delta: the delta number of the state to save.
         """
         self.transposition_to_phi_delta_numbers[transposition] = (phi, delta)
 
-    def retrieve(self, transposition: str) -> (int, int):
+    def retrieve(self, transposition: Union[str, int]) -> (int, int):
         """
         Raises:
             KeyError: if state is not in this transposition table.
 
         Args:
-            transposition (str): a transposition of a state in the state space of a TwoPlayerGameEnv.
+            transposition (Union[str, int]): a transposition of a state in the state space of a TwoPlayerGameEnv.
+                Either Hasher.hash() or Hasher.hash_key().
 
         Returns:
             phi (int): the phi number of the state to retrieve.
@@ -41,5 +45,8 @@ class SimpleTranspositionTable(TranspositionTable):
         """
         return item in self.transposition_to_phi_delta_numbers
 
+    def __len__(self):
+        return len(self.transposition_to_phi_delta_numbers)
+
     def close(self):
         pass
@@ -55,6 +55,16 @@ class TestSimpleTranspositionTable(unittest.TestCase):
         self.assertEqual(want_phi, got_phi)
         self.assertEqual(want_delta, got_delta)
 
+    def test_save_and_retrieve_hash_key(self):
+        transposition = TicTacToeHasher(self.env).hash_key()
+        tt = simple_transposition_table.SimpleTranspositionTable()
+        tt.save(transposition=transposition, phi=2, delta=3)
+        self.assertIn(transposition, tt)
+        got_phi, got_delta = tt.retrieve(transposition=transposition)
+        self.assertEqual(2, got_phi)
+        self.assertEqual(3, got_delta)
+        self.assertNotIn(transposition + 1, tt)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,14 +1,37 @@
 import sqlite3
 
+from collections import OrderedDict
+from typing import Union
+
 from connect_four.transposition import TranspositionTable
 
 
 class SQLiteTranspositionTable(TranspositionTable):
+    # The default number of saved entries to buffer before writing them to the database.
     COMMIT_FREQUENCY = 100000
+    # The default number of entries kept in the in-process read cache.
+    CACHE_SIZE = 1000000
+
+    def __init__(self, database_file: str, cache_size: int = CACHE_SIZE, flush_size: int = COMMIT_FREQUENCY,
+                 journal_mode: str = "WAL", synchronous: str = "NORMAL"):
+        """
 
-    def __init__(self, database_file: str):
+        Args:
+            database_file (str): the path of the database file, or ":memory:".
+            cache_size (int): the maximum number of entries kept in the least-recently-used read cache.
+            flush_size (int): the number of saved entries buffered in memory before they are written to the database
+                in a single transaction.
+            journal_mode (str): the value of PRAGMA journal_mode, e.g. "WAL" or "DELETE".
+                If None, the SQLite default is used.
+            synchronous (str): the value of PRAGMA synchronous, e.g. "NORMAL" or "FULL".
+                If None, the SQLite default is used.
+        """
         self.con = sqlite3.connect(database=database_file)
         self.cursor = self.con.cursor()
+        if journal_mode is not None:
+            self.cursor.execute("PRAGMA journal_mode = %s" % journal_mode)
+        if synchronous is not None:
+            self.cursor.execute("PRAGMA synchronous = %s" % synchronous)
         create_phi_delta_table_sql = """CREATE TABLE IF NOT EXISTS
         PhiDelta(
             Transposition TEXT PRIMARY KEY,
@@ -16,44 +39,103 @@ class SQLiteTranspositionTable(TranspositionTable):
             Delta INTEGER
         )"""
         self.cursor.execute(create_phi_delta_table_sql)
-        self.num_insert_or_updates = 0
+        self.con.commit()
+
+        # The number of rows, which is only counted once. Rows are never deleted, and a new row gets a rowid larger
+        # than every existing one, so flush() counts the rows it inserts by how much the largest rowid grows.
+        self.cursor.execute("SELECT COUNT(*), IFNULL(MAX(rowid), 0) FROM PhiDelta")
+        self.num_rows, self.max_rowid = self.cursor.fetchone()
 
-    def save(self, transposition: str, phi: int, delta: int):
+        self.cache_size = cache_size
+        self.flush_size = flush_size
+        # Maps transpositions to (phi, delta), least recently used first.
+        self.cache = OrderedDict()
+        # Maps transpositions to (phi, delta) for entries that have been saved but not yet written to the database.
+        self.dirty = {}
+
+    def _cache(self, transposition: str, phi_delta: (int, int)):
+        self.cache[transposition] = phi_delta
+        self.cache.move_to_end(transposition)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def _lookup(self, transposition: str):
+        """
+        Args:
+            transposition (str): a transposition converted to str.
+
+        Returns:
+            phi_delta ((int, int)): the phi/delta numbers of transposition, or None if it has not been saved.
+        """
+        phi_delta = self.cache.get(transposition)
+        if phi_delta is not None:
+            self.cache.move_to_end(transposition)
+            return phi_delta
+
+        phi_delta = self.dirty.get(transposition)
+        if phi_delta is None:
+            read_sql = """SELECT Phi, Delta FROM PhiDelta WHERE Transposition=?"""
+            self.cursor.execute(read_sql, [transposition])
+            phi_delta = self.cursor.fetchone()
+            if phi_delta is None:
+                return None
+        self._cache(transposition=transposition, phi_delta=phi_delta)
+        return phi_delta
+
+    def save(self, transposition: Union[str, int], phi: int, delta: int):
         """Saves state with the given phi and delta numbers. Overwrites the phi/delta numbers if
         state is already saved in this TranspositionTable.
 
+        The entry is buffered and written to the database once flush_size entries are buffered or on flush().
+
         Args:
-            transposition (str): a transposition of a state in the state space of a TwoPlayerGameEnv.
+            transposition (Union[str, int]): a transposition of a state in the state space of a TwoPlayerGameEnv.
+                Either Hasher.hash() or Hasher.hash_key().
             phi (int): the phi number of the state to save.
             delta: the delta number of the state to save.
         """
-        if not self.__contains__(item=transposition):
-            insert_sql = """INSERT INTO PhiDelta(Transposition, Phi, Delta) VALUES(?, ?, ?)"""
-            self.cursor.execute(insert_sql, (transposition, phi, delta))
-        else:
-            update_sql = """UPDATE PhiDelta SET Phi = ?, Delta = ? WHERE Transposition = ?"""
-            self.cursor.execute(update_sql, (phi, delta, transposition))
-
-        self.num_insert_or_updates += 1
-        if self.num_insert_or_updates >= SQLiteTranspositionTable.COMMIT_FREQUENCY:
-            self.con.commit()
-            self.num_insert_or_updates = 0
-
-    def retrieve(self, transposition: str) -> (int, int):
+        # Keys are stored as TEXT. 64-bit keys may also be too large for an SQLite INTEGER.
+        transposition = str(transposition)
+        self.dirty[transposition] = (phi, delta)
+        self._cache(transposition=transposition, phi_delta=(phi, delta))
+
+        if len(self.dirty) >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        """Writes all buffered entries to the database in a single transaction."""
+        if not self.dirty:
+            return
+        upsert_sql = """INSERT INTO PhiDelta(Transposition, Phi, Delta) VALUES(?, ?, ?)
+        ON CONFLICT(Transposition) DO UPDATE SET Phi = excluded.Phi, Delta = excluded.Delta"""
+        with self.con:
+            self.cursor.executemany(
+                upsert_sql,
+                ((transposition, phi, delta) for transposition, (phi, delta) in self.dirty.items()),
+            )
+        self.dirty.clear()
+        self.cursor.execute("SELECT IFNULL(MAX(rowid), 0) FROM PhiDelta")
+        max_rowid = self.cursor.fetchone()[0]
+        self.num_rows += max_rowid - self.max_rowid
+        self.max_rowid = max_rowid
+
+    def retrieve(self, transposition: Union[str, int]) -> (int, int):
         """
         Raises:
             KeyError: if state is not in this transposition table.
 
         Args:
-            transposition (str): a transposition of a state in the state space of a TwoPlayerGameEnv.
+            transposition (Union[str, int]): a transposition of a state in the state space of a TwoPlayerGameEnv.
+                Either Hasher.hash() or Hasher.hash_key().
 
         Returns:
             phi (int): the phi number of the state to retrieve.
             delta: the delta number of the state to retrieve.
         """
-        read_sql = """SELECT Phi, Delta FROM PhiDelta WHERE Transposition=?"""
-        self.cursor.execute(read_sql, [transposition])
-        return self.cursor.fetchone()
+        phi_delta = self._lookup(transposition=str(transposition))
+        if phi_delta is None:
+            raise KeyError(transposition)
+        return phi_delta
 
     def __contains__(self, item):
         """
@@ -64,11 +146,17 @@ class SQLiteTranspositionTable(TranspositionTable):
         Returns:
             contained (bool): true if transposition is contained in this TranspositionTable; otherwise, false.
         """
-        read_sql = """SELECT 1 FROM PhiDelta WHERE Transposition=?"""
-        self.cursor.execute(read_sql, [item])
-        return self.cursor.fetchone() is not None
+        return self._lookup(transposition=str(item)) is not None
+
+    def __len__(self):
+        """
+        Returns:
+            num_entries (int): the number of rows in the database plus the number of buffered entries.
+                A buffered entry that overwrites a row is counted twice until it is flushed.
+        """
+        return self.num_rows + len(self.dirty)
 
     def close(self):
-        self.con.commit()
+        self.flush()
         self.cursor.close()
         self.con.close()
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 
 import gym
@@ -10,6 +12,11 @@ from connect_four.transposition.sqlite_transposition_table import SQLiteTranspos
 class TestSQLiteTranspositionTable(unittest.TestCase):
     def setUp(self) -> None:
         self.env = gym.make('tic_tac_toe-v0')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.database_file = os.path.join(self.temp_dir.name, "sqlite_test.db")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
 
     def test_save_and_retrieve(self):
         self.env.state = np.array([
@@ -70,14 +77,79 @@ class TestSQLiteTranspositionTable(unittest.TestCase):
             ],
         ])
         transposition = TicTacToeHasher(self.env).hash()
-        tt = SQLiteTranspositionTable(database_file="sqlite_test.db")
+        tt = SQLiteTranspositionTable(database_file=self.database_file)
         tt.save(transposition=transposition, phi=1, delta=1)
         tt.close()
 
-        tt2 = SQLiteTranspositionTable(database_file="sqlite_test.db")
+        tt2 = SQLiteTranspositionTable(database_file=self.database_file)
         self.assertIn(transposition, tt2)
         tt2.close()
 
+    def test_save_and_retrieve_hash_key(self):
+        transposition = TicTacToeHasher(self.env).hash_key()
+        tt = SQLiteTranspositionTable(database_file=":memory:")
+        tt.save(transposition=transposition, phi=2, delta=3)
+        self.assertIn(transposition, tt)
+        got_phi, got_delta = tt.retrieve(transposition=transposition)
+        self.assertEqual(2, got_phi)
+        self.assertEqual(3, got_delta)
+        self.assertNotIn(transposition + 1, tt)
+
+    def test_retrieve_raises_key_error(self):
+        tt = SQLiteTranspositionTable(database_file=":memory:")
+        with self.assertRaises(KeyError):
+            tt.retrieve(transposition=1)
+
+    def test_flush(self):
+        tt = SQLiteTranspositionTable(database_file=":memory:", flush_size=2)
+        tt.save(transposition=1, phi=1, delta=1)
+        tt.cursor.execute("SELECT COUNT(*) FROM PhiDelta")
+        self.assertEqual(0, tt.cursor.fetchone()[0])
+
+        # The second save fills the buffer, which writes both entries.
+        tt.save(transposition=2, phi=2, delta=2)
+        tt.cursor.execute("SELECT COUNT(*) FROM PhiDelta")
+        self.assertEqual(2, tt.cursor.fetchone()[0])
+
+        # Overwriting an entry that is already in the database updates it.
+        tt.save(transposition=1, phi=3, delta=4)
+        tt.flush()
+        tt.cursor.execute("SELECT Phi, Delta FROM PhiDelta WHERE Transposition=?", ["1"])
+        self.assertEqual((3, 4), tt.cursor.fetchone())
+        tt.close()
+
+    def test_len(self):
+        tt = SQLiteTranspositionTable(database_file=self.database_file, flush_size=2)
+        self.assertEqual(0, len(tt))
+        tt.save(transposition=1, phi=1, delta=1)
+        self.assertEqual(1, len(tt))
+        tt.save(transposition=2, phi=2, delta=2)
+        self.assertEqual(2, len(tt))
+
+        # Overwriting a row does not add an entry once it is flushed.
+        tt.save(transposition=1, phi=3, delta=4)
+        tt.save(transposition=3, phi=3, delta=4)
+        self.assertEqual(3, len(tt))
+        tt.close()
+
+        # Existing rows are counted when the database is opened.
+        tt = SQLiteTranspositionTable(database_file=self.database_file)
+        self.assertEqual(3, len(tt))
+        tt.close()
+
+    def test_cache_eviction(self):
+        tt = SQLiteTranspositionTable(database_file=":memory:", cache_size=1)
+        tt.save(transposition=1, phi=1, delta=2)
+        tt.save(transposition=2, phi=3, delta=4)
+        self.assertEqual(1, len(tt.cache))
+
+        # Evicted entries are still found in the buffer or the database.
+        self.assertEqual((1, 2), tt.retrieve(transposition=1))
+        tt.flush()
+        self.assertEqual((3, 4), tt.retrieve(transposition=2))
+        self.assertEqual((1, 2), tt.retrieve(transposition=1))
+        tt.close()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,25 +1,48 @@
+import hashlib
+
 from abc import ABC, abstractmethod
+from typing import Union
+
+
+def stable_key(transposition: Union[str, int]) -> int:
+    """
+    Args:
+        transposition (Union[str, int]): either Hasher.hash() or Hasher.hash_key().
+
+    Returns:
+        key (int): a 64-bit key that is the same in every process.
+            hash() of a str differs between processes, so it cannot be used for keys stored in a file or shared memory.
+    """
+    if isinstance(transposition, str):
+        digest = hashlib.blake2b(transposition.encode(encoding="utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, byteorder="little")
+    return transposition & 0xFFFFFFFFFFFFFFFF
 
 
 class TranspositionTable(ABC):
 
     @abstractmethod
-    def save(self, transposition: str, phi: int, delta: int):
+    def save(self, transposition: Union[str, int], phi: int, delta: int):
         """Saves state with the given phi and delta numbers. Overwrites the phi/delta numbers if
         state is already saved in this TranspositionTable.
 
         Args:
-            transposition (str): a transposition of a state in the state space of a TwoPlayerGameEnv.
+            transposition (Union[str, int]): a transposition of a state in the state space of a TwoPlayerGameEnv.
+                Either Hasher.hash() or Hasher.hash_key().
             phi (int): the phi number of the state to save.
             delta: the delta number of the state to save.
         """
         pass
 
     @abstractmethod
-    def retrieve(self, transposition: str) -> (int, int):
+    def retrieve(self, transposition: Union[str, int]) -> (int, int):
         """
+        Raises:
+            KeyError: if state is not in this transposition table.
+
         Args:
-            transposition (str): a transposition of a state in the state space of a TwoPlayerGameEnv.
+            transposition (Union[str, int]): a transposition of a state in the state space of a TwoPlayerGameEnv.
+                Either Hasher.hash() or Hasher.hash_key().
 
         Returns:
             phi (int): the phi number of the state to retrieve.
@@ -39,6 +62,22 @@ class TranspositionTable(ABC):
         """
         pass
 
+    @abstractmethod
+    def __len__(self):
+        """
+        Returns:
+            num_entries (int): the number of states saved in this TranspositionTable. SearchBudget.max_tt_size is
+                checked against it after every step of a search, so it must not scan the table.
+        """
+        pass
+
+    def flush(self):
+        """Writes every saved entry to persistent storage, if this TranspositionTable has any.
+
+        Entries that were saved before flush() returns survive a crash of the process.
+        """
+        pass
+
     @abstractmethod
     def close(self):
         pass
@@ -30,7 +30,7 @@ for i in range(10):
 
     # Initialize the agents
     evaluator = Victor(model=env)
-    hasher = ConnectFourHasher(env=env)
+    hasher = ConnectFourHasher(env=env, canonical=True)
     tt = SQLiteTranspositionTable(database_file="connect_four.db")
     agent1 = DFPN(evaluator, hasher, tt)
     # agent2 = FlatUCB(num_rollouts=1000)
@@ -53,6 +53,8 @@ for i in range(10):
                 agents_record[1 - env.player_turn] += 1
             else:  # reward == TwoPlayerGameEnv.DRAW
                 agents_record[2] += 1
+    # Write any buffered entries to the database.
+    tt.close()
 
     print("Record after board", i, "-", agents_record)
 
@@ -1,5 +1,6 @@
 # Gotta import gym!
 import gym
+import os
 
 from connect_four.agents import FlatMonteCarlo, DFPN, difficult_connect_four_positions
 from connect_four.agents import FlatUCB
@@ -8,8 +9,10 @@ from connect_four.agents import MCTS
 from connect_four.agents import Minimax
 from connect_four.agents import RandomAgent
 from connect_four.agents import PNS
+from connect_four.agents import OpeningBookAgent
 from connect_four.agents.human import Human
-from connect_four.evaluation import Victor
+from connect_four.agents.opening_book import OpeningBook
+from connect_four.evaluation import Victor, EvaluationCache
 
 from connect_four.evaluation.evaluator import NodeType
 from connect_four.evaluation.simple_evaluator import SimpleEvaluator
@@ -17,6 +20,8 @@ from connect_four.evaluation.simple_evaluator import SimpleEvaluator
 # Make the environment, replace this string with any
 # from the docs. (Some environments have dependencies)
 from connect_four.hashing import ConnectFourHasher
+from connect_four.transposition.mmap_transposition_table import MmapTranspositionTable
+from connect_four.transposition.overlay_transposition_table import OverlayTranspositionTable
 from connect_four.transposition.sqlite_transposition_table import SQLiteTranspositionTable
 
 env = gym.make('connect_four-v0')
@@ -28,10 +33,25 @@ obs = env.reset()
 env.render()
 
 # Initialize the agents
-evaluator = Victor(model=env)
-hasher = ConnectFourHasher(env=env)
-tt = SQLiteTranspositionTable(database_file="connect_four.db")
+# Shared by every Victor, so that the fallback agent does not evaluate positions the first agent already has.
+cache = EvaluationCache()
+evaluator = Victor(model=env, cache=cache)
+hasher = ConnectFourHasher(env=env, canonical=True)
+if os.path.exists("connect_four.tt"):
+    # The memory-mapped file is only read, and can be shared with other processes.
+    # The positions searched during this game are kept in memory.
+    tt = OverlayTranspositionTable(base=MmapTranspositionTable(file="connect_four.tt"))
+else:
+    tt = SQLiteTranspositionTable(database_file="connect_four.db")
 agent1 = DFPN(evaluator, hasher, tt)
+if os.path.exists("connect_four.book"):
+    # Answer solved states from the opening book, and only search once the game leaves it.
+    agent1 = OpeningBookAgent(
+        book=OpeningBook.load(file="connect_four.book"),
+        hasher=ConnectFourHasher(env=env, canonical=True),
+        make_fallback=lambda fallback_env: DFPN(
+            Victor(model=fallback_env, cache=cache), ConnectFourHasher(env=fallback_env, canonical=True), tt),
+    )
 # agent1 = MCPNS(num_rollouts=30)  # Minimax(max_depth=9)
 # agent2 = MCPNS(num_rollouts=30)
 # evaluator = SimpleEvaluator(model=env)
@@ -58,3 +78,6 @@ while not done:
 
     if done:
         break
+
+# Write any buffered entries to the database.
+tt.close()